@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Vectorized analytics over stored fund price history.
+
+Each fund's full daily price history is loaded from the price history
+database into a NumPy array, and rolling means, rolling volatility,
+drawdowns and N-day returns are computed over the whole array at once.
+Threshold alert rules can be configured per fund in funds_config.yml:
+
+    alerts:
+      - metric: return_5d         # 5-day return, percent
+        below: -3
+      - metric: drawdown          # current drop from the highest price, percent
+        above: 10
+      - metric: volatility_20d    # annualized volatility of daily returns, percent
+        above: 25
+      - metric: price_vs_ma_50d   # distance from the 50-day moving average, percent
+        below: -5
+
+Usage:
+    python analytics.py [--db price_history.db] [--config funds_config.yml]
+"""
+
+import argparse
+import math
+import re
+
+import numpy as np
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Metrics whose window is part of the name (e.g. 'return_5d', 'ma_50d')
+WINDOWED_METRIC = re.compile(r'^(return|ma|price_vs_ma|volatility)_(\d+)d$')
+PLAIN_METRICS = ('price', 'drawdown', 'max_drawdown')
+
+# Reported when no alert rules ask for other windows
+DEFAULT_METRICS = ('return_1d', 'return_5d', 'return_20d', 'ma_20d', 'ma_50d', 'volatility_20d')
+
+
+def rolling_mean(values, window):
+    """
+    Compute a rolling mean with a cumulative sum.
+
+    Args:
+        values (numpy.ndarray): Values, oldest first
+        window (int): Window length
+
+    Returns:
+        numpy.ndarray: Mean of each full window (empty if there is too little data)
+    """
+    if window < 1 or len(values) < window:
+        return np.empty(0)
+    csum = np.cumsum(np.concatenate(([0.0], values)))
+    return (csum[window:] - csum[:-window]) / window
+
+
+def rolling_std(values, window):
+    """
+    Compute a rolling (population) standard deviation with cumulative sums.
+
+    Args:
+        values (numpy.ndarray): Values, oldest first
+        window (int): Window length
+
+    Returns:
+        numpy.ndarray: Standard deviation of each full window (empty if there is too little data)
+    """
+    mean = rolling_mean(values, window)
+    if not mean.size:
+        return mean
+    mean_of_squares = rolling_mean(values * values, window)
+    # Rounding can make the variance of a flat window very slightly negative
+    return np.sqrt(np.maximum(mean_of_squares - mean * mean, 0.0))
+
+
+def drawdowns(prices):
+    """
+    Compute the drawdown from the running peak at every point.
+
+    Args:
+        prices (numpy.ndarray): Prices, oldest first
+
+    Returns:
+        numpy.ndarray: Fractional drop from the highest price so far (0 at a new high)
+    """
+    return 1.0 - prices / np.maximum.accumulate(prices)
+
+
+def n_day_returns(prices, days):
+    """
+    Compute N-day returns at every point.
+
+    Args:
+        prices (numpy.ndarray): Prices, oldest first
+        days (int): Number of price days to look back
+
+    Returns:
+        numpy.ndarray: Fractional returns (empty if there is too little data)
+    """
+    if days < 1 or len(prices) <= days:
+        return np.empty(0)
+    return prices[days:] / prices[:-days] - 1.0
+
+
+def required_metrics(rules):
+    """
+    List the metrics a set of alert rules refers to.
+
+    Args:
+        rules (list): Alert rules from funds_config.yml
+
+    Returns:
+        set: Metric names
+
+    Raises:
+        ValueError: If a rule is malformed or names an unknown metric
+    """
+    metrics = set()
+    for rule in rules or []:
+        if not isinstance(rule, dict) or 'metric' not in rule:
+            raise ValueError(f"Alert rule must have a 'metric': {rule!r}")
+        metric = str(rule['metric'])
+        if metric not in PLAIN_METRICS and not WINDOWED_METRIC.match(metric):
+            raise ValueError(f"Unknown alert metric '{metric}'")
+        if 'above' not in rule and 'below' not in rule:
+            raise ValueError(f"Alert rule for '{metric}' needs an 'above' or 'below' threshold")
+        metrics.add(metric)
+    return metrics
+
+
+def compute_metrics(prices, metrics=DEFAULT_METRICS):
+    """
+    Compute the latest value of each requested metric for one fund.
+
+    Returns and drawdowns are percentages; volatility is the annualized
+    standard deviation of daily log returns, in percent. Metrics that need
+    more history than is stored are left out.
+
+    Args:
+        prices (numpy.ndarray): Daily prices, oldest first
+        metrics (iterable): Metric names (see WINDOWED_METRIC and PLAIN_METRICS)
+
+    Returns:
+        dict: metric name -> float
+    """
+    prices = np.asarray(prices, dtype=float)
+    if not prices.size:
+        return {}
+
+    result = {'price': float(prices[-1])}
+    series = drawdowns(prices)
+    result['drawdown'] = float(series[-1] * 100)
+    result['max_drawdown'] = float(series.max() * 100)
+
+    log_returns = None
+    for metric in metrics:
+        match = WINDOWED_METRIC.match(metric)
+        if not match:
+            continue
+        name, window = match.group(1), int(match.group(2))
+        if name == 'return':
+            values = n_day_returns(prices, window)
+            if values.size:
+                result[metric] = float(values[-1] * 100)
+        elif name in ('ma', 'price_vs_ma'):
+            values = rolling_mean(prices, window)
+            if values.size:
+                result[f'ma_{window}d'] = float(values[-1])
+                result[f'price_vs_ma_{window}d'] = float((prices[-1] / values[-1] - 1.0) * 100)
+        elif name == 'volatility':
+            if log_returns is None:
+                log_returns = np.diff(np.log(prices))
+            values = rolling_std(log_returns, window)
+            if values.size:
+                result[metric] = float(values[-1] * math.sqrt(TRADING_DAYS_PER_YEAR) * 100)
+    return result
+
+
+def evaluate_rules(metrics, rules):
+    """
+    Check computed metrics against alert rules.
+
+    Args:
+        metrics (dict): Output of compute_metrics()
+        rules (list): Alert rules with 'metric' and 'above' and/or 'below'
+
+    Returns:
+        list: Alert messages for every rule that fired
+    """
+    alerts = []
+    for rule in rules or []:
+        metric = rule['metric']
+        value = metrics.get(metric)
+        if value is None:
+            continue
+        label = metric.replace('_', ' ')
+        if 'above' in rule and value > float(rule['above']):
+            alerts.append(f"ALERT {label} {value:.2f} above {rule['above']}")
+        if 'below' in rule and value < float(rule['below']):
+            alerts.append(f"ALERT {label} {value:.2f} below {rule['below']}")
+    return alerts
+
+
+def load_price_arrays(history, port_ids=None):
+    """
+    Load the price history of one or more funds into NumPy arrays.
+
+    Every fund is read in a single query and split on fund boundaries.
+
+    Args:
+        history (PriceHistoryStore): Price history store
+        port_ids (list): Port IDs to load (None for every fund)
+
+    Returns:
+        dict: port_id -> numpy.ndarray of prices, oldest first
+    """
+    rows = history.price_history(port_ids)
+    if not rows:
+        return {}
+    funds = np.array([row[0] for row in rows])
+    prices = np.fromiter((row[1] for row in rows), dtype=float, count=len(rows))
+    # Rows are ordered by fund, so each fund is one contiguous slice
+    starts = np.flatnonzero(np.concatenate(([True], funds[1:] != funds[:-1])))
+    ends = np.append(starts[1:], len(rows))
+    return {str(funds[start]): prices[start:end] for start, end in zip(starts, ends)}
+
+
+def fund_alerts(history, port_id, rules):
+    """
+    Compute a fund's metrics from its stored history and evaluate its alert rules.
+
+    Args:
+        history (PriceHistoryStore): Price history store
+        port_id (str): Vanguard port ID of the fund
+        rules (list): Alert rules from funds_config.yml
+
+    Returns:
+        list: Alert messages for every rule that fired
+
+    Raises:
+        ValueError: If a rule is malformed or names an unknown metric
+    """
+    metrics = required_metrics(rules)
+    prices = load_price_arrays(history, [port_id]).get(str(port_id))
+    if prices is None:
+        return []
+    return evaluate_rules(compute_metrics(prices, metrics), rules)
+
+
+def main():
+    """Print analytics for every configured fund with stored history."""
+    from price_history import PriceHistoryStore
+    from vanguard_scraper import fund_port_id, load_funds_config
+
+    parser = argparse.ArgumentParser(description='Analytics over stored fund price history.')
+    parser.add_argument('--db', default=None, help='Price history database (default: PRICE_HISTORY_DB)')
+    parser.add_argument('--config', default='funds_config.yml', help='Funds configuration file')
+    args = parser.parse_args()
+
+    funds = load_funds_config(args.config)
+    with PriceHistoryStore(args.db) as history:
+        arrays = load_price_arrays(history, [fund_port_id(fund) for fund in funds if fund_port_id(fund)])
+
+    for fund in funds:
+        port_id = fund_port_id(fund)
+        prices = arrays.get(str(port_id))
+        print(f"\n{fund.get('name', port_id)} ({port_id})")
+        if prices is None:
+            print("  No price history stored")
+            continue
+        rules = fund.get('alerts') or []
+        try:
+            metrics = compute_metrics(prices, set(DEFAULT_METRICS) | required_metrics(rules))
+        except ValueError as e:
+            print(f"  ❌ Invalid alert rules: {e}")
+            continue
+        print(f"  {len(prices)} price days")
+        for name, value in sorted(metrics.items()):
+            print(f"  {name:<20} {value:>10.4f}")
+        for alert in evaluate_rules(metrics, rules):
+            print(f"  ⚠️  {alert}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Bulk backfill of fund price history.
+
+Loads a fund's full history in one go instead of building it up one day
+at a time:
+
+- from the data endpoint, which returns the complete price and
+  distribution history for a port ID,
+- from the fund page, after loading every page of older prices, when the
+  endpoint is unavailable (or with --browser),
+- from a CSV export (--csv), read one row at a time.
+
+Rows are written to the price history database in batches, one
+transaction per batch, and rows that are already stored are skipped.
+
+Usage:
+    python backfill.py [--fund NAME_OR_PORT_ID ...] [--group GROUP ...] [--tag TAG ...] [--browser]
+    python backfill.py --csv prices.csv --port-id 8110 [--kind distributions]
+"""
+
+import argparse
+import csv
+import os
+import sys
+from itertools import islice
+from browser_pool import BrowserSession
+from fund_rows import ROW_TYPES
+from price_history import PriceHistoryStore
+from rate_limiter import HostRateLimiter
+from table_extractor import iter_tables
+from vanguard_api import VanguardApiClient
+from vanguard_scraper import (
+    fetch_fund_from_api,
+    fund_data_tables,
+    fund_port_id,
+    load_funds_config,
+    scrape_vanguard_page,
+)
+
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def batched(rows, size):
+    """
+    Group an iterable of rows into lists of at most size rows.
+
+    Args:
+        rows: Iterable of rows
+        size (int): Rows per batch
+
+    Yields:
+        list: The next batch of rows
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def store_rows(history, port_id, kind, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Write typed rows to the history store in batches.
+
+    Args:
+        history (PriceHistoryStore): Price history store
+        port_id (str): Vanguard port ID of the fund
+        kind (str): 'prices' or 'distributions'
+        rows: Iterable of typed rows (consumed lazily)
+        batch_size (int): Rows written per transaction
+
+    Returns:
+        tuple: (rows_read, rows_stored)
+    """
+    headers = list(ROW_TYPES[kind].HEADERS)
+    rows_read = 0
+    rows_stored = 0
+    for batch in batched(rows, batch_size):
+        rows_read += len(batch)
+        rows_stored += history.add_table(port_id, {'headers': headers, 'rows': batch, 'kind': kind})
+    print(f"💾 {kind}: read {rows_read} row(s), stored {rows_stored} new")
+    return rows_read, rows_stored
+
+
+def csv_kind(headers):
+    """
+    Guess whether a CSV export holds daily prices or distributions.
+
+    Args:
+        headers (list): The CSV's header row
+
+    Returns:
+        str: 'distributions' or 'prices'
+    """
+    joined = ' '.join(headers).lower()
+    if 'distribution' in joined or 'cents per unit' in joined or 'cpu' in joined:
+        return 'distributions'
+    return 'prices'
+
+
+def backfill_csv(history, path, port_id, kind=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream a CSV export of prices or distributions into the history store.
+
+    The first row must be a header row; columns are matched by name
+    (e.g. Date, Buy, Sell, NAV), in any order and any case. Rows whose date
+    cannot be read are skipped.
+
+    Args:
+        history (PriceHistoryStore): Price history store
+        path (str): CSV file
+        port_id (str): Vanguard port ID the rows belong to
+        kind (str): 'prices' or 'distributions' (guessed from the headers if not given)
+        batch_size (int): Rows written per transaction
+
+    Returns:
+        tuple: (rows_read, rows_stored)
+
+    Raises:
+        ValueError: If the file is empty or has no date column
+    """
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        headers = [header.strip() for header in next(reader, [])]
+        if not headers:
+            raise ValueError(f"{path} is empty")
+        kind = kind or csv_kind(headers)
+        row_type = ROW_TYPES[kind]
+        columns = row_type.column_map(headers)
+        if kind == 'prices' and columns[0] is None:
+            raise ValueError(f"{path} has no Date column")
+
+        print(f"Loading {kind} for port ID {port_id} from {path}...")
+        rows = (row_type.from_cells(cells, columns) for cells in reader if cells)
+        return store_rows(history, port_id, kind, (row for row in rows if row is not None), batch_size)
+
+
+def backfill_fund(fund_config, history, api_client=None, session=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Load every available historical row for a fund into the history store.
+
+    Args:
+        fund_config (dict): Fund configuration containing name, url and port_id
+        history (PriceHistoryStore): Price history store
+        api_client (VanguardApiClient): Client for the data endpoint (optional;
+            without one, the fund page is used)
+        session (BrowserSession): Browser session for the page fallback (optional)
+        batch_size (int): Rows written per transaction
+
+    Returns:
+        int: Number of new rows stored, or None if no data could be fetched
+    """
+    fund_name = fund_config.get('name', 'Unknown Fund')
+    port_id = fund_port_id(fund_config)
+    print(f"\n{'='*60}")
+    print(f"BACKFILLING: {fund_name}")
+    print(f"{'='*60}")
+    if not port_id:
+        print(f"❌ {fund_name} has no port_id; history is keyed by port ID")
+        return None
+
+    stored = 0
+    data = fetch_fund_from_api(port_id, api_client) if api_client is not None else None
+    if data is not None:
+        for table in fund_data_tables(data):
+            if table['kind'] in ROW_TYPES:
+                stored += store_rows(history, port_id, table['kind'], table['rows'], batch_size)[1]
+        return stored
+
+    page = scrape_vanguard_page(fund_config.get('url', ''), session=session, expand_history=True)
+    if page is None:
+        print(f"❌ Could not load the fund page for {fund_name}")
+        return None
+    for kind, _, rows in iter_tables(page):
+        if kind in ROW_TYPES:
+            stored += store_rows(history, port_id, kind, rows, batch_size)[1]
+        else:
+            rows.close()
+    return stored
+
+
+def main():
+    """Run a backfill from the command line."""
+    parser = argparse.ArgumentParser(description='Load full fund price history into the local database.')
+    parser.add_argument('--fund', action='append', help='Fund name or port ID to backfill (repeatable; default: every configured fund)')
+    parser.add_argument('--group', action='append', help='Backfill every fund in this group (repeatable)')
+    parser.add_argument('--tag', action='append', help='Backfill every fund with this tag (repeatable)')
+    parser.add_argument('--config', default='funds_config.yml', help='Funds configuration file')
+    parser.add_argument('--browser', action='store_true', help='Read history from the fund page instead of the data endpoint')
+    parser.add_argument('--csv', help='Load rows from this CSV export instead of fetching them')
+    parser.add_argument('--port-id', help='Port ID the CSV rows belong to (required with --csv)')
+    parser.add_argument('--kind', choices=sorted(ROW_TYPES), help='What the CSV holds (guessed from its headers if not given)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows written per transaction')
+    parser.add_argument('--db', default=None, help='Price history database (default: PRICE_HISTORY_DB)')
+    args = parser.parse_args()
+
+    with PriceHistoryStore(args.db) as history:
+        if args.csv:
+            if not args.port_id:
+                parser.error('--port-id is required with --csv')
+            try:
+                backfill_csv(history, args.csv, args.port_id, args.kind, args.batch_size)
+            except (OSError, ValueError) as e:
+                print(f"❌ {e}")
+                return 1
+            return 0
+
+        funds = load_funds_config(args.config, funds=args.fund, groups=args.group, tags=args.tag)
+        if not funds:
+            print("❌ No matching funds configured.")
+            return 1
+
+        fast_path = not args.browser and os.getenv('VANGUARD_FAST_PATH', 'true').lower() in ('1', 'true', 'yes')
+        api_client = VanguardApiClient() if fast_path else None
+        limiter = HostRateLimiter(float(os.getenv('SCRAPER_HOST_INTERVAL', '3')))
+        failed = 0
+        with BrowserSession() as session:
+            for fund in funds:
+                limiter.wait(fund.get('url', ''))
+                if backfill_fund(fund, history, api_client, session, args.batch_size) is None:
+                    failed += 1
+        if api_client is not None:
+            api_client.close()
+
+    print(f"\n✅ Backfilled {len(funds) - failed} of {len(funds)} fund(s)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for price table extraction.
+
+Compares the original extraction path (BeautifulSoup with 'html.parser'
+walking every row of every table) against the targeted lxml extractor in
+table_extractor.py, over saved fund page snapshots.
+
+Snapshots can be captured from a real run by setting SCRAPER_SNAPSHOT_DIR.
+
+Usage:
+    python benchmarks/bench_extraction.py [snapshot_dir] [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table_extractor import extract_price_tables, parse_page  # noqa: E402
+
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+
+
+def legacy_extract(page_source):
+    """
+    The original extraction path, without its print statements.
+
+    Args:
+        page_source (str): Page source
+
+    Returns:
+        tuple: (headers, latest_row, previous_row) or None
+    """
+    soup = BeautifulSoup(page_source, 'html.parser')
+    for table in soup.find_all('table'):
+        headers = []
+        header_row = table.find('thead')
+        if header_row:
+            headers = [cell.get_text(strip=True) for cell in header_row.find_all(['th', 'td'])]
+        else:
+            first_row = table.find('tr')
+            if first_row:
+                headers = [cell.get_text(strip=True) for cell in first_row.find_all(['th', 'td'])]
+
+        if not any(keyword in ' '.join(headers).lower() for keyword in
+                   ['date', 'price', 'nav', 'unit', 'value', 'distribution']):
+            continue
+
+        rows = table.find_all('tr')
+        for row in rows[:10]:
+            [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+
+        data_rows = []
+        for row in rows:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                row_data = [cell.get_text(strip=True) for cell in cells]
+                if row_data and any('$' in str(cell) for cell in row_data):
+                    data_rows.append(row_data)
+
+        if data_rows:
+            headers = [cell.get_text(strip=True) for cell in rows[0].find_all(['th', 'td'])]
+            return headers, data_rows[0], data_rows[1] if len(data_rows) > 1 else None
+    return None
+
+
+def targeted_extract(page_source):
+    """
+    The lxml extraction path used by the scraper.
+
+    Args:
+        page_source (str): Page source
+
+    Returns:
+        tuple: (headers, latest_row, previous_row) or None
+    """
+    tables = extract_price_tables(parse_page(page_source), max_rows=2, limit=1)
+    if not tables:
+        return None
+    # Typed rows are compared with the legacy path by their display text
+    rows = [list(row) for row in tables[0]['rows']]
+    return tables[0]['headers'], rows[0], rows[1] if len(rows) > 1 else None
+
+
+def time_function(func, page_source, repeat):
+    """Return the best per-call time in seconds over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(page_source)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Run the benchmark over every snapshot and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('snapshot_dir', nargs='?', default=DEFAULT_SNAPSHOT_DIR,
+                        help='Directory of saved .html fund pages')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per snapshot (best time is reported)')
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.snapshot_dir, '*.html')))
+    if not paths:
+        print(f"❌ No .html snapshots found in {args.snapshot_dir}")
+        return 1
+
+    print(f"{'Snapshot':<30} {'Size':>9} {'Legacy':>10} {'Targeted':>10} {'Speedup':>8}  Match")
+    print("-" * 78)
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            page_source = file.read()
+
+        legacy_time = time_function(legacy_extract, page_source, args.repeat)
+        targeted_time = time_function(targeted_extract, page_source, args.repeat)
+        match = legacy_extract(page_source) == targeted_extract(page_source)
+
+        print(f"{os.path.basename(path):<30} {len(page_source):>9,} "
+              f"{legacy_time * 1000:>8.2f}ms {targeted_time * 1000:>8.2f}ms "
+              f"{legacy_time / targeted_time:>7.1f}x  {'yes' if match else 'NO'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
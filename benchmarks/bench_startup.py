@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the scraper.
+
+Measures, in fresh Python processes:
+
+- interpreter start-up on its own (the floor for everything else),
+- the time to import vanguard_scraper, and which heavy optional modules
+  (Selenium's webdriver, NumPy, PyYAML, smtplib) that import pulled in,
+- time to first fund: from launching the process to having fetched,
+  parsed and notified one fund through the data endpoint fast path,
+  with no browser.
+
+The data endpoint and ntfy server are replaced by a local stand-in, so no
+network access is needed. Use --output to append each run's results as a
+JSON line and track them across releases.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only some code paths need; none of them should load on import
+HEAVY_MODULES = ('selenium.webdriver', 'numpy', 'yaml', 'smtplib')
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import vanguard_scraper
+elapsed = time.perf_counter() - started
+print(json.dumps({'import': elapsed, 'loaded': [name for name in %r if name in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+FIRST_FUND_SCRIPT = """
+import json, time
+from notifier import build_notifier
+from vanguard_api import VanguardApiClient
+from vanguard_scraper import scrape_fund
+notifier = build_notifier()
+api_client = VanguardApiClient()
+timings = scrape_fund({'name': 'Startup Benchmark Fund', 'port_id': '8110', 'url': 'https://example.invalid/8110'},
+                      notifier, api_client=api_client)
+notifier.close()
+api_client.close()
+print(json.dumps({'finished_at': time.time(), 'source': timings.get('source'), 'failed': bool(timings.get('failed'))}))
+"""
+
+PRICES = {'data': [
+    {'asOfDate': '2025-10-17', 'buyPrice': 2.5020, 'sellPrice': 2.4980, 'navPrice': 2.5000},
+    {'asOfDate': '2025-10-16', 'buyPrice': 2.5175, 'sellPrice': 2.5134, 'navPrice': 2.5154},
+]}
+DISTRIBUTIONS = {'data': [
+    {'distributionDate': '2025-10-01', 'centsPerUnit': 1.2345, 'reinvestmentDate': '2025-10-01',
+     'reinvestmentPrice': 2.4812},
+]}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the prices and distributions endpoints and accepts ntfy posts."""
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.endswith('/prices'):
+            body = json.dumps(PRICES).encode('utf-8')
+        elif path.endswith('/distributions'):
+            body = json.dumps(DISTRIBUTIONS).encode('utf-8')
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def median(values):
+    """Return the median of a non-empty list."""
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def run_python(script, env):
+    """
+    Run a script in a fresh interpreter from the repository directory.
+
+    Returns:
+        tuple: (wall seconds, the last line of output parsed as JSON, or None if there was no output)
+    """
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', script], cwd=REPO_DIR, env=env,
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else
+                           f"exit code {result.returncode}")
+    lines = result.stdout.strip().splitlines()
+    return elapsed, json.loads(lines[-1]) if lines else None
+
+
+def benchmark_env(port):
+    """Build an environment that keeps every child run stateless and offline."""
+    env = dict(os.environ)
+    env.update({
+        'PYTHONDONTWRITEBYTECODE': '1',
+        'VANGUARD_API_BASE': f"http://127.0.0.1:{port}",
+        'NTFY_URL': f"http://127.0.0.1:{port}/ntfy",
+        'NOTIFY_BACKENDS': 'ntfy',
+        'NTFY_ASYNC': 'false',
+        'NTFY_DIGEST': 'false',
+        'SCRAPER_BROWSER': 'false',
+        'PRICE_HISTORY_DB': '',
+        'FUND_STATE_FILE': '',
+        'FUND_HEALTH_FILE': '',
+        'RESPONSE_CACHE_DIR': '',
+    })
+    return env
+
+
+def main():
+    """Run the start-up benchmark and print a report."""
+    parser = argparse.ArgumentParser(description='Cold start benchmark (import time and time to first fund).')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh processes per measurement')
+    parser.add_argument('--output', help='Append the results to this file as a JSON line')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    env = benchmark_env(server.server_address[1])
+
+    try:
+        interpreter, imports, first_fund = [], [], []
+        loaded = set()
+        for _ in range(args.repeat):
+            interpreter.append(run_python('pass', env)[0])
+
+            _, result = run_python(IMPORT_SCRIPT, env)
+            imports.append(result['import'])
+            loaded.update(result['loaded'])
+
+            launched = time.time()
+            _, result = run_python(FIRST_FUND_SCRIPT, env)
+            if result['failed'] or result['source'] != 'api':
+                print("❌ The benchmark fund was not fetched from the stand-in data endpoint")
+                return 1
+            first_fund.append(result['finished_at'] - launched)
+    except RuntimeError as e:
+        print(f"❌ Benchmark process failed: {e}")
+        return 1
+    finally:
+        server.shutdown()
+
+    results = {
+        'interpreter_ms': median(interpreter) * 1000,
+        'import_ms': median(imports) * 1000,
+        'first_fund_ms': median(first_fund) * 1000,
+    }
+    print(f"{'Measurement':<36} {'Median':>10} {'Min':>10} {'Max':>10}")
+    print("-" * 69)
+    for label, values in (('Interpreter start-up', interpreter),
+                          ('import vanguard_scraper', imports),
+                          ('Time to first fund (fast path)', first_fund)):
+        print(f"{label:<36} {median(values) * 1000:>8.1f}ms {min(values) * 1000:>8.1f}ms {max(values) * 1000:>8.1f}ms")
+
+    if loaded:
+        print(f"\n⚠️  Imported eagerly: {', '.join(sorted(loaded))}")
+    else:
+        print(f"\n✅ Not imported at start-up: {', '.join(HEAVY_MODULES)}")
+
+    if args.output:
+        record = dict(results, timestamp=time.time(), python=platform.python_version(),
+                      repeat=args.repeat, eager_modules=sorted(loaded))
+        with open(args.output, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + '\n')
+        print(f"📈 Results appended to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for parsing and formatting.
+
+Runs extract_historical_prices_table, format_for_ntfy and format_for_slack
+over a corpus of saved fund pages (daily-price, distribution, malformed
+and very large pages) and reports throughput, peak memory and per-function
+latency percentiles for each kind of page. No network access is needed.
+
+The synthetic corpus is generated by make_corpus.py on first use; saved
+real pages (see SCRAPER_SNAPSHOT_DIR) can be benchmarked with --corpus.
+
+Usage:
+    python benchmarks/bench_suite.py [--corpus DIR] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from make_corpus import DEFAULT_CORPUS_DIR, write_corpus  # noqa: E402
+from metrics import METRICS  # noqa: E402
+from table_extractor import parse_page  # noqa: E402
+from vanguard_scraper import (  # noqa: E402
+    extract_historical_prices_table,
+    extract_prices_table,
+    format_for_ntfy,
+    format_for_slack,
+)
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def page_kind(path):
+    """Group pages by the prefix of their file name (e.g. 'daily_003.html' -> 'daily')."""
+    return os.path.basename(path).split('_', 1)[0]
+
+
+def run_page(page_source, latencies):
+    """
+    Run every benchmarked function once over a page.
+
+    Args:
+        page_source (str): Page HTML
+        latencies (dict): function name -> list of seconds, appended to
+    """
+    started = time.perf_counter()
+    extract_historical_prices_table(parse_page(page_source))
+    latencies['extract_historical_prices_table'].append(time.perf_counter() - started)
+
+    table = extract_prices_table(parse_page(page_source))
+    if table is None:
+        return
+    headers, rows = table['headers'], table['rows']
+    previous_row = rows[1] if len(rows) > 1 else None
+
+    started = time.perf_counter()
+    format_for_ntfy(headers, rows[0], previous_row)
+    latencies['format_for_ntfy'].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    format_for_slack(headers, rows[0], previous_row)
+    latencies['format_for_slack'].append(time.perf_counter() - started)
+
+
+def benchmark_kind(pages, repeat):
+    """
+    Benchmark one kind of page.
+
+    Args:
+        pages (list): Page sources
+        repeat (int): Passes over the pages
+
+    Returns:
+        dict: 'pages_per_sec', 'peak_kib', 'bytes' and per-function 'latencies'
+    """
+    latencies = {name: [] for name in ('extract_historical_prices_table', 'format_for_ntfy', 'format_for_slack')}
+
+    # The scraper prints as it goes; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Peak memory is measured on a separate pass so tracing doesn't skew timings
+        tracemalloc.start()
+        for page_source in pages:
+            run_page(page_source, {name: [] for name in latencies})
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for page_source in pages:
+                run_page(page_source, latencies)
+            METRICS.reset()
+        elapsed = time.perf_counter() - started
+
+    return {
+        'pages_per_sec': len(pages) * repeat / elapsed if elapsed else 0.0,
+        'peak_kib': peak / 1024,
+        'bytes': sum(len(page) for page in pages),
+        'latencies': latencies,
+    }
+
+
+def main():
+    """Run the benchmark suite and print a report."""
+    parser = argparse.ArgumentParser(description='Offline parsing and formatting benchmarks.')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR,
+                        help='Directory of .html pages (generated if it does not exist)')
+    parser.add_argument('--repeat', type=int, default=10, help='Passes over each kind of page')
+    args = parser.parse_args()
+
+    if not glob.glob(os.path.join(args.corpus, '*.html')):
+        if args.corpus != DEFAULT_CORPUS_DIR:
+            print(f"❌ No .html pages found in {args.corpus}")
+            return 1
+        print(f"Generating synthetic corpus in {args.corpus}...")
+        write_corpus(args.corpus)
+
+    pages_by_kind = {}
+    for path in sorted(glob.glob(os.path.join(args.corpus, '*.html'))):
+        with open(path, encoding='utf-8') as file:
+            pages_by_kind.setdefault(page_kind(path), []).append(file.read())
+
+    print(f"{'Kind':<14} {'Pages':>5} {'Avg size':>10} {'Pages/sec':>10} {'Py peak':>10}")
+    print("-" * 53)
+    results = {}
+    for kind, pages in pages_by_kind.items():
+        results[kind] = benchmark_kind(pages, args.repeat)
+        result = results[kind]
+        print(f"{kind:<14} {len(pages):>5} {result['bytes'] // len(pages):>9,}B "
+              f"{result['pages_per_sec']:>10.1f} {result['peak_kib']:>8.0f}KiB")
+
+    print(f"\n{'Kind':<14} {'Function':<33} {'p50':>9} {'p90':>9} {'p99':>9}")
+    print("-" * 78)
+    for kind, result in results.items():
+        for name, values in result['latencies'].items():
+            if not values:
+                continue
+            print(f"{kind:<14} {name:<33} "
+                  f"{percentile(values, 50) * 1000:>7.3f}ms {percentile(values, 90) * 1000:>7.3f}ms "
+                  f"{percentile(values, 99) * 1000:>7.3f}ms")
+
+    # tracemalloc only sees Python allocations, not lxml's C-level DOM memory
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        max_rss //= 1024
+    print(f"\nProcess peak RSS (includes lxml): {max_rss / 1024:.1f}MiB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Check that streaming extraction matches DOM extraction.
+
+Runs stream_fund_tables() and extract_fund_tables()/page_title() over the
+saved snapshots, the synthetic corpus (generated on first use) and a few
+hand-written pages that have caught differences before, keeping two rows
+and every row, and reports any page where the results differ.
+
+Usage:
+    python benchmarks/check_extraction_parity.py [--corpus DIR] [--snapshots DIR]
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from make_corpus import DEFAULT_CORPUS_DIR, write_corpus  # noqa: E402
+from table_extractor import extract_fund_tables, page_title, parse_page, stream_fund_tables  # noqa: E402
+
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+
+PRICE_TABLE = ('<table><thead><tr><th>Date</th><th>Buy</th><th>Sell</th></tr></thead><tbody>'
+               '<tr><td>17 Oct 2025</td><td>$2.5020</td><td>$2.4980</td></tr>'
+               '<tr><td>16 Oct 2025</td><td>$2.5175</td><td>$2.5134</td></tr></tbody></table>')
+UNIT_VALUE_TABLE = ('<table><tr><th>Unit value</th><th>Amount</th></tr>'
+                    '<tr><td>Latest</td><td>$2.5000</td></tr></table>')
+
+REGRESSION_PAGES = {
+    # A table after the tab panel must not count as inside it
+    'table_after_panel': (f'<html><head><title>Fund</title></head><body>'
+                          f'<div role="tabpanel">{PRICE_TABLE}</div>{UNIT_VALUE_TABLE}</body></html>'),
+    'nested_panels': (f'<html><body><div role="tabpanel"><div role="tabpanel">{PRICE_TABLE}</div>'
+                      f'{UNIT_VALUE_TABLE}</div>{UNIT_VALUE_TABLE}</body></html>'),
+    'no_panel': f'<html><body>{UNIT_VALUE_TABLE}{PRICE_TABLE}</body></html>',
+}
+
+
+def dom_extract(page_source, max_rows):
+    """Extract with the DOM path, returning (title, result) like stream_fund_tables()."""
+    document = parse_page(page_source)
+    return page_title(document), extract_fund_tables(document, max_rows=max_rows)
+
+
+def main():
+    """Compare both extraction paths over every page and report mismatches."""
+    parser = argparse.ArgumentParser(description='Check streaming extraction matches DOM extraction.')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR, help='Synthetic corpus directory')
+    parser.add_argument('--snapshots', default=DEFAULT_SNAPSHOT_DIR, help='Saved page snapshot directory')
+    args = parser.parse_args()
+
+    if not glob.glob(os.path.join(args.corpus, '*.html')):
+        write_corpus(args.corpus)
+    pages = dict(REGRESSION_PAGES)
+    for directory in (args.snapshots, args.corpus):
+        for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+            with open(path, encoding='utf-8') as file:
+                pages[os.path.relpath(path)] = file.read()
+
+    mismatches = 0
+    for name, page_source in pages.items():
+        for max_rows in (2, None):
+            if stream_fund_tables(page_source, max_rows=max_rows) != dom_extract(page_source, max_rows):
+                mismatches += 1
+                print(f"❌ {name} (max_rows={max_rows}): streaming result differs from the DOM result")
+
+    if mismatches:
+        print(f"\n❌ {mismatches} mismatch(es) over {len(pages)} page(s)")
+        return 1
+    print(f"✅ Streaming and DOM extraction match on all {len(pages)} page(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic corpus of Vanguard fund pages for offline benchmarks.
+
+The pages mimic the structure of the rendered fund page (navigation, page
+chrome, a prices tab panel) and come in four kinds:
+
+- daily:        daily prices table (Date/Buy/Sell/NAV)
+- distribution: distributions table only
+- malformed:    truncated markup, missing cells, tables without headers
+- large:        years of daily prices plus heavy page chrome
+
+Usage:
+    python benchmarks/make_corpus.py [output_dir] [--per-kind N]
+"""
+
+import argparse
+import datetime
+import os
+import random
+
+
+DEFAULT_CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+KINDS = ('daily', 'distribution', 'malformed', 'large')
+
+
+def _chrome(rng, weight):
+    """Build navigation, content cards and footer padding."""
+    nav = ''.join(f'<li><a href="/personal/link-{i}">Menu item {i}</a></li>' for i in range(50 * weight))
+    cards = ''.join(
+        f'<div class="card"><h3>Insight {i}</h3><p>{"Lorem ipsum dolor sit amet. " * rng.randint(4, 12)}</p></div>'
+        for i in range(20 * weight)
+    )
+    fees = '<table class="fees"><tr><th>Fee</th><th>Amount</th></tr><tr><td>Management fee</td><td>0.16%</td></tr></table>'
+    return f'<header><nav><ul>{nav}</ul></nav></header><section class="overview">{cards}{fees}</section>'
+
+
+def _price_rows(rng, days, start=datetime.date(2025, 10, 17)):
+    """Build daily price rows, newest first, skipping weekends."""
+    rows = []
+    date = start
+    price = rng.uniform(1.0, 5.0)
+    while len(rows) < days:
+        if date.weekday() < 5:
+            rows.append(
+                f'<tr><td>{date.strftime("%d %b %Y")}</td><td>${price * 1.0008:.4f}</td>'
+                f'<td>${price * 0.9992:.4f}</td><td>${price:.4f}</td></tr>'
+            )
+            price *= 1 + rng.uniform(-0.01, 0.01)
+        date -= datetime.timedelta(days=1)
+    return ''.join(rows)
+
+
+def _distribution_rows(rng, count):
+    """Build quarterly distribution rows, newest first."""
+    rows = []
+    year, quarter = 2025, 4
+    for _ in range(count):
+        date = datetime.date(year, (quarter - 1) * 3 + 1, 1).strftime('%d %b %Y')
+        rows.append(
+            f'<tr><td>{date}</td><td>{rng.uniform(0.5, 3.0):.4f}</td>'
+            f'<td>{date}</td><td>${rng.uniform(1.0, 5.0):.4f}</td></tr>'
+        )
+        quarter -= 1
+        if quarter == 0:
+            year, quarter = year - 1, 4
+    return ''.join(rows)
+
+
+PRICE_HEAD = '<thead><tr><th>Date</th><th>Buy</th><th>Sell</th><th>NAV</th></tr></thead>'
+DISTRIBUTION_HEAD = ('<thead><tr><th>Distribution date</th><th>Cents per unit</th>'
+                     '<th>Reinvestment date</th><th>Reinvestment price</th></tr></thead>')
+
+
+def build_page(kind, seed=0):
+    """
+    Build one synthetic fund page.
+
+    Args:
+        kind (str): One of KINDS
+        seed (int): Random seed, so the corpus is reproducible
+
+    Returns:
+        str: Page HTML
+    """
+    rng = random.Random(f"{kind}-{seed}")
+
+    if kind == 'daily':
+        chrome = _chrome(rng, 1)
+        panel = f'<table class="prices">{PRICE_HEAD}<tbody>{_price_rows(rng, 30)}</tbody></table>'
+    elif kind == 'distribution':
+        chrome = _chrome(rng, 1)
+        panel = f'<table class="distributions">{DISTRIBUTION_HEAD}<tbody>{_distribution_rows(rng, 12)}</tbody></table>'
+    elif kind == 'large':
+        chrome = _chrome(rng, 60)
+        panel = (f'<table class="prices">{PRICE_HEAD}<tbody>{_price_rows(rng, 5000)}</tbody></table>'
+                 f'<table class="distributions">{DISTRIBUTION_HEAD}<tbody>{_distribution_rows(rng, 40)}</tbody></table>')
+    elif kind == 'malformed':
+        chrome = _chrome(rng, 1)
+        variant = seed % 4
+        if variant == 0:
+            # Truncated mid-table
+            rows = _price_rows(rng, 10)
+            panel = f'<table class="prices">{PRICE_HEAD}<tbody>{rows[:len(rows) // 2]}'
+        elif variant == 1:
+            # Unclosed cells and rows with missing columns
+            panel = (f'<table class="prices">{PRICE_HEAD}<tbody>'
+                     '<tr><td>17 Oct 2025<td>$2.5020<td>$2.4980'
+                     '<tr><td>16 Oct 2025<td>$2.4900'
+                     '<tr><td>15 Oct 2025</tbody></table>')
+        elif variant == 2:
+            # Headerless table with no '$' values
+            panel = '<table><tr><td>17 Oct 2025</td><td>2.5020</td></tr><tr><td>n/a</td><td>-</td></tr></table>'
+        else:
+            # No tables at all
+            panel = '<p>Prices are temporarily unavailable.</p>'
+    else:
+        raise ValueError(f"Unknown page kind: {kind}")
+
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f'<title>Vanguard Fund {kind} {seed} | Vanguard</title></head><body>'
+        f'{chrome}<main><div role="tabpanel" id="prices-and-distributions">{panel}</div></main>'
+        f'<footer>{"<p>Disclaimer text.</p>" * 40}</footer></body></html>'
+    )
+
+
+def write_corpus(output_dir=DEFAULT_CORPUS_DIR, per_kind=5):
+    """
+    Write per_kind pages of every kind to output_dir.
+
+    Args:
+        output_dir (str): Directory to write the corpus to
+        per_kind (int): Pages to generate for each kind
+
+    Returns:
+        list: Paths of the written pages
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for kind in KINDS:
+        for seed in range(per_kind):
+            path = os.path.join(output_dir, f"{kind}_{seed:03d}.html")
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(build_page(kind, seed))
+            paths.append(path)
+    return paths
+
+
+def main():
+    """Generate the corpus from the command line."""
+    parser = argparse.ArgumentParser(description='Generate a synthetic fund page corpus.')
+    parser.add_argument('output_dir', nargs='?', default=DEFAULT_CORPUS_DIR, help='Directory to write pages to')
+    parser.add_argument('--per-kind', type=int, default=5, help='Pages to generate for each kind')
+    args = parser.parse_args()
+
+    paths = write_corpus(args.output_dir, args.per_kind)
+    print(f"✅ Wrote {len(paths)} pages to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Browser session management for the Vanguard scraper.
+
+Starting Chrome is the slowest part of scraping a fund, so this module keeps
+a single headless Chrome driver alive for a whole run and opens each fund
+page in a fresh tab. The driver is recycled after a configurable number of
+pages, or straight away if it crashes. BrowserPool hands out several such
+sessions to concurrent workers.
+
+Selenium's webdriver package is only imported when the first browser is
+started, and SCRAPER_BROWSER=false disables the browser altogether for
+installs without Chrome that rely on the data endpoint.
+"""
+
+import os
+import queue
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+def browser_enabled():
+    """Return False if the browser fallback is disabled with SCRAPER_BROWSER=false."""
+    return os.getenv('SCRAPER_BROWSER', 'true').lower() in ('1', 'true', 'yes')
+
+
+def build_chrome_options():
+    """
+    Build the headless Chrome options used for every scrape.
+
+    Returns:
+        Options: Configured Chrome options
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+    return chrome_options
+
+
+class BrowserSession:
+    """
+    A long-lived headless Chrome driver shared by every fund in a run.
+
+    Each call to open_page() loads the URL in a new tab, and the tab is
+    closed again by close_page(). The underlying driver is restarted after
+    max_pages pages, or when a WebDriverException suggests it has crashed.
+    """
+
+    def __init__(self, max_pages=None):
+        """
+        Initialize the browser session.
+
+        Args:
+            max_pages (int): Pages to load before recycling the driver
+                (defaults to the BROWSER_MAX_PAGES environment variable, or 20)
+        """
+        if max_pages is None:
+            max_pages = int(os.getenv('BROWSER_MAX_PAGES', '20'))
+        self.max_pages = max(1, max_pages)
+        self.driver = None
+        self.pages_loaded = 0
+        self.restarts = 0
+        self._base_handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.quit()
+
+    def _start(self):
+        """
+        Start a new Chrome driver.
+
+        Returns:
+            float: Seconds spent starting the browser
+        """
+        from selenium import webdriver
+
+        print("Starting browser... (this may take a moment)")
+        started = time.perf_counter()
+        self.driver = webdriver.Chrome(options=build_chrome_options())
+        self._base_handle = self.driver.current_window_handle
+        self.pages_loaded = 0
+        return time.perf_counter() - started
+
+    def _ensure_driver(self):
+        """
+        Make sure a healthy driver is available, recycling it if needed.
+
+        Returns:
+            float: Seconds spent starting the browser (0.0 if it was reused)
+        """
+        if self.driver is not None and self.pages_loaded >= self.max_pages:
+            print(f"♻️  Recycling browser after {self.pages_loaded} pages")
+            self.quit()
+            self.restarts += 1
+
+        if self.driver is None:
+            return self._start()
+        return 0.0
+
+    def open_page(self, url, timeout=None):
+        """
+        Load a URL in a new tab of the shared driver.
+
+        Args:
+            url (str): The URL to load
+            timeout (float): Seconds the page may take to load (optional,
+                Selenium's default of 300 if not given)
+
+        Returns:
+            tuple: (driver, timings) where timings is a dict with
+                'startup' and 'navigation' durations in seconds
+
+        Raises:
+            TimeoutException: If the page did not load within timeout
+        """
+        timings = {'startup': self._ensure_driver(), 'navigation': 0.0}
+
+        try:
+            self.driver.switch_to.new_window('tab')
+        except WebDriverException:
+            if timings['startup'] > 0:
+                self.mark_crashed()
+                raise
+            # A reused driver may have died while idle; start a fresh one once
+            self.mark_crashed()
+            timings['startup'] = self._ensure_driver()
+            self.driver.switch_to.new_window('tab')
+
+        try:
+            if timeout is not None:
+                self.driver.set_page_load_timeout(timeout)
+            started = time.perf_counter()
+            self.driver.get(url)
+            timings['navigation'] = time.perf_counter() - started
+        except TimeoutException:
+            # The driver is still usable; close_page() closes the stuck tab
+            raise
+        except WebDriverException:
+            self.mark_crashed()
+            raise
+
+        self.pages_loaded += 1
+        return self.driver, timings
+
+    def close_page(self):
+        """Close the current tab and return to the session's base tab."""
+        if self.driver is None:
+            return
+        try:
+            if self.driver.current_window_handle != self._base_handle:
+                self.driver.close()
+            self.driver.switch_to.window(self._base_handle)
+        except WebDriverException:
+            self.mark_crashed()
+
+    def mark_crashed(self):
+        """Discard the current driver so the next page starts a fresh one."""
+        if self.driver is not None:
+            print("⚠️  Browser session failed, it will be restarted for the next page")
+            self.quit()
+            self.restarts += 1
+
+    def quit(self):
+        """Shut down the driver if one is running."""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+            self._base_handle = None
+
+
+class BrowserPool:
+    """
+    A fixed-size pool of BrowserSessions for concurrent scraping.
+
+    Sessions are started lazily, so a pool is cheap to create even if only
+    a few funds end up being scraped. Each worker checks a session out for
+    the duration of one fund and returns it afterwards.
+    """
+
+    def __init__(self, size, max_pages=None):
+        """
+        Initialize the browser pool.
+
+        Args:
+            size (int): Number of browser sessions in the pool
+            max_pages (int): Pages each session loads before recycling
+        """
+        self.size = max(1, size)
+        self._sessions = [BrowserSession(max_pages=max_pages) for _ in range(self.size)]
+        self._available = queue.Queue()
+        for session in self._sessions:
+            self._available.put(session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.quit()
+
+    @contextmanager
+    def session(self):
+        """
+        Check a browser session out of the pool.
+
+        Yields:
+            BrowserSession: A session for the caller's exclusive use
+        """
+        session = self._available.get()
+        try:
+            yield session
+        finally:
+            self._available.put(session)
+
+    @property
+    def restarts(self):
+        """int: Total driver restarts across every session in the pool."""
+        return sum(session.restarts for session in self._sessions)
+
+    def quit(self):
+        """Shut down every browser in the pool."""
+        for session in self._sessions:
+            session.quit()
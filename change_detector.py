@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Change detection for fund price tables.
+
+Remembers a content hash of each fund's latest row between runs, so the
+scraper can tell when nothing has been published since the last check
+(weekends, public holidays) and skip formatting and sending a duplicate
+notification.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+
+def table_fingerprint(table):
+    """
+    Hash the headers and latest row of a table record.
+
+    Args:
+        table (dict): Table record with 'headers' and 'rows' (newest first)
+
+    Returns:
+        str: Hex digest identifying the table's latest data
+    """
+    # Typed rows are laid out in the table's own columns, as the page showed them
+    latest = table['rows'][0]
+    cells = latest.cells(table['headers']) if hasattr(latest, 'cells') else list(latest)
+    content = json.dumps([table.get('kind'), table['headers'], cells], ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class FundStateCache:
+    """
+    JSON-file cache of the last-seen latest row fingerprint for each fund.
+
+    Safe to share between scraper threads. The file is rewritten atomically
+    whenever a fingerprint changes.
+    """
+
+    def __init__(self, path=None):
+        """
+        Load the cache from disk.
+
+        Args:
+            path (str): Cache file (defaults to FUND_STATE_FILE, or fund_state.json)
+        """
+        self.path = path or os.getenv('FUND_STATE_FILE', 'fund_state.json')
+        self._lock = threading.Lock()
+        self._state = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                self._state = json.load(file)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable fund state file '{self.path}': {e}")
+
+    def is_unchanged(self, fund_key, fingerprint):
+        """
+        Check whether a fund's latest data matches the last notified data.
+
+        Args:
+            fund_key (str): Port ID or URL identifying the fund
+            fingerprint (str): Fingerprint from table_fingerprint()
+
+        Returns:
+            bool: True if the fingerprint matches the remembered one
+        """
+        with self._lock:
+            return self._state.get(fund_key) == fingerprint
+
+    def remember(self, fund_key, fingerprint):
+        """
+        Record a fund's latest fingerprint and save the cache.
+
+        Args:
+            fund_key (str): Port ID or URL identifying the fund
+            fingerprint (str): Fingerprint from table_fingerprint()
+        """
+        with self._lock:
+            if self._state.get(fund_key) == fingerprint:
+                return
+            self._state[fund_key] = fingerprint
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as file:
+                    json.dump(self._state, file, indent=2, sort_keys=True)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"⚠️  Could not save fund state file '{self.path}': {e}")
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Loading, validation and indexing of funds_config.yml.
+
+The YAML file is parsed and checked once, up front, and every problem in
+the file is reported together. An invalid fund entry is skipped with a
+warning and unknown keys are ignored, so one typo doesn't stop the other
+funds being scraped; load_config(strict=True) (the --check-config
+option) fails on any problem instead. The result is compiled into a
+FundConfig with funds indexed by port ID, name, group and tag, and
+cached twice: in memory, and as JSON in FUND_CONFIG_CACHE (default:
+.fund_config_cache.json, empty to disable). Both are keyed by the file's
+modification time and size, so an unchanged file is never parsed again,
+even by a new process.
+
+Besides name, url, port_id and alerts, each fund can have:
+
+    tags:      Free-form labels, e.g. [core, international]
+    groups:    Groups the fund belongs to (or 'group' for just one)
+    schedule:  Daemon run times/days for this fund, e.g.
+               {times: "06:00,18:00", days: mon-fri}
+
+A top-level 'groups' section can give every fund in a group tags and a
+schedule; a fund's own schedule takes precedence over its group's:
+
+    groups:
+      diversified:
+        tags: [multi-asset]
+        schedule: {times: "07:00", days: tue-sat}
+"""
+
+import json
+import os
+import re
+from urllib.parse import parse_qs, urlparse
+from market_calendar import parse_days, parse_times
+
+
+# Bump when the compiled form changes, so older caches are recompiled
+CACHE_VERSION = 2
+
+FUND_URL_TEMPLATE = "https://www.vanguard.com.au/personal/invest-with-us/fund?portId={port_id}&tab=prices-and-distributions"
+
+FUND_KEYS = ('name', 'url', 'port_id', 'tags', 'group', 'groups', 'schedule', 'alerts')
+GROUP_KEYS = ('tags', 'schedule')
+SCHEDULE_KEYS = ('times', 'days')
+PORT_ID = re.compile(r'^\d+$')
+
+# Compiled configurations by absolute path: (stamp, FundConfig)
+_compiled = {}
+
+
+def describe_problems(source, problems):
+    """Format a list of configuration problems as one message."""
+    if len(problems) == 1:
+        return f"{source}: {problems[0]}"
+    return f"{source} has {len(problems)} problems:\n" + "\n".join(f"  - {problem}" for problem in problems)
+
+
+class ConfigError(ValueError):
+    """Raised when the funds configuration can't be read, or has invalid entries in strict mode."""
+
+    def __init__(self, source, errors):
+        """
+        Args:
+            source (str): Configuration file
+            errors (list): Problems found, one message each
+        """
+        self.source = source
+        self.errors = list(errors)
+        super().__init__(describe_problems(source, self.errors))
+
+
+class FundConfig:
+    """
+    Validated fund configurations with lookups by port ID, name, group and tag.
+
+    Fund entries are plain dicts with 'name', 'url', 'port_id', 'tags',
+    'groups' and 'schedule' (None for the default schedule), plus 'alerts'
+    if the fund has any. problems lists what was wrong with the file, and
+    skipped counts the fund entries left out because of it.
+    """
+
+    def __init__(self, funds, groups=None, problems=None, skipped=0):
+        """
+        Build the indexes.
+
+        Args:
+            funds (list): Compiled fund entries, in config order
+            groups (dict): Compiled group settings by group name
+            problems (list): Problems found in the file, one message each
+            skipped (int): Invalid fund entries that were left out
+        """
+        self.funds = funds
+        self.groups = groups or {}
+        self.problems = problems or []
+        self.skipped = skipped
+        self.by_port_id = {}
+        self.by_name = {}
+        self.by_group = {}
+        self.by_tag = {}
+        for fund in funds:
+            self.by_port_id[fund['port_id']] = fund
+            self.by_name[fund['name'].lower()] = fund
+            for group in fund['groups']:
+                self.by_group.setdefault(group, []).append(fund)
+            for tag in fund['tags']:
+                self.by_tag.setdefault(tag, []).append(fund)
+
+    def __len__(self):
+        return len(self.funds)
+
+    def get(self, key):
+        """
+        Look up a fund by port ID or name.
+
+        Args:
+            key (str): Port ID or fund name (case-insensitive)
+
+        Returns:
+            dict: The fund, or None if there is no such fund
+        """
+        key = str(key).strip()
+        return self.by_port_id.get(key) or self.by_name.get(key.lower())
+
+    def select(self, funds=None, groups=None, tags=None):
+        """
+        Pick funds by port ID or name, group and tag.
+
+        Args:
+            funds (list): Fund port IDs or names
+            groups (list): Group names
+            tags (list): Tags
+
+        Returns:
+            list: Funds matching any of the selectors, in config order (every
+                fund if no selectors are given)
+
+        Raises:
+            ValueError: If a fund, group or tag is not in the configuration
+        """
+        if not (funds or groups or tags):
+            return list(self.funds)
+
+        selected = set()
+        unknown = []
+        for key in funds or []:
+            fund = self.get(key)
+            if fund is None:
+                unknown.append(f"fund '{key}'")
+            else:
+                selected.add(fund['port_id'])
+        for index, kind, names in ((self.by_group, 'group', groups), (self.by_tag, 'tag', tags)):
+            for name in names or []:
+                if name not in index:
+                    unknown.append(f"{kind} '{name}'")
+                else:
+                    selected.update(fund['port_id'] for fund in index[name])
+        if unknown:
+            raise ValueError(f"No such {', '.join(unknown)} in the funds configuration")
+        return [fund for fund in self.funds if fund['port_id'] in selected]
+
+    def to_json(self):
+        """Return the compiled form as JSON-serializable data."""
+        return {'funds': self.funds, 'groups': self.groups, 'problems': self.problems, 'skipped': self.skipped}
+
+
+def _labels(value, where, errors):
+    """Validate a tags/groups value: a string or list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, (str, int)) for item in value):
+        errors.append(f"{where} must be a name or a list of names")
+        return []
+    labels = []
+    for item in value:
+        item = str(item).strip()
+        if item and item not in labels:
+            labels.append(item)
+    return labels
+
+
+def _schedule(value, where, errors, warnings):
+    """Validate a schedule and normalize it to {'times': str or None, 'days': str or None}."""
+    if value is None:
+        return None
+    if not isinstance(value, dict):
+        errors.append(f"{where} must be a mapping with 'times' and/or 'days'")
+        return None
+    for key in value:
+        if key not in SCHEDULE_KEYS:
+            warnings.append(f"{where} has unknown key '{key}' (ignored)")
+    schedule = {'times': None, 'days': None}
+    times = value.get('times')
+    if times is not None:
+        # YAML reads unquoted times like 18:30 as base-60 integers
+        items = times if isinstance(times, list) else [times]
+        times = ','.join(f"{item // 60:02d}:{item % 60:02d}" if isinstance(item, int) else str(item)
+                         for item in items)
+        try:
+            schedule['times'] = ','.join(t.strftime('%H:%M') for t in parse_times(str(times)))
+        except ValueError:
+            errors.append(f"{where} times must be HH:MM times, got {times!r}")
+    days = value.get('days')
+    if days is not None:
+        try:
+            if not parse_days(str(days)):
+                raise ValueError(days)
+            schedule['days'] = str(days).strip().lower()
+        except ValueError:
+            errors.append(f"{where} days must be 'daily', day names or ranges like 'mon-fri', got {days!r}")
+    if schedule['times'] is None and schedule['days'] is None:
+        return None
+    return schedule
+
+
+def _alerts(value, where, errors):
+    """Validate a fund's alert rules."""
+    if not isinstance(value, list):
+        errors.append(f"{where} alerts must be a list of rules")
+        return []
+    # Imported here so configs without alerts don't load NumPy
+    from analytics import required_metrics
+
+    try:
+        required_metrics(value)
+    except ValueError as e:
+        errors.append(f"{where}: {e}")
+    for rule in value:
+        for key in ('above', 'below'):
+            if isinstance(rule, dict) and key in rule and not isinstance(rule[key], (int, float)):
+                errors.append(f"{where} alert '{rule.get('metric')}' {key} must be a number, got {rule[key]!r}")
+    return value
+
+
+def _compile_fund(entry, name, where, groups, seen_port_ids, seen_names, problems):
+    """
+    Validate one fund entry and compile it.
+
+    Args:
+        entry (dict): The fund's entry in the file
+        name (str): The fund's name, stripped
+        where (str): Description of the entry, for messages
+        groups (dict): Compiled group settings by group name
+        seen_port_ids (dict): Port ID -> position of the funds kept so far
+        seen_names (dict): Lower-cased name -> position of the funds kept so far
+        problems (list): Problems found, appended to
+
+    Returns:
+        dict: The compiled fund, or None if the entry is invalid
+    """
+    errors = []
+    if not name:
+        errors.append(f"{where} has no name")
+
+    url = str(entry.get('url') or '').strip()
+    url_port_id = None
+    if url:
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            errors.append(f"{where} url must be an http(s) URL, got {url!r}")
+        url_port_id = parse_qs(parsed.query).get('portId', [None])[0]
+    port_id = entry.get('port_id')
+    port_id = str(port_id).strip() if port_id is not None else url_port_id
+    if not port_id:
+        errors.append(f"{where} needs a port_id (or a url with portId=...)")
+        problems.extend(f"{error} (skipped)" for error in errors)
+        return None
+    if not PORT_ID.match(port_id):
+        errors.append(f"{where} port_id must be numeric, got {port_id!r}")
+    elif url_port_id and url_port_id != port_id:
+        errors.append(f"{where} port_id {port_id} does not match portId={url_port_id} in its url")
+    if port_id in seen_port_ids:
+        errors.append(f"{where} has the same port_id {port_id} as fund {seen_port_ids[port_id]}")
+    if name and name.lower() in seen_names:
+        errors.append(f"{where} has the same name as fund {seen_names[name.lower()]}")
+
+    fund_groups = _labels(entry.get('groups'), f"{where} groups", errors)
+    for group in _labels(entry.get('group'), f"{where} group", errors):
+        if group not in fund_groups:
+            fund_groups.append(group)
+    tags = _labels(entry.get('tags'), f"{where} tags", errors)
+    schedule = _schedule(entry.get('schedule'), f"{where} schedule", errors, problems)
+    for group in fund_groups:
+        settings = groups.get(group)
+        if settings is None:
+            continue
+        tags.extend(tag for tag in settings['tags'] if tag not in tags)
+        if schedule is None:
+            schedule = settings['schedule']
+
+    fund = {'name': name, 'url': url or FUND_URL_TEMPLATE.format(port_id=port_id), 'port_id': port_id,
+            'tags': tags, 'groups': fund_groups, 'schedule': schedule}
+    if entry.get('alerts') is not None:
+        fund['alerts'] = _alerts(entry['alerts'], where, errors)
+    if errors:
+        problems.extend(f"{error} (skipped)" for error in errors)
+        return None
+    return fund
+
+
+def compile_config(config, source="funds_config.yml", strict=False):
+    """
+    Validate parsed YAML and compile it into a FundConfig.
+
+    Every entry is checked before anything is returned, so all problems in
+    the file are reported at once. Fund entries with invalid values are
+    left out, unknown keys and invalid group settings are ignored, and the
+    problems are kept on the result.
+
+    Args:
+        config (dict): Parsed configuration file
+        source (str): File name, for error messages
+        strict (bool): Raise ConfigError on any problem instead
+
+    Returns:
+        FundConfig: The compiled configuration
+
+    Raises:
+        ConfigError: If the file isn't a mapping with a 'funds' list, or
+            in strict mode if it has any problem
+    """
+    errors = []
+    if config is None:
+        config = {}
+    if not isinstance(config, dict):
+        raise ConfigError(source, ["the file must be a mapping with a 'funds' list"])
+
+    groups = {}
+    raw_groups = config.get('groups') or {}
+    if not isinstance(raw_groups, dict):
+        errors.append("'groups' must map group names to their settings (ignored)")
+        raw_groups = {}
+    for name, settings in raw_groups.items():
+        where = f"group '{name}'"
+        settings = settings or {}
+        if not isinstance(settings, dict):
+            errors.append(f"{where} must be a mapping (ignored)")
+            continue
+        for key in settings:
+            if key not in GROUP_KEYS:
+                errors.append(f"{where} has unknown key '{key}' (ignored)")
+        # Invalid group settings are left out; the group's funds are still kept
+        group_errors = []
+        groups[str(name)] = {'tags': _labels(settings.get('tags'), f"{where} tags", group_errors),
+                             'schedule': _schedule(settings.get('schedule'), f"{where} schedule",
+                                                   group_errors, errors)}
+        errors.extend(f"{error} (ignored)" for error in group_errors)
+
+    raw_funds = config.get('funds') or []
+    if not isinstance(raw_funds, list):
+        raise ConfigError(source, ["'funds' must be a list"])
+
+    funds = []
+    skipped = 0
+    seen_port_ids = {}
+    seen_names = {}
+    for position, entry in enumerate(raw_funds, 1):
+        where = f"fund {position}"
+        if not isinstance(entry, dict):
+            errors.append(f"{where} must be a mapping with 'name' and 'port_id' or 'url' (skipped)")
+            skipped += 1
+            continue
+        name = str(entry.get('name') or '').strip()
+        if name:
+            where = f"fund {position} ({name})"
+        for key in entry:
+            if key not in FUND_KEYS:
+                errors.append(f"{where} has unknown key '{key}' (ignored)")
+
+        fund = _compile_fund(entry, name, where, groups, seen_port_ids, seen_names, errors)
+        if fund is None:
+            skipped += 1
+            continue
+        seen_port_ids[fund['port_id']] = position
+        seen_names[name.lower()] = position
+        funds.append(fund)
+
+    if errors and strict:
+        raise ConfigError(source, errors)
+    return FundConfig(funds, groups, problems=errors, skipped=skipped)
+
+
+def _read_cache(cache_path, source, stamp):
+    """Return the cached FundConfig for this version of the file, or None."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            cached = json.load(file)
+        if [cached.get('version'), cached.get('source'), cached.get('stamp')] != [CACHE_VERSION, source, list(stamp)]:
+            return None
+        return FundConfig(cached['funds'], cached['groups'], cached['problems'], cached['skipped'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cache(cache_path, source, stamp, compiled):
+    """Save a compiled configuration, atomically; failures only warn."""
+    temp_path = f"{cache_path}.tmp{os.getpid()}"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(dict(compiled.to_json(), version=CACHE_VERSION, source=source, stamp=list(stamp)), file)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️  Could not write fund config cache '{cache_path}': {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def load_config(config_path="funds_config.yml", cache_path=None, strict=False):
+    """
+    Load the compiled funds configuration, parsing the file only if it changed.
+
+    Problems in the file are printed as a warning when it is first loaded,
+    and invalid fund entries are left out (see compile_config()).
+
+    Args:
+        config_path (str): Path to the configuration file
+        cache_path (str): Compiled config cache (defaults to FUND_CONFIG_CACHE,
+            or .fund_config_cache.json; empty to disable)
+        strict (bool): Raise ConfigError if the file has any problem
+
+    Returns:
+        FundConfig: The compiled configuration
+
+    Raises:
+        ConfigError: If the file is missing, isn't valid YAML or isn't a
+            mapping with a 'funds' list, or in strict mode if it has any problem
+    """
+    source = os.path.abspath(config_path)
+    try:
+        stat = os.stat(source)
+    except OSError:
+        raise ConfigError(config_path, ["file not found"])
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    memo = _compiled.get(source)
+    if memo is not None and memo[0] == stamp:
+        if strict and memo[1].problems:
+            raise ConfigError(config_path, memo[1].problems)
+        return memo[1]
+
+    if cache_path is None:
+        cache_path = os.getenv('FUND_CONFIG_CACHE', '.fund_config_cache.json')
+    compiled = _read_cache(cache_path, source, stamp) if cache_path else None
+    if compiled is None:
+        import yaml
+
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        try:
+            with open(source, 'r', encoding='utf-8') as file:
+                config = yaml.load(file, Loader=loader)
+        except OSError as e:
+            raise ConfigError(config_path, [f"could not be read: {e}"])
+        except yaml.YAMLError as e:
+            raise ConfigError(config_path, [f"is not valid YAML: {e}"])
+        compiled = compile_config(config, config_path)
+        if cache_path:
+            _write_cache(cache_path, source, stamp, compiled)
+
+    _compiled[source] = (stamp, compiled)
+    if compiled.problems:
+        if strict:
+            raise ConfigError(config_path, compiled.problems)
+        skipped = f", skipping {compiled.skipped} invalid fund(s)" if compiled.skipped else ""
+        print(f"⚠️  Loading {len(compiled)} fund(s){skipped}. {describe_problems(config_path, compiled.problems)}")
+    return compiled
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Per-fund health tracking with a circuit breaker.
+
+Consecutive failures are counted for each fund between runs. A failing
+fund gets a shorter page time budget and no retries, so it can't slow the
+run down, and after FUND_CIRCUIT_THRESHOLD failures in a row it is skipped
+entirely for a cool-down period that doubles with every further failure.
+Error notifications are deduplicated: the same error for the same fund is
+only sent again after FUND_ERROR_RENOTIFY_HOURS, or when the fund starts
+being skipped.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# Scrape errors worth retrying: browser crashes and timeouts, not bad pages
+TRANSIENT_ERRORS = ('browser', 'timeout')
+
+
+class FundHealthTracker:
+    """
+    JSON-file record of each fund's consecutive failures and circuit state.
+
+    Safe to share between scraper threads. The file is rewritten atomically
+    whenever a fund's health changes. Entries are only read and changed
+    through _entry() and _editing(), so a subclass can keep them elsewhere.
+    """
+
+    def __init__(self, path=None):
+        """
+        Load fund health from disk.
+
+        Args:
+            path (str): Health file (defaults to FUND_HEALTH_FILE, or fund_health.json)
+        """
+        self.path = path or os.getenv('FUND_HEALTH_FILE', 'fund_health.json')
+        self._configure()
+        self._lock = threading.Lock()
+        self._state = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                self._state = json.load(file)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable fund health file '{self.path}': {e}")
+
+    def _configure(self):
+        """Read the retry and circuit breaker settings."""
+        self.threshold = int(os.getenv('FUND_CIRCUIT_THRESHOLD', '3'))
+        self.cooldown = float(os.getenv('FUND_CIRCUIT_COOLDOWN', '21600'))
+        self.max_cooldown = float(os.getenv('FUND_CIRCUIT_MAX_COOLDOWN', '604800'))
+        self.retries = int(os.getenv('FUND_RETRIES', '1'))
+        self.retry_backoff = float(os.getenv('FUND_RETRY_BACKOFF', '2'))
+        self.min_timeout = float(os.getenv('FUND_MIN_TIMEOUT', '10'))
+        self.renotify_after = float(os.getenv('FUND_ERROR_RENOTIFY_HOURS', '24')) * 3600
+
+    def _entry(self, fund_key):
+        """Return a copy of a fund's health entry (empty for a healthy fund)."""
+        with self._lock:
+            return dict(self._state.get(fund_key, {}))
+
+    @contextmanager
+    def _editing(self, fund_key):
+        """
+        Change a fund's health entry inside a with block.
+
+        The entry is saved if it changed, and removed if it was emptied.
+
+        Yields:
+            dict: The fund's entry (empty for a healthy fund)
+        """
+        with self._lock:
+            before = self._state.get(fund_key, {})
+            entry = dict(before)
+            yield entry
+            if entry != before:
+                if entry:
+                    self._state[fund_key] = entry
+                else:
+                    self._state.pop(fund_key, None)
+                self._save()
+
+    def _save(self):
+        """Write the health file; the caller holds the lock."""
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(self._state, file, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Could not save fund health file '{self.path}': {e}")
+
+    def failures(self, fund_key):
+        """Return a fund's number of consecutive failures."""
+        return self._entry(fund_key).get('failures', 0)
+
+    def skip_until(self, fund_key, now=None):
+        """
+        Check whether a fund's circuit is open.
+
+        Args:
+            fund_key (str): Port ID or URL identifying the fund
+            now (float): Current Unix time (optional)
+
+        Returns:
+            float: Unix time the fund will next be tried, or None if it should be scraped now
+        """
+        now = time.time() if now is None else now
+        open_until = self._entry(fund_key).get('open_until')
+        return open_until if open_until and open_until > now else None
+
+    def retries_for(self, fund_key):
+        """Return how many times a transient scrape error may be retried (none for failing funds)."""
+        return self.retries if self.failures(fund_key) == 0 else 0
+
+    def timeout_for(self, fund_key):
+        """
+        Work out a fund's page time budget.
+
+        Returns:
+            float: A budget halved for every consecutive failure (but at least
+                FUND_MIN_TIMEOUT), or None to use the default for healthy funds
+        """
+        failures = self.failures(fund_key)
+        if failures == 0:
+            return None
+        default = float(os.getenv('SCRAPER_FUND_TIMEOUT', '30'))
+        return max(self.min_timeout, default / (2 ** failures))
+
+    def retry_delay(self, attempt):
+        """Return the backoff before retry number attempt (0-based)."""
+        return self.retry_backoff * (2 ** attempt)
+
+    def record_success(self, fund_key):
+        """
+        Reset a fund's failures after a successful scrape.
+
+        Returns:
+            bool: True if the fund had been failing
+        """
+        with self._editing(fund_key) as entry:
+            recovered = bool(entry)
+            entry.clear()
+        if recovered:
+            print("💚 Fund recovered after previous failures")
+        return recovered
+
+    def record_failure(self, fund_key, error_message, now=None):
+        """
+        Count a failure, opening the circuit once the threshold is reached.
+
+        Args:
+            fund_key (str): Port ID or URL identifying the fund
+            error_message (str): What went wrong
+            now (float): Current Unix time (optional)
+
+        Returns:
+            bool: True if an error notification should be sent: the error is
+                new for this fund, was last sent more than
+                FUND_ERROR_RENOTIFY_HOURS ago, or the circuit has just opened
+        """
+        now = time.time() if now is None else now
+        with self._editing(fund_key) as entry:
+            entry['failures'] = entry.get('failures', 0) + 1
+            entry['last_error'] = error_message
+            entry['last_failure'] = now
+
+            circuit_opened = entry['failures'] == self.threshold
+            if entry['failures'] >= self.threshold:
+                cooldown = min(self.max_cooldown, self.cooldown * (2 ** (entry['failures'] - self.threshold)))
+                entry['open_until'] = now + cooldown
+                print(f"⏸️  {entry['failures']} failures in a row, skipping this fund until "
+                      f"{datetime.fromtimestamp(entry['open_until']).strftime('%a %d %b %H:%M')}")
+
+            notify = (circuit_opened
+                      or entry.get('notified_error') != error_message
+                      or now - entry.get('notified_at', 0) >= self.renotify_after)
+            if notify:
+                entry['notified_error'] = error_message
+                entry['notified_at'] = now
+        return notify
+
+
+def health_enabled():
+    """Return False if fund health tracking is turned off (FUND_HEALTH_FILE set to an empty value)."""
+    return os.getenv('FUND_HEALTH_FILE', 'fund_health.json') != ''
+
+
+def open_health_tracker():
+    """
+    Open the fund health tracker configured by FUND_HEALTH_FILE.
+
+    Returns:
+        FundHealthTracker: The tracker, or None if FUND_HEALTH_FILE is set to an empty value
+    """
+    if not health_enabled():
+        return None
+    return FundHealthTracker()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Compact typed rows for fund price and distribution tables.
+
+Dates and amounts are parsed once, when a table is extracted from the page
+or fetched from the data endpoint, and kept as datetime.date and float
+fields in __slots__ records. Formatters, change detection and the price
+history store read the fields directly instead of re-parsing strings.
+
+Rows still behave like a list of cells for display code: indexing, len()
+and iteration give the display text of each field, in the order of the
+row type's HEADERS, and cells(headers) lays the fields out in a table's
+own columns. Display text is formatted from the fields when it is asked
+for; rows read from a page remember how many decimal places its prices
+had, so their text matches the page.
+"""
+
+from datetime import datetime
+
+
+DATE_FORMATS = ('%d %b %Y', '%d %B %Y', '%Y-%m-%d', '%d/%m/%Y')
+
+
+def parse_day(text):
+    """
+    Parse a date as shown on the fund page.
+
+    Args:
+        text (str): Date such as '17 Oct 2025' or '2025-10-17'
+
+    Returns:
+        datetime.date: Parsed date, or None if it cannot be parsed
+    """
+    text = (text or '').strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    # Data endpoint timestamps, e.g. '2025-10-17T00:00:00'
+    try:
+        return datetime.strptime(text[:10], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def parse_number(text):
+    """
+    Parse a price or amount such as '$1,234.5678'.
+
+    Args:
+        text (str): Value as shown on the fund page
+
+    Returns:
+        float: Parsed value, or None if it cannot be parsed
+    """
+    if text is None:
+        return None
+    try:
+        return float(str(text).replace('$', '').replace(',', '').strip())
+    except ValueError:
+        return None
+
+
+def format_day(day):
+    """Format a date as shown on the fund page (e.g. '17 Oct 2025')."""
+    return day.strftime('%d %b %Y') if day is not None else ''
+
+
+def _decimal_text(value, places=None):
+    """Format a number to places decimal places, or to 4 or more if the number needs them."""
+    if places is not None:
+        return f"{value:,.{places}f}"
+    text = f"{value:,.4f}"
+    if round(value, 4) != value:
+        text = f"{value:,}"
+    return text
+
+
+def format_price(value, places=None):
+    """Format a price as shown on the fund page (e.g. '$1.2345'), keeping any extra precision."""
+    return f"${_decimal_text(value, places)}" if value is not None else ''
+
+
+def format_amount(value, places=None):
+    """Format an amount without a currency sign (e.g. cents per unit)."""
+    return _decimal_text(value, places) if value is not None else ''
+
+
+def decimal_places(text):
+    """
+    Count the decimal places of a number as shown on the page.
+
+    Args:
+        text (str): Value such as '$1.23456'
+
+    Returns:
+        int: Digits after the decimal point, or None if text has none
+    """
+    if not text or '.' not in text:
+        return None
+    digits = text.rsplit('.', 1)[1].strip()
+    return len(digits) if digits.isdigit() else None
+
+
+def column_index(headers, *names):
+    """Return the index of the first header matching any of names, or None."""
+    lowered = [header.lower() for header in headers]
+    for name in names:
+        for i, header in enumerate(lowered):
+            if header == name or header.startswith(name):
+                return i
+    return None
+
+
+def _cell(cells, index):
+    """Return cells[index], or None if the column is missing."""
+    if index is None or index >= len(cells):
+        return None
+    return cells[index]
+
+
+class _Row:
+    """
+    Shared sequence behaviour for typed rows.
+
+    Subclasses define FIELDS, HEADERS (one per field), column_map() and
+    field_text(), which formats a single field.
+    """
+
+    __slots__ = ()
+
+    def cells(self, headers=None):
+        """
+        Return the display text of each column.
+
+        Args:
+            headers (list): A table's headers to lay the fields out in
+                (defaults to HEADERS); columns no field maps to are empty
+
+        Returns:
+            list: Display text, with 'N/A' for missing values
+        """
+        if headers is None:
+            return [self.field_text(name) or 'N/A' for name in self.FIELDS]
+        cells = [''] * len(headers)
+        for name, index in zip(self.FIELDS, self.column_map(headers)):
+            if index is not None and index < len(headers):
+                cells[index] = self.field_text(name) or 'N/A'
+        return cells
+
+    def display_columns(self, headers):
+        """
+        Pair a table's column headers with this row's display text.
+
+        Columns no field maps to, and fields with no value, are left out.
+
+        Args:
+            headers (list): The table's headers
+
+        Returns:
+            list: (header, text) pairs, in column order
+        """
+        columns = sorted((index, name) for name, index in zip(self.FIELDS, self.column_map(headers))
+                         if index is not None and index < len(headers) and getattr(self, name) is not None)
+        return [(headers[index], self.field_text(name)) for index, name in columns]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.field_text(name) or 'N/A' for name in self.FIELDS[index]]
+        return self.field_text(self.FIELDS[index]) or 'N/A'
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __iter__(self):
+        return iter(self.cells())
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class PriceRow(_Row):
+    """One day of fund prices."""
+
+    FIELDS = ('date', 'buy', 'sell', 'nav')
+    __slots__ = FIELDS + ('places',)
+    HEADERS = ['Date', 'Buy', 'Sell', 'NAV']
+
+    def __init__(self, date, buy=None, sell=None, nav=None, places=None):
+        """
+        Args:
+            date (datetime.date): Price date
+            buy (float): Buy (entry) price
+            sell (float): Sell (exit) price
+            nav (float): Net asset value per unit
+            places (int): Decimal places the page showed prices to (None
+                for at least 4)
+        """
+        self.date = date
+        self.buy = buy
+        self.sell = sell
+        self.nav = nav
+        self.places = places
+
+    @property
+    def price(self):
+        """float: The price used to measure changes (the buy price)."""
+        return self.buy
+
+    def field_text(self, name):
+        """Return the display text of one field ('' if it has no value)."""
+        if name == 'date':
+            return format_day(self.date)
+        return format_price(getattr(self, name), self.places)
+
+    def record(self):
+        """Return the row as a (date, buy, sell, nav) tuple with an ISO date."""
+        return (self.date.isoformat(), self.buy, self.sell, self.nav)
+
+    @classmethod
+    def column_map(cls, headers):
+        """Find this row type's columns in a table's headers."""
+        return (column_index(headers, 'date'), column_index(headers, 'buy'),
+                column_index(headers, 'sell'), column_index(headers, 'nav'))
+
+    @classmethod
+    def from_cells(cls, cells, columns):
+        """
+        Parse a row of page cells.
+
+        Args:
+            cells (list): Cell text
+            columns (tuple): Column indexes from column_map()
+
+        Returns:
+            PriceRow: Parsed row, or None if the date cannot be read
+        """
+        date = parse_day(_cell(cells, columns[0]))
+        if date is None:
+            return None
+        buy, sell, nav = (_cell(cells, index) for index in columns[1:])
+        return cls(date, parse_number(buy), parse_number(sell), parse_number(nav),
+                   places=decimal_places(buy or sell or nav))
+
+
+class DistributionRow(_Row):
+    """One fund distribution."""
+
+    FIELDS = ('date', 'cents_per_unit', 'reinvestment_date', 'reinvestment_price')
+    __slots__ = FIELDS + ('places',)
+    HEADERS = ['Distribution date', 'Cents per unit', 'Reinvestment date', 'Reinvestment price']
+
+    def __init__(self, date, cents_per_unit=None, reinvestment_date=None, reinvestment_price=None, places=None):
+        """
+        Args:
+            date (datetime.date): Distribution date
+            cents_per_unit (float): Distribution amount in cents per unit
+            reinvestment_date (datetime.date): Reinvestment date
+            reinvestment_price (float): Reinvestment price per unit
+            places (int): Decimal places the page showed the reinvestment
+                price to (None for at least 4)
+        """
+        self.date = date
+        self.cents_per_unit = cents_per_unit
+        self.reinvestment_date = reinvestment_date
+        self.reinvestment_price = reinvestment_price
+        self.places = places
+
+    @property
+    def price(self):
+        """float: The price used to measure changes (the reinvestment price)."""
+        return self.reinvestment_price
+
+    def field_text(self, name):
+        """Return the display text of one field ('' if it has no value)."""
+        if name in ('date', 'reinvestment_date'):
+            return format_day(getattr(self, name))
+        if name == 'cents_per_unit':
+            return format_amount(self.cents_per_unit)
+        return format_price(self.reinvestment_price, self.places)
+
+    def record(self):
+        """Return the row as a (date, cents per unit, reinvestment date, price) tuple with ISO dates."""
+        reinvestment_date = self.reinvestment_date.isoformat() if self.reinvestment_date else None
+        return (self.date.isoformat(), self.cents_per_unit, reinvestment_date, self.reinvestment_price)
+
+    @classmethod
+    def column_map(cls, headers):
+        """Find this row type's columns in a table's headers."""
+        date_col = column_index(headers, 'distribution date', 'ex')
+        return (date_col if date_col is not None else 0,
+                column_index(headers, 'cents per unit', 'cpu'),
+                column_index(headers, 'reinvestment date', 'reinvest date', 'payment date'),
+                column_index(headers, 'reinvestment price', 'reinvest price'))
+
+    @classmethod
+    def from_cells(cls, cells, columns):
+        """
+        Parse a row of page cells.
+
+        Args:
+            cells (list): Cell text
+            columns (tuple): Column indexes from column_map()
+
+        Returns:
+            DistributionRow: Parsed row, or None if the date cannot be read
+        """
+        date = parse_day(_cell(cells, columns[0]))
+        if date is None:
+            return None
+        reinvestment_price = _cell(cells, columns[3])
+        return cls(date, parse_number(_cell(cells, columns[1])), parse_day(_cell(cells, columns[2])),
+                   parse_number(reinvestment_price), places=decimal_places(reinvestment_price))
+
+
+# Typed row class for each table kind; other tables keep lists of cell text
+ROW_TYPES = {'prices': PriceRow, 'distributions': DistributionRow}
+
+
+def typed_rows(kind, headers, rows):
+    """
+    Parse rows of cell text into typed rows.
+
+    Rows that are already typed are kept as they are, rows whose date
+    cannot be read are skipped, and tables of other kinds are returned
+    unchanged.
+
+    Args:
+        kind (str): Table kind ('prices', 'distributions' or 'other')
+        headers (list): Table headers
+        rows (list): Rows as lists of cell text
+
+    Returns:
+        list: Typed rows (or the original rows for other kinds)
+    """
+    row_type = ROW_TYPES.get(kind)
+    if row_type is None:
+        return rows
+    columns = row_type.column_map(headers)
+    parsed = []
+    for cells in rows:
+        row = cells if isinstance(cells, row_type) else row_type.from_cells(cells, columns)
+        if row is not None:
+            parsed.append(row)
+    return parsed
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Business-day calendar helpers shared by the scheduler and response cache.
+
+Schedules are written as HH:MM times on a set of weekdays in a given time
+zone, e.g. '06:00' on 'tue-sat' in Australia/Sydney.
+
+When Vanguard is expected to have published a business day's prices is
+set once, by PRICE_PUBLISH_TIMES and PRICE_PUBLISH_DAYS (default: by 06:00
+on the following morning, Tuesday to Saturday). The scheduler runs at
+those times by default, and the response cache uses them to tell whether
+a cached response holds the latest prices.
+"""
+
+import os
+from datetime import datetime, timedelta, time as dt_time
+
+
+DAY_NAMES = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+# Days prices are published for, and when the market closes on them
+BUSINESS_DAYS = frozenset(range(5))
+MARKET_CLOSE = dt_time(16, 0)
+
+
+def parse_times(text):
+    """
+    Parse comma-separated HH:MM times.
+
+    Args:
+        text (str): Times such as '06:00,18:30'
+
+    Returns:
+        list: Sorted datetime.time values
+
+    Raises:
+        ValueError: If a time is not in HH:MM format
+    """
+    times = []
+    for part in text.split(','):
+        part = part.strip()
+        if part:
+            hour, minute = part.split(':')
+            times.append(dt_time(int(hour), int(minute)))
+    if not times:
+        raise ValueError("SCHEDULE_TIMES must contain at least one HH:MM time")
+    return sorted(times)
+
+
+def parse_days(text):
+    """
+    Parse the days a schedule runs on.
+
+    Args:
+        text (str): 'daily', day names ('mon,wed,fri') or ranges ('mon-fri', 'tue-sat')
+
+    Returns:
+        set: Weekday numbers (Monday is 0)
+
+    Raises:
+        ValueError: If a day name is not recognised
+    """
+    text = text.strip().lower()
+    if text in ('', '*', 'daily'):
+        return set(range(7))
+
+    days = set()
+    for part in text.split(','):
+        part = part.strip()
+        if '-' in part:
+            start, end = (DAY_NAMES.index(name.strip()[:3]) for name in part.split('-'))
+            day = start
+            days.add(day)
+            while day != end:
+                day = (day + 1) % 7
+                days.add(day)
+        elif part:
+            days.add(DAY_NAMES.index(part[:3]))
+    return days
+
+
+def next_run_time(now, times, days):
+    """
+    Find the next scheduled run after now.
+
+    Args:
+        now (datetime): Current time, aware, in the schedule's time zone
+        times (list): Run times from parse_times()
+        days (set): Weekday numbers from parse_days()
+
+    Returns:
+        datetime: The next run time, in the same time zone as now
+    """
+    for offset in range(8):
+        day = (now + timedelta(days=offset)).date()
+        if day.weekday() not in days:
+            continue
+        for run_time in times:
+            candidate = datetime.combine(day, run_time, tzinfo=now.tzinfo)
+            if candidate > now:
+                return candidate
+    raise ValueError("Schedule has no run days")
+
+
+def publish_schedule():
+    """
+    Read when new prices are expected to be published.
+
+    Returns:
+        tuple: (times, days) from PRICE_PUBLISH_TIMES and PRICE_PUBLISH_DAYS,
+            as parse_times() and parse_days() return them
+
+    Raises:
+        ValueError: If either setting cannot be parsed
+    """
+    return (parse_times(os.getenv('PRICE_PUBLISH_TIMES', '06:00')),
+            parse_days(os.getenv('PRICE_PUBLISH_DAYS', 'tue-sat')))
+
+
+def expected_price_date(now, times, days):
+    """
+    Find the latest business day whose prices should have been published by now.
+
+    A business day's prices are published at the first publication time
+    after that day's market close. Public holidays are not known, so on
+    the day after one this names the holiday.
+
+    Args:
+        now (datetime): Current time, aware, in the schedule's time zone
+        times (list): Publication times from parse_times()
+        days (set): Publication weekdays from parse_days()
+
+    Returns:
+        datetime.date: The business day, or None if none was published in the last fortnight
+    """
+    for offset in range(15):
+        day = now.date() - timedelta(days=offset)
+        if day.weekday() not in BUSINESS_DAYS:
+            continue
+        close = datetime.combine(day, MARKET_CLOSE, tzinfo=now.tzinfo)
+        if next_run_time(close, times, days) <= now:
+            return day
+    return None
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and counter metrics for the Vanguard scraper.
+
+Stages (driver startup, page load, readiness wait, parse, extraction,
+formatting, notify) and counters (tables scanned, rows parsed, page source
+bytes) are recorded in the shared METRICS registry, labelled with the fund
+being processed on the current thread. At the end of a run they can be
+exported as JSON lines or as a Prometheus text file.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Thread-safe registry of stage timings and counters.
+
+    The fund label is tracked per thread, so code deep inside the scraper
+    can record metrics without being passed the fund name.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Discard every recorded timing and counter."""
+        with self._lock:
+            self.timings = []
+            self.counters = {}
+
+    @property
+    def current_fund(self):
+        """str: Fund label for metrics recorded on this thread (or None)."""
+        return getattr(self._local, 'fund', None)
+
+    @contextmanager
+    def fund(self, fund_name):
+        """
+        Label metrics recorded on this thread with a fund name.
+
+        Args:
+            fund_name (str): The fund being processed
+        """
+        previous = self.current_fund
+        self._local.fund = fund_name
+        try:
+            yield
+        finally:
+            self._local.fund = previous
+
+    @contextmanager
+    def stage(self, name, fund=None):
+        """
+        Time a block of code as a named stage.
+
+        Args:
+            name (str): Stage name (e.g. 'parse')
+            fund (str): Fund label (defaults to the current thread's fund)
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, fund=fund)
+
+    def record(self, name, seconds, fund=None):
+        """
+        Record a stage duration measured elsewhere.
+
+        Args:
+            name (str): Stage name
+            seconds (float): Duration in seconds
+            fund (str): Fund label (defaults to the current thread's fund)
+        """
+        fund = fund if fund is not None else self.current_fund
+        with self._lock:
+            self.timings.append((name, fund, seconds, time.time()))
+
+    def increment(self, name, value=1, fund=None):
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Counter name (e.g. 'rows_parsed')
+            value (float): Amount to add
+            fund (str): Fund label (defaults to the current thread's fund)
+        """
+        key = (name, fund if fund is not None else self.current_fund)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def stage_summary(self):
+        """
+        Summarize timings by stage across all funds.
+
+        Returns:
+            dict: stage -> {'count', 'total', 'max'} in seconds
+        """
+        summary = {}
+        with self._lock:
+            for name, _, seconds, _ in self.timings:
+                entry = summary.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+                entry['count'] += 1
+                entry['total'] += seconds
+                entry['max'] = max(entry['max'], seconds)
+        return summary
+
+    def to_json_lines(self):
+        """
+        Render every timing and counter as JSON lines.
+
+        Returns:
+            str: One JSON object per line
+        """
+        lines = []
+        with self._lock:
+            for name, fund, seconds, timestamp in self.timings:
+                lines.append(json.dumps({'type': 'timing', 'stage': name, 'fund': fund,
+                                         'seconds': round(seconds, 6), 'timestamp': timestamp}))
+            for (name, fund), value in sorted(self.counters.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                lines.append(json.dumps({'type': 'counter', 'name': name, 'fund': fund, 'value': value}))
+        return '\n'.join(lines) + '\n'
+
+    def to_prometheus(self, prefix='stock_notifier'):
+        """
+        Render metrics in the Prometheus text exposition format.
+
+        Stage timings become <prefix>_stage_seconds_sum/_count per stage and
+        fund; counters become <prefix>_<name>_total.
+
+        Returns:
+            str: Prometheus text file contents
+        """
+        def labels(**values):
+            parts = []
+            for key, value in values.items():
+                if value is not None:
+                    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                    parts.append(f'{key}="{escaped}"')
+            return '{' + ','.join(parts) + '}' if parts else ''
+
+        sums = {}
+        with self._lock:
+            for name, fund, seconds, _ in self.timings:
+                entry = sums.setdefault((name, fund), [0.0, 0])
+                entry[0] += seconds
+                entry[1] += 1
+            counters = dict(self.counters)
+
+        lines = [f'# HELP {prefix}_stage_seconds Time spent in each scraper stage.',
+                 f'# TYPE {prefix}_stage_seconds summary']
+        for (name, fund), (total, count) in sorted(sums.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            lines.append(f'{prefix}_stage_seconds_sum{labels(stage=name, fund=fund)} {total:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{labels(stage=name, fund=fund)} {count}')
+
+        for counter in sorted({name for name, _ in counters}):
+            lines.append(f'# TYPE {prefix}_{counter}_total counter')
+            for (name, fund), value in sorted(counters.items(), key=lambda item: str(item[0][1])):
+                if name == counter:
+                    lines.append(f'{prefix}_{counter}_total{labels(fund=fund)} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path, output_format=None):
+        """
+        Write metrics to a file.
+
+        Args:
+            path (str): Output file
+            output_format (str): 'jsonl' or 'prometheus' (defaults to
+                METRICS_FORMAT, or guessed from the file extension)
+        """
+        output_format = output_format or os.getenv('METRICS_FORMAT')
+        if not output_format:
+            output_format = 'prometheus' if path.endswith(('.prom', '.txt')) else 'jsonl'
+        content = self.to_prometheus() if output_format == 'prometheus' else self.to_json_lines()
+
+        # Write atomically so a Prometheus textfile collector never sees a partial file
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+
+
+# Shared registry used by the scraper modules
+METRICS = Metrics()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Additional notification backends: Slack webhook, generic webhook and email.
+
+Each backend has the same interface as NtfyNotifier (send_price_update,
+send_error_notification, flush, close) and its own connection pool or
+SMTP connection, request timeout, retries and rate limit, configured with
+environment variables named after the backend (e.g. SLACK_WEBHOOK_TIMEOUT).
+Backends send synchronously; MultiNotifier in notifier.py gives each one
+its own delivery thread.
+"""
+
+import os
+import threading
+import time
+from email.message import EmailMessage
+import requests
+from requests.adapters import HTTPAdapter
+from metrics import METRICS
+from rate_limiter import HostRateLimiter
+from traffic_recorder import record_session
+
+
+class WebhookBackend:
+    """
+    Posts notifications as JSON to a generic webhook.
+
+    The body is {"type", "title", "message", "fund"}, where type is
+    'price_update' or 'error'.
+    """
+
+    name = 'webhook'
+    env_prefix = 'WEBHOOK'
+
+    def __init__(self, url=None, timeout=None, min_interval=None):
+        """
+        Initialize the backend from environment variables.
+
+        Args:
+            url (str): Webhook URL (defaults to <PREFIX>_URL)
+            timeout (float): Request timeout in seconds (defaults to <PREFIX>_TIMEOUT, or 10)
+            min_interval (float): Minimum seconds between requests (defaults to
+                <PREFIX>_MIN_INTERVAL, or 0)
+
+        Raises:
+            ValueError: If no webhook URL is configured
+        """
+        prefix = self.env_prefix
+        self.url = url or os.getenv(f'{prefix}_URL')
+        if not self.url:
+            raise ValueError(f"{prefix}_URL is not set")
+        self.timeout = timeout if timeout is not None else float(os.getenv(f'{prefix}_TIMEOUT', '10'))
+        if min_interval is None:
+            min_interval = float(os.getenv(f'{prefix}_MIN_INTERVAL', '0'))
+        self.limiter = HostRateLimiter(min_interval)
+        self.max_retries = int(os.getenv(f'{prefix}_RETRIES', '2'))
+        self.retry_backoff = float(os.getenv(f'{prefix}_RETRY_BACKOFF', '1'))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        record_session(self.session)
+
+    def payload(self, kind, title, message, fund_name, slack_message=None):
+        """
+        Build the JSON body for a notification.
+
+        Args:
+            kind (str): 'price_update' or 'error'
+            title (str): Notification title
+            message (str): Plain-text message
+            fund_name (str): Fund the notification is about
+            slack_message (str): Slack-formatted message, if one was built
+
+        Returns:
+            dict: JSON body
+        """
+        return {'type': kind, 'title': title, 'message': message, 'fund': fund_name}
+
+    def _deliver(self, kind, title, message, fund_name, slack_message=None):
+        """POST a notification, retrying connection errors and 429/5xx responses."""
+        body = self.payload(kind, title, message, fund_name, slack_message)
+        attempt = 0
+        with METRICS.stage(f'notify_{self.name}', fund=fund_name):
+            while True:
+                self.limiter.wait(self.url)
+                try:
+                    response = self.session.post(self.url, json=body, timeout=self.timeout)
+                    if response.status_code < 300:
+                        print(f"✅ Notification sent successfully via {self.name}")
+                        return True
+                    if response.status_code != 429 and response.status_code < 500:
+                        print(f"❌ Failed to send {self.name} notification. Status code: {response.status_code}")
+                        return False
+                    reason = f"status code {response.status_code}"
+                except requests.exceptions.RequestException as e:
+                    reason = str(e)
+
+                if attempt >= self.max_retries:
+                    print(f"❌ Error sending {self.name} notification: {reason}")
+                    return False
+                delay = self.retry_backoff * (2 ** attempt)
+                attempt += 1
+                print(f"⚠️  {self.name} request failed ({reason}), retrying in {delay:.1f}s "
+                      f"({attempt}/{self.max_retries})")
+                time.sleep(delay)
+
+    def send_price_update(self, message, fund_name="Vanguard Fund", title=None, on_sent=None, slack_message=None):
+        """
+        Send a price update.
+
+        Args:
+            message (str): The message content to send
+            fund_name (str): The name of the fund for the notification title
+            title (str): The notification title (optional, defaults to fund-specific title)
+            on_sent (callable): Called with True/False once delivery has been attempted (optional)
+            slack_message (str): Slack-formatted version of the message (optional)
+
+        Returns:
+            bool: Whether the notification was sent
+        """
+        result = self._deliver('price_update', title or f"{fund_name} Price Update", message, fund_name,
+                               slack_message)
+        if on_sent is not None:
+            on_sent(result)
+        return result
+
+    def send_error_notification(self, error_message, fund_name="Vanguard Fund", on_sent=None):
+        """
+        Send an error notification.
+
+        Args:
+            error_message (str): The error message to send
+            fund_name (str): The name of the fund for the notification title
+            on_sent (callable): Called with True/False once delivery has been attempted (optional)
+
+        Returns:
+            bool: Whether the notification was sent
+        """
+        result = self._deliver('error', f"{fund_name} Scraper Error",
+                               f"Error in {fund_name} scraper: {error_message}", fund_name)
+        if on_sent is not None:
+            on_sent(result)
+        return result
+
+    def flush(self):
+        """Nothing is buffered; kept for interface compatibility with NtfyNotifier."""
+        return True
+
+    def close(self):
+        """Close the pooled HTTP session."""
+        self.session.close()
+
+
+class SlackWebhookBackend(WebhookBackend):
+    """Posts notifications to a Slack incoming webhook, using the Slack-formatted message when available."""
+
+    name = 'slack'
+    env_prefix = 'SLACK_WEBHOOK'
+
+    def payload(self, kind, title, message, fund_name, slack_message=None):
+        """Build a Slack message body ({"text": ...})."""
+        if kind == 'error':
+            return {'text': f"🚨 *{title}*\n{message}"}
+        return {'text': slack_message or f"*{title}*\n{message}"}
+
+
+class EmailBackend:
+    """
+    Sends notifications as plain-text email over SMTP.
+
+    One SMTP connection is kept open between messages and reopened if the
+    server drops it.
+    """
+
+    name = 'email'
+
+    def __init__(self, host=None, port=None, sender=None, recipients=None, timeout=None, min_interval=None):
+        """
+        Initialize the backend from environment variables.
+
+        Args:
+            host (str): SMTP server (defaults to SMTP_HOST, or localhost)
+            port (int): SMTP port (defaults to SMTP_PORT, or 25)
+            sender (str): From address (defaults to SMTP_FROM)
+            recipients (list): To addresses (defaults to comma-separated SMTP_TO)
+            timeout (float): Connection timeout in seconds (defaults to SMTP_TIMEOUT, or 10)
+            min_interval (float): Minimum seconds between messages (defaults to SMTP_MIN_INTERVAL, or 0)
+
+        Raises:
+            ValueError: If no recipients are configured
+        """
+        self.host = host or os.getenv('SMTP_HOST', 'localhost')
+        self.port = int(port or os.getenv('SMTP_PORT', '25'))
+        self.sender = sender or os.getenv('SMTP_FROM', 'stock-notifier@localhost')
+        if recipients is None:
+            recipients = [address.strip() for address in os.getenv('SMTP_TO', '').split(',') if address.strip()]
+        if not recipients:
+            raise ValueError("SMTP_TO is not set")
+        self.recipients = recipients
+        self.timeout = timeout if timeout is not None else float(os.getenv('SMTP_TIMEOUT', '10'))
+        if min_interval is None:
+            min_interval = float(os.getenv('SMTP_MIN_INTERVAL', '0'))
+        self.limiter = HostRateLimiter(min_interval)
+        self.username = os.getenv('SMTP_USERNAME')
+        self.password = os.getenv('SMTP_PASSWORD')
+        self.starttls = os.getenv('SMTP_STARTTLS', 'false').lower() in ('1', 'true', 'yes')
+        self.max_retries = int(os.getenv('SMTP_RETRIES', '2'))
+        self.retry_backoff = float(os.getenv('SMTP_RETRY_BACKOFF', '1'))
+        self._smtp = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        """Return the open SMTP connection, connecting first if needed."""
+        import smtplib
+
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or '')
+            self._smtp = smtp
+        return self._smtp
+
+    def _disconnect(self):
+        """Drop the SMTP connection."""
+        import smtplib
+
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def _deliver(self, subject, body, fund_name):
+        """Send one email, reconnecting and retrying on connection errors."""
+        import smtplib
+
+        email = EmailMessage()
+        email['Subject'] = subject
+        email['From'] = self.sender
+        email['To'] = ', '.join(self.recipients)
+        email.set_content(body)
+
+        attempt = 0
+        with self._lock, METRICS.stage('notify_email', fund=fund_name):
+            while True:
+                self.limiter.wait(f"smtp://{self.host}:{self.port}")
+                try:
+                    self._connection().send_message(email)
+                    print("✅ Notification sent successfully via email")
+                    return True
+                except (smtplib.SMTPException, OSError) as e:
+                    self._disconnect()
+                    if isinstance(e, smtplib.SMTPRecipientsRefused) or attempt >= self.max_retries:
+                        print(f"❌ Error sending email notification: {e}")
+                        return False
+                    delay = self.retry_backoff * (2 ** attempt)
+                    attempt += 1
+                    print(f"⚠️  SMTP delivery failed ({e}), retrying in {delay:.1f}s ({attempt}/{self.max_retries})")
+                    time.sleep(delay)
+
+    def send_price_update(self, message, fund_name="Vanguard Fund", title=None, on_sent=None, slack_message=None):
+        """
+        Send a price update email.
+
+        Args:
+            message (str): The message content to send
+            fund_name (str): The name of the fund for the subject
+            title (str): The subject (optional, defaults to fund-specific subject)
+            on_sent (callable): Called with True/False once delivery has been attempted (optional)
+            slack_message (str): Ignored; accepted for interface compatibility
+
+        Returns:
+            bool: Whether the email was sent
+        """
+        result = self._deliver(title or f"{fund_name} Price Update", message, fund_name)
+        if on_sent is not None:
+            on_sent(result)
+        return result
+
+    def send_error_notification(self, error_message, fund_name="Vanguard Fund", on_sent=None):
+        """
+        Send an error email.
+
+        Args:
+            error_message (str): The error message to send
+            fund_name (str): The name of the fund for the subject
+            on_sent (callable): Called with True/False once delivery has been attempted (optional)
+
+        Returns:
+            bool: Whether the email was sent
+        """
+        result = self._deliver(f"{fund_name} Scraper Error", f"Error in {fund_name} scraper: {error_message}",
+                               fund_name)
+        if on_sent is not None:
+            on_sent(result)
+        return result
+
+    def flush(self):
+        """Nothing is buffered; kept for interface compatibility with NtfyNotifier."""
+        return True
+
+    def close(self):
+        """Close the SMTP connection."""
+        with self._lock:
+            self._disconnect()
@@ -3,11 +3,26 @@
 Notification module for sending ntfy alerts.
 
 This module handles sending notifications via ntfy for Vanguard fund price updates.
+Notifications can be sent synchronously, from a background dispatch thread,
+or merged into a single digest per run.
+
+NOTIFY_BACKENDS selects further channels (Slack webhook, generic webhook,
+email; see notification_backends.py). With more than one backend, a
+MultiNotifier fans every notification out to all of them concurrently.
 """
 
-import requests
+import atexit
 import os
+import queue
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from metrics import METRICS
+from notification_backends import EmailBackend, SlackWebhookBackend, WebhookBackend
+from rate_limiter import HostRateLimiter
+from traffic_recorder import record_session
 
 # Load environment variables
 load_dotenv()
@@ -16,36 +31,147 @@ load_dotenv()
 class NtfyNotifier:
     """
     Handles sending notifications via ntfy.
+    
+    Notifications go over a pooled HTTP session and are retried with
+    exponential backoff. In async mode they are handed to a background
+    thread so scraping never waits on notification I/O, and in digest mode
+    all price updates from a run are merged into a single message that is
+    sent by flush() or close().
     """
     
-    def __init__(self):
-        """Initialize the ntfy notifier with configuration from environment variables."""
+    name = 'ntfy'
+    
+    def __init__(self, async_mode=None, digest=None):
+        """
+        Initialize the ntfy notifier with configuration from environment variables.
+        
+        Args:
+            async_mode (bool): Send from a background thread (defaults to NTFY_ASYNC, or false)
+            digest (bool): Merge price updates into one message (defaults to NTFY_DIGEST, or false)
+        """
         self.ntfy_url = os.getenv('NTFY_URL', 'http://192.168.0.2:6244/vanguard_not')
         self.default_priority = os.getenv('NTFY_PRIORITY', 'default')
         self.default_tags = os.getenv('NTFY_TAGS', 'chart_with_upwards_trend,heavy_dollar_sign')
+        self.timeout = float(os.getenv('NTFY_TIMEOUT', '10'))
+        self.max_retries = int(os.getenv('NTFY_RETRIES', '3'))
+        self.retry_backoff = float(os.getenv('NTFY_RETRY_BACKOFF', '1'))
+        self.limiter = HostRateLimiter(float(os.getenv('NTFY_MIN_INTERVAL', '0')))
+        if async_mode is None:
+            async_mode = os.getenv('NTFY_ASYNC', 'false').lower() in ('1', 'true', 'yes')
+        if digest is None:
+            digest = os.getenv('NTFY_DIGEST', 'false').lower() in ('1', 'true', 'yes')
+        self.async_mode = async_mode
+        self.digest = digest
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        record_session(self.session)
         
-    def send_price_update(self, message, fund_name="Vanguard Fund", title=None):
+        self._queue = None
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._digest_items = []
+        self._digest_lock = threading.Lock()
+        self._closed = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _post(self, data, headers):
         """
-        Send a price update notification via ntfy.
+        POST to the ntfy topic, retrying connection errors and 429/5xx responses.
         
         Args:
-            message (str): The message content to send
-            fund_name (str): The name of the fund for the notification title
-            title (str): The notification title (optional, defaults to fund-specific title)
+            data (str): Message body
+            headers (dict): ntfy headers
+            
+        Returns:
+            requests.Response: The final response
+            
+        Raises:
+            requests.exceptions.RequestException: If every attempt failed to connect
         """
-        if title is None:
-            title = f"{fund_name} Price Update"
+        attempt = 0
+        while True:
+            self.limiter.wait(self.ntfy_url)
+            try:
+                response = self.session.post(
+                    self.ntfy_url,
+                    data=data.encode('utf-8'),
+                    headers=headers,
+                    timeout=self.timeout
+                )
+                if response.status_code != 429 and response.status_code < 500:
+                    return response
+                if attempt >= self.max_retries:
+                    return response
+                reason = f"status code {response.status_code}"
+            except requests.exceptions.RequestException as e:
+                if attempt >= self.max_retries:
+                    raise
+                reason = str(e)
+            
+            delay = self.retry_backoff * (2 ** attempt)
+            attempt += 1
+            print(f"⚠️  ntfy request failed ({reason}), retrying in {delay:.1f}s ({attempt}/{self.max_retries})")
+            time.sleep(delay)
+    
+    def _ensure_worker(self):
+        """Start the background dispatch thread if it is not running."""
+        with self._worker_lock:
+            if self._worker is None:
+                self._queue = queue.Queue()
+                self._worker = threading.Thread(target=self._run_worker, name='ntfy-dispatch', daemon=True)
+                self._worker.start()
+                atexit.register(self.close)
+    
+    def _run_worker(self):
+        """Deliver queued notifications until a stop marker is received."""
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                func, args, on_sent = job
+                result = func(*args)
+                if on_sent is not None:
+                    on_sent(result)
+            except Exception as e:
+                print(f"❌ Unexpected error in notification dispatch: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def _dispatch(self, func, args, on_sent):
+        """
+        Run a delivery function now, or queue it in async mode.
+        
+        Returns:
+            bool: Delivery result, or True once queued in async mode
+        """
+        if self.async_mode and not self._closed:
+            self._ensure_worker()
+            self._queue.put((func, args, on_sent))
+            return True
+        
+        result = func(*args)
+        if on_sent is not None:
+            on_sent(result)
+        return result
+    
+    def _deliver_price_update(self, message, title, fund_name=None):
+        """Send a price update now and report the outcome."""
         try:
-            response = requests.post(
-                self.ntfy_url,
-                data=message,
-                headers={
+            with METRICS.stage('notify', fund=fund_name):
+                response = self._post(message, {
                     "Title": title,
                     "Priority": self.default_priority,
                     "Tags": self.default_tags
-                },
-                timeout=10
-            )
+                })
             
             if response.status_code == 200:
                 print("✅ Notification sent successfully via ntfy")
@@ -61,25 +187,15 @@ class NtfyNotifier:
             print(f"❌ Unexpected error sending notification: {e}")
             return False
     
-    def send_error_notification(self, error_message, fund_name="Vanguard Fund"):
-        """
-        Send an error notification via ntfy.
-        
-        Args:
-            error_message (str): The error message to send
-            fund_name (str): The name of the fund for the notification title
-        """
+    def _deliver_error_notification(self, error_message, fund_name):
+        """Send an error notification now and report the outcome."""
         try:
-            response = requests.post(
-                self.ntfy_url,
-                data=f"Error in {fund_name} scraper: {error_message}",
-                headers={
+            with METRICS.stage('notify', fund=fund_name):
+                response = self._post(f"Error in {fund_name} scraper: {error_message}", {
                     "Title": f"{fund_name} Scraper Error",
                     "Priority": "high",
                     "Tags": "rotating_light,exclamation"
-                },
-                timeout=10
-            )
+                })
             
             if response.status_code == 200:
                 print("✅ Error notification sent successfully via ntfy")
@@ -94,18 +210,313 @@ class NtfyNotifier:
         except Exception as e:
             print(f"❌ Unexpected error sending error notification: {e}")
             return False
+    
+    def send_price_update(self, message, fund_name="Vanguard Fund", title=None, on_sent=None, slack_message=None):
+        """
+        Send a price update notification via ntfy.
+        
+        Args:
+            message (str): The message content to send
+            fund_name (str): The name of the fund for the notification title
+            title (str): The notification title (optional, defaults to fund-specific title)
+            on_sent (callable): Called with True/False once delivery has been
+                attempted (optional; useful in async and digest modes)
+            slack_message (str): Ignored; accepted so every backend has the same interface
+                
+        Returns:
+            bool: Whether the notification was sent, or True once it has been
+                queued (async mode) or added to the digest (digest mode)
+        """
+        if self.digest:
+            with self._digest_lock:
+                self._digest_items.append((fund_name, message, on_sent))
+            print(f"📝 Added {fund_name} to the notification digest")
+            return True
+        
+        if title is None:
+            title = f"{fund_name} Price Update"
+        return self._dispatch(self._deliver_price_update, (message, title, fund_name), on_sent)
+    
+    def send_error_notification(self, error_message, fund_name="Vanguard Fund", on_sent=None):
+        """
+        Send an error notification via ntfy.
+        
+        Error notifications are never merged into the digest.
+        
+        Args:
+            error_message (str): The error message to send
+            fund_name (str): The name of the fund for the notification title
+            on_sent (callable): Called with True/False once delivery has been attempted (optional)
+            
+        Returns:
+            bool: Whether the notification was sent, or True once queued in async mode
+        """
+        return self._dispatch(self._deliver_error_notification, (error_message, fund_name), on_sent)
+    
+    def _deliver_digest(self, items):
+        """Send a digest of price updates and notify each update's callback."""
+        lines = [f"{fund_name}: {message}" for fund_name, message, _ in items]
+        title = f"Vanguard Price Digest ({len(items)} fund{'s' if len(items) != 1 else ''})"
+        result = self._deliver_price_update("\n".join(lines), title, 'digest')
+        for _, _, on_sent in items:
+            if on_sent is not None:
+                on_sent(result)
+        return result
+    
+    def flush(self):
+        """
+        Send any pending digest and wait for queued notifications to be delivered.
+        
+        Returns:
+            bool: Whether the digest was sent (True if there was nothing to send)
+        """
+        with self._digest_lock:
+            items, self._digest_items = self._digest_items, []
+        
+        result = True
+        if items:
+            print(f"\n📨 Sending digest of {len(items)} price update(s)")
+            result = self._dispatch(self._deliver_digest, (items,), None)
+        
+        if self._queue is not None:
+            self._queue.join()
+        return result
+    
+    def close(self):
+        """Flush pending notifications, stop the dispatch thread and close the session."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+        self.session.close()
+
+
+class _FanOut:
+    """Collects one notification's result from every backend and reports it once."""
+    
+    def __init__(self, pending, on_sent):
+        self.pending = pending
+        self.on_sent = on_sent
+        self.delivered = False
+        self._lock = threading.Lock()
+    
+    def __call__(self, result):
+        with self._lock:
+            self.delivered = self.delivered or bool(result)
+            self.pending -= 1
+            done = self.pending == 0
+        if done and self.on_sent is not None:
+            self.on_sent(self.delivered)
+
+
+class MultiNotifier:
+    """
+    Fans notifications out to several backends at once.
+    
+    Each backend gets its own dispatch thread and queue, so a slow or
+    unreachable backend only delays its own messages: sending never blocks
+    the scraper, and the other backends deliver at their own pace. The
+    interface matches NtfyNotifier. A notification's on_sent callback runs
+    once every backend has tried it, with True if at least one delivered it.
+    """
+    
+    def __init__(self, backends, drain_timeout=None):
+        """
+        Start a dispatch thread for each backend.
+        
+        Args:
+            backends (list): Backend notifiers (NtfyNotifier, SlackWebhookBackend, ...)
+            drain_timeout (float): Seconds flush() waits for each backend
+                (defaults to NOTIFY_DRAIN_TIMEOUT, or 120)
+        """
+        self.backends = backends
+        if drain_timeout is None:
+            drain_timeout = float(os.getenv('NOTIFY_DRAIN_TIMEOUT', '120'))
+        self.drain_timeout = drain_timeout
+        self._queues = []
+        self._workers = []
+        for backend in backends:
+            jobs = queue.Queue()
+            worker = threading.Thread(target=self._run_worker, args=(backend, jobs),
+                                      name=f"notify-{backend.name}", daemon=True)
+            worker.start()
+            self._queues.append(jobs)
+            self._workers.append(worker)
+        self._closed = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @staticmethod
+    def _run_worker(backend, jobs):
+        """Run one backend's queued deliveries until a stop marker is received."""
+        name = backend.name
+        while True:
+            job = jobs.get()
+            try:
+                if job is None:
+                    return
+                job(backend)
+            except Exception as e:
+                print(f"❌ Unexpected error in {name} notification dispatch: {e}")
+            finally:
+                jobs.task_done()
+    
+    def _submit(self, job, on_sent):
+        """Queue a job on every backend, collecting results for on_sent."""
+        fan_out = _FanOut(len(self._queues), on_sent)
+        for jobs in self._queues:
+            jobs.put(lambda backend: job(backend, fan_out))
+        return True
+    
+    def send_price_update(self, message, fund_name="Vanguard Fund", title=None, on_sent=None, slack_message=None):
+        """
+        Queue a price update on every backend.
+        
+        Args:
+            message (str): The message content to send
+            fund_name (str): The name of the fund for the notification title
+            title (str): The notification title (optional, defaults to fund-specific title)
+            on_sent (callable): Called with True if any backend delivered it (optional)
+            slack_message (str): Slack-formatted version of the message (optional)
+            
+        Returns:
+            bool: True once queued
+        """
+        return self._submit(lambda backend, done: backend.send_price_update(
+            message, fund_name, title=title, on_sent=done, slack_message=slack_message), on_sent)
+    
+    def send_error_notification(self, error_message, fund_name="Vanguard Fund", on_sent=None):
+        """
+        Queue an error notification on every backend.
+        
+        Args:
+            error_message (str): The error message to send
+            fund_name (str): The name of the fund for the notification title
+            on_sent (callable): Called with True if any backend delivered it (optional)
+            
+        Returns:
+            bool: True once queued
+        """
+        return self._submit(lambda backend, done: backend.send_error_notification(
+            error_message, fund_name, on_sent=done), on_sent)
+    
+    def _drain(self):
+        """
+        Flush every backend in parallel and wait up to the drain timeout.
+        
+        Returns:
+            list: Whether each backend finished in time, in backend order
+        """
+        finished = []
+        for jobs in self._queues:
+            event = threading.Event()
+            jobs.put(lambda backend, event=event: (backend.flush(), event.set()))
+            finished.append(event)
+        
+        deadline = time.monotonic() + self.drain_timeout
+        drained = []
+        for backend, event in zip(self.backends, finished):
+            drained.append(event.wait(max(0, deadline - time.monotonic())))
+            if not drained[-1]:
+                print(f"⚠️  {backend.name} notifications still pending after "
+                      f"{self.drain_timeout:.0f}s; not waiting any longer")
+        return drained
+    
+    def flush(self):
+        """
+        Flush every backend and wait for its queued notifications.
+        
+        A backend that has not finished within the drain timeout is left
+        delivering in the background.
+        
+        Returns:
+            bool: True if every backend finished within the drain timeout
+        """
+        return all(self._drain())
+    
+    def close(self):
+        """Flush pending notifications, stop the dispatch threads and close every backend that finished."""
+        if self._closed:
+            return
+        drained = self._drain()
+        self._closed = True
+        for jobs in self._queues:
+            jobs.put(None)
+        for backend, worker, done in zip(self.backends, self._workers, drained):
+            if done:
+                worker.join()
+                backend.close()
+
+
+# Backend classes selectable with NOTIFY_BACKENDS
+BACKENDS = {
+    'ntfy': NtfyNotifier,
+    'slack': SlackWebhookBackend,
+    'webhook': WebhookBackend,
+    'email': EmailBackend,
+}
+
+
+def build_notifier(names=None):
+    """
+    Create the notifier for the configured backends.
+    
+    Args:
+        names (str): Comma-separated backend names (defaults to NOTIFY_BACKENDS, or ntfy)
+        
+    Returns:
+        NtfyNotifier or MultiNotifier: An NtfyNotifier when ntfy is the only
+            backend, otherwise a MultiNotifier over every backend that could be set up
+            
+    Raises:
+        ValueError: If a backend name is unknown, or none of the backends could be set up
+    """
+    names = [name.strip().lower() for name in (names or os.getenv('NOTIFY_BACKENDS', 'ntfy')).split(',')
+             if name.strip()]
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown notification backend(s): {', '.join(unknown)} "
+                         f"(choose from {', '.join(BACKENDS)})")
+    if names == ['ntfy']:
+        return NtfyNotifier()
+    
+    backends = []
+    for name in names:
+        try:
+            # ntfy already runs on its own MultiNotifier thread
+            backends.append(NtfyNotifier(async_mode=False) if name == 'ntfy' else BACKENDS[name]())
+        except ValueError as e:
+            print(f"⚠️  {name} notifications disabled: {e}")
+    if not backends:
+        raise ValueError(f"None of the notification backends could be set up ({', '.join(names)})")
+    print(f"📣 Notification backends: {', '.join(b.name for b in backends)}")
+    return MultiNotifier(backends)
 
 
 def test_notification():
-    """Test function to verify ntfy configuration."""
-    notifier = NtfyNotifier()
-    print(f"Testing ntfy notification...")
-    print(f"URL: {notifier.ntfy_url}")
-    print(f"Priority: {notifier.default_priority}")
-    print(f"Tags: {notifier.default_tags}")
+    """Test function to verify the notification configuration."""
+    notifier = build_notifier()
+    print(f"Testing notifications...")
+    for backend in getattr(notifier, 'backends', [notifier]):
+        print(f"Backend: {backend.name}")
+        if isinstance(backend, NtfyNotifier):
+            print(f"URL: {backend.ntfy_url}")
+            print(f"Priority: {backend.default_priority}")
+            print(f"Tags: {backend.default_tags}")
     
     test_message = "🧪 Test notification from Vanguard Stock Notifier"
-    success = notifier.send_price_update(test_message, "Test Notification")
+    results = []
+    notifier.send_price_update(test_message, "Test Notification", on_sent=results.append)
+    notifier.close()
+    success = bool(results and results[0])
     
     if success:
         print("✅ Test notification sent successfully!")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Readiness conditions for JavaScript-rendered Vanguard fund pages.
+
+Instead of sleeping for a fixed time after the page loads, the scraper
+waits until the prices table has actually rendered, and optionally until
+the DOM has stopped changing. Each wait is timed so the budget can be tuned.
+Selenium is only imported once a wait is needed, so runs served by the data
+endpoint never load it.
+"""
+
+import time
+
+
+# Defines pricesScope(), the tab panel holding the table with the most
+# '$'-bearing rows (whichever tab that is), or the whole document if no
+# panel holds one, and dollarRows(table), which counts a table's such rows
+# up to a limit.
+PRICES_SCOPE_JS = """
+function dollarRows(table, limit) {
+    var rows = table.querySelectorAll('tr');
+    var count = 0;
+    for (var j = 0; j < rows.length && count < limit; j++) {
+        if (rows[j].textContent.indexOf('$') !== -1) { count++; }
+    }
+    return count;
+}
+function pricesScope() {
+    var panels = document.querySelectorAll('[role="tabpanel"]');
+    var scope = document;
+    var best = 0;
+    for (var i = 0; i < panels.length; i++) {
+        var tables = panels[i].querySelectorAll('table');
+        for (var j = 0; j < tables.length; j++) {
+            var count = dollarRows(tables[j], Infinity);
+            if (count > best) { best = count; scope = panels[i]; }
+        }
+    }
+    return scope;
+}
+"""
+
+# Returns the largest number of '$'-bearing rows in any table on the page,
+# whichever tab panel it is in.
+PRICE_ROWS_SCRIPT = PRICES_SCOPE_JS + """
+var tables = document.querySelectorAll('table');
+var best = 0;
+for (var i = 0; i < tables.length; i++) {
+    best = Math.max(best, dollarRows(tables[i], arguments[0]));
+    if (best >= arguments[0]) { return best; }
+}
+return best;
+"""
+
+# Installs a MutationObserver on first call and returns the milliseconds
+# since the DOM last changed.
+SETTLE_SCRIPT = """
+if (!window.__stockNotifierObserver) {
+    window.__stockNotifierLastMutation = performance.now();
+    window.__stockNotifierObserver = new MutationObserver(function () {
+        window.__stockNotifierLastMutation = performance.now();
+    });
+    window.__stockNotifierObserver.observe(document.body || document.documentElement, {
+        childList: true, subtree: true, characterData: true
+    });
+    return 0;
+}
+return performance.now() - window.__stockNotifierLastMutation;
+"""
+
+
+# Clicks the first visible "load more"/"show all" style control in the tab
+# panel holding the prices table, returning whether one was found.
+LOAD_MORE_SCRIPT = PRICES_SCOPE_JS + """
+var scope = pricesScope();
+var pattern = /\\b(load|show|view|see)\\s+(more|all|older)\\b|older prices|more results/i;
+var controls = scope.querySelectorAll('button, a, [role="button"]');
+for (var i = 0; i < controls.length; i++) {
+    var control = controls[i];
+    if (pattern.test(control.textContent) && control.offsetParent !== null && !control.disabled) {
+        control.click();
+        return true;
+    }
+}
+return false;
+"""
+
+# Large enough that PRICE_ROWS_SCRIPT counts every row
+ALL_ROWS = 1000000000
+
+
+def prices_table_ready(min_rows=2):
+    """
+    Build a WebDriverWait condition for a rendered prices table.
+
+    Args:
+        min_rows (int): Number of '$'-bearing rows the table must contain
+
+    Returns:
+        callable: Condition that is truthy once the table is ready
+    """
+    def condition(driver):
+        return driver.execute_script(PRICE_ROWS_SCRIPT, min_rows) >= min_rows
+    return condition
+
+
+def dom_settled(quiet_ms):
+    """
+    Build a WebDriverWait condition for a DOM that has stopped changing.
+
+    Args:
+        quiet_ms (int): Milliseconds without mutations before the DOM counts as settled
+
+    Returns:
+        callable: Condition that is truthy once the DOM has settled
+    """
+    def condition(driver):
+        return driver.execute_script(SETTLE_SCRIPT) >= quiet_ms
+    return condition
+
+
+def wait_for_prices(driver, timeout, min_rows=2, settle_ms=0, timings=None, poll_frequency=0.1):
+    """
+    Wait until the prices table is ready, within a time budget.
+
+    Args:
+        driver: Selenium WebDriver with the fund page loaded
+        timeout (float): Total seconds available for all waits
+        min_rows (int): Number of '$'-bearing rows required
+        settle_ms (int): If positive, also wait for this many quiet milliseconds
+        timings (dict): Dict to record the seconds spent in each wait in
+            ('ready_wait', and 'settle_wait' if used), even if a wait times out
+        poll_frequency (float): Seconds between condition checks
+
+    Returns:
+        dict: The timings dict
+
+    Raises:
+        TimeoutException: If the page is not ready within the budget
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    deadline = time.monotonic() + timeout
+    waits = timings if timings is not None else {}
+
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(prices_table_ready(min_rows))
+    finally:
+        waits['ready_wait'] = time.monotonic() - started
+
+    if settle_ms > 0:
+        started = time.monotonic()
+        remaining = max(0.0, deadline - started)
+        try:
+            WebDriverWait(driver, remaining, poll_frequency=poll_frequency).until(dom_settled(settle_ms))
+        finally:
+            waits['settle_wait'] = time.monotonic() - started
+
+    return waits
+
+
+def expand_price_history(driver, max_clicks=100, timeout=10, poll_frequency=0.2):
+    """
+    Reveal older prices on a page that paginates its history.
+
+    Keeps clicking the prices panel's "load more"/"show all" control and
+    waiting for more rows to render, until there is no such control, it
+    stops adding rows, or max_clicks is reached.
+
+    Args:
+        driver: Selenium WebDriver with the fund page loaded and ready
+        max_clicks (int): Maximum number of times to load more rows
+        timeout (float): Seconds to wait for each click to add rows
+        poll_frequency (float): Seconds between row count checks
+
+    Returns:
+        int: Number of '$'-bearing rows in the largest prices table afterwards
+    """
+    rows = driver.execute_script(PRICE_ROWS_SCRIPT, ALL_ROWS)
+    for _ in range(max_clicks):
+        if not driver.execute_script(LOAD_MORE_SCRIPT):
+            break
+        before = rows
+        deadline = time.monotonic() + timeout
+        while rows <= before and time.monotonic() < deadline:
+            time.sleep(poll_frequency)
+            rows = driver.execute_script(PRICE_ROWS_SCRIPT, ALL_ROWS)
+        if rows <= before:
+            break
+    return rows
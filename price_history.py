@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Local price history store for Vanguard funds.
+
+Keeps every daily price and distribution row ever scraped in a SQLite
+database keyed by port ID and date, so history builds up across runs.
+Rows are clustered on (port_id, date), which keeps "latest N days for
+fund X" lookups fast however many years and funds are stored.
+"""
+
+import os
+import sqlite3
+import threading
+from fund_rows import typed_rows
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    port_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    buy REAL,
+    sell REAL,
+    nav REAL,
+    PRIMARY KEY (port_id, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS distributions (
+    port_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    cents_per_unit REAL,
+    reinvestment_date TEXT,
+    reinvestment_price REAL,
+    PRIMARY KEY (port_id, date)
+) WITHOUT ROWID;
+"""
+
+
+def price_records(headers, rows):
+    """
+    Convert daily price table rows into (date, buy, sell, nav) records.
+
+    Args:
+        headers (list): Table headers ('Date', 'Buy', 'Sell', 'NAV')
+        rows (list): PriceRow objects, or rows as lists of strings
+
+    Returns:
+        list: Records with an ISO date and float prices; unparseable rows are skipped
+    """
+    return [row.record() for row in typed_rows('prices', headers, rows)]
+
+
+def distribution_records(headers, rows):
+    """
+    Convert distribution table rows into (date, cpu, reinvestment date, price) records.
+
+    Args:
+        headers (list): Table headers ('Distribution date', 'Cents per unit', ...)
+        rows (list): DistributionRow objects, or rows as lists of strings
+
+    Returns:
+        list: Records with ISO dates and float amounts; unparseable rows are skipped
+    """
+    return [row.record() for row in typed_rows('distributions', headers, rows)]
+
+
+class PriceHistoryStore:
+    """
+    SQLite-backed history of fund prices and distributions.
+
+    Safe to share between scraper threads; writes are serialized with a lock.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Open (and create if needed) the history database.
+
+        Args:
+            db_path (str): Database file (defaults to PRICE_HISTORY_DB, or price_history.db)
+        """
+        self.db_path = db_path or os.getenv('PRICE_HISTORY_DB', 'price_history.db')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _insert_new(self, table, port_id, records, columns):
+        """Insert records, skipping any (port_id, date) that is already stored."""
+        if not records:
+            return 0
+        placeholders = ', '.join('?' for _ in range(len(columns) + 1))
+        sql = f"INSERT OR IGNORE INTO {table} (port_id, {', '.join(columns)}) VALUES ({placeholders})"
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(sql, ((port_id,) + tuple(record) for record in records))
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def add_prices(self, port_id, headers, rows):
+        """
+        Store daily price rows that have not been seen before.
+
+        Args:
+            port_id (str): Vanguard port ID of the fund
+            headers (list): Table headers
+            rows (list): Typed rows, or rows as lists of strings
+
+        Returns:
+            int: Number of new rows stored
+        """
+        return self._insert_new('prices', port_id, price_records(headers, rows),
+                                ('date', 'buy', 'sell', 'nav'))
+
+    def add_distributions(self, port_id, headers, rows):
+        """
+        Store distribution rows that have not been seen before.
+
+        Args:
+            port_id (str): Vanguard port ID of the fund
+            headers (list): Table headers
+            rows (list): Typed rows, or rows as lists of strings
+
+        Returns:
+            int: Number of new rows stored
+        """
+        return self._insert_new('distributions', port_id, distribution_records(headers, rows),
+                                ('date', 'cents_per_unit', 'reinvestment_date', 'reinvestment_price'))
+
+    def add_table(self, port_id, table):
+        """
+        Store a table record from the extractor or data endpoint.
+
+        Args:
+            port_id (str): Vanguard port ID of the fund
+            table (dict): Table record with 'headers', 'rows' and 'kind'
+
+        Returns:
+            int: Number of new rows stored (0 for tables that are not stored)
+        """
+        if table['kind'] == 'prices':
+            return self.add_prices(port_id, table['headers'], table['rows'])
+        if table['kind'] == 'distributions':
+            return self.add_distributions(port_id, table['headers'], table['rows'])
+        return 0
+
+    def latest_prices(self, port_id, days):
+        """
+        Get the most recent daily prices for a fund.
+
+        Args:
+            port_id (str): Vanguard port ID of the fund
+            days (int): Number of price days to return
+
+        Returns:
+            list: (date, buy, sell, nav) tuples, newest first
+        """
+        with self._lock:
+            return self._conn.execute(
+                'SELECT date, buy, sell, nav FROM prices WHERE port_id = ? ORDER BY date DESC LIMIT ?',
+                (port_id, days),
+            ).fetchall()
+
+    def latest_distributions(self, port_id, count):
+        """
+        Get the most recent distributions for a fund.
+
+        Args:
+            port_id (str): Vanguard port ID of the fund
+            count (int): Number of distributions to return
+
+        Returns:
+            list: (date, cents_per_unit, reinvestment_date, reinvestment_price) tuples, newest first
+        """
+        with self._lock:
+            return self._conn.execute(
+                'SELECT date, cents_per_unit, reinvestment_date, reinvestment_price FROM distributions '
+                'WHERE port_id = ? ORDER BY date DESC LIMIT ?',
+                (port_id, count),
+            ).fetchall()
+
+    def price_history(self, port_ids=None):
+        """
+        Get the full daily price history of one or more funds in a single query.
+
+        Each fund's series uses one price column throughout, so days with and
+        without a NAV don't mix: the buy price (as in price change
+        notifications), or the sell price and then the NAV for a fund that
+        has no buy prices stored at all.
+
+        Args:
+            port_ids (list): Port IDs to load (None for every fund)
+
+        Returns:
+            list: (port_id, price) tuples, grouped by fund and oldest first
+        """
+        where = ''
+        params = ()
+        if port_ids is not None:
+            port_ids = list(port_ids)
+            if not port_ids:
+                return []
+            where = f"WHERE port_id IN ({', '.join('?' for _ in port_ids)})"
+            params = tuple(port_ids)
+        sql = ('SELECT port_id, price FROM ('
+               '  SELECT port_id, date, CASE price_column WHEN 0 THEN buy WHEN 1 THEN sell ELSE nav END AS price'
+               '  FROM prices JOIN ('
+               '    SELECT port_id, CASE WHEN COUNT(buy) THEN 0 WHEN COUNT(sell) THEN 1 ELSE 2 END AS price_column'
+               f'    FROM prices {where} GROUP BY port_id'
+               '  ) USING (port_id)'
+               ') WHERE price IS NOT NULL ORDER BY port_id, date')
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Per-host rate limiting for the Vanguard scraper.
+
+Replaces the fixed delay between funds with a limiter that only spaces out
+requests going to the same host, so concurrent workers stay polite to the
+server without waiting on each other needlessly.
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """
+    Enforces a minimum interval between requests to the same host.
+
+    Safe to share between threads: each host has its own slot, and callers
+    reserve the next free slot before sleeping so waits never overlap.
+    """
+
+    def __init__(self, min_interval=3.0):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            min_interval (float): Minimum seconds between requests to one host
+        """
+        self.min_interval = max(0.0, min_interval)
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """
+        Block until a request to the URL's host is allowed.
+
+        Args:
+            url (str): The URL about to be requested
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            print(f"⏳ Waiting {delay:.1f} seconds before requesting {host}...")
+            time.sleep(delay)
+        return delay
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+Offline record and replay of the scraper's HTTP traffic.
+
+Recording: with REPLAY_RECORD_DIR set, the scraper writes the responses
+it receives and the notifications it sends to that directory (see
+traffic_recorder.py).
+
+Replay: ReplayServer is a local HTTP stand-in for vanguard.com.au and the
+notification services. It serves recorded or synthetic responses by path
+and query, whichever host they were recorded from, and captures every POST
+it receives as a notification. SmtpServer is a minimal SMTP stand-in that
+captures the email backend's messages the same way. The commands below run
+the full main() pipeline against them, with fresh stores in a temporary
+directory:
+
+    serve       Serve a recording (or synthetic funds) until interrupted
+    run         Replay a recording and check the notifications match the recorded ones
+    loadtest    Scrape N synthetic funds, check every fund is notified exactly once
+                with its latest price by ntfy and by email, then that a second
+                run sends nothing; with --browser the fund pages are scraped by
+                the concurrent Chrome workers instead of the data endpoint
+                (untested so far: it has not been run with Chrome installed)
+
+Record with FUND_STATE_FILE set to an empty value, so every fund's
+notification is recorded, not just the ones that changed.
+
+Usage:
+    REPLAY_RECORD_DIR=recordings/today python vanguard_scraper.py
+    python replay.py run --recording recordings/today [--config funds_config.yml]
+    python replay.py serve (--recording DIR | --synthetic N) [--port PORT]
+    python replay.py loadtest [--funds 1000] [--workers 8] [--browser] [--verbose]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from email import message_from_bytes, policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urlunsplit
+from traffic_recorder import load_recorded_notifications, load_recording, request_key
+
+
+# Stand-in paths for each notification service
+NOTIFY_PATHS = {'NTFY_URL': '/ntfy', 'SLACK_WEBHOOK_URL': '/slack', 'WEBHOOK_URL': '/webhook'}
+
+# Path recorded on notifications captured by the SMTP stand-in
+SMTP_PATH = 'smtp'
+
+SYNTHETIC_LATEST_DAY = date(2025, 10, 17)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Serves the stand-in's responses and captures POSTed notifications."""
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        replay = self.server.replay
+        if self.path == '/__replay__/notifications':
+            self._send(200, 'application/json', json.dumps(replay.notifications).encode('utf-8'))
+            return
+        response = replay.responses.get(request_key(self.path))
+        if response is None:
+            replay.record_miss(self.path)
+            self._send(404, 'text/plain', b'Not recorded')
+            return
+        self._send(*response)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8', errors='replace')
+        self.server.replay.capture({'path': request_key(self.path), 'title': self.headers.get('Title'),
+                                    'body': body})
+        self._send(200, 'application/json', b'{}')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in for the fund pages, data endpoints and notification services.
+
+    Use as a context manager, or call start() and stop().
+    """
+
+    def __init__(self, responses, host='127.0.0.1', port=0):
+        """
+        Args:
+            responses (dict): request_key() -> (status, content type, body bytes)
+            host (str): Address to listen on
+            port (int): Port to listen on (0 picks a free one)
+        """
+        self.responses = responses
+        self.notifications = []
+        self.misses = []
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), ReplayHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.replay = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the stand-in."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def capture(self, notification):
+        """Store a POSTed notification."""
+        with self._lock:
+            self.notifications.append(notification)
+
+    def record_miss(self, path):
+        """Note a GET for something that wasn't recorded."""
+        with self._lock:
+            self.misses.append(path)
+
+    def take_notifications(self):
+        """
+        Return the notifications captured so far and start a new list.
+
+        Returns:
+            list: Notifications as dicts with 'path', 'title' and 'body'
+        """
+        with self._lock:
+            notifications, self.notifications = self.notifications, []
+            return notifications
+
+    def start(self):
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class SmtpHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib to send messages, and captures each one."""
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode('ascii'))
+
+    def handle(self):
+        self._reply('220 localhost stand-in ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', errors='replace').strip().upper()
+            if command.startswith('EHLO'):
+                self._reply('250-localhost')
+                self._reply('250 8BITMIME')
+            elif command.startswith(('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                self._read_message()
+                self._reply('250 OK')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+    def _read_message(self):
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line.rstrip(b'\r\n') == b'.':
+                break
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b'..') else line)
+        message = message_from_bytes(b''.join(lines), policy=policy.default)
+        body = message.get_body(('plain',))
+        self.server.capture({'path': SMTP_PATH, 'title': message['Subject'],
+                             'body': body.get_content() if body is not None else ''})
+
+
+class SmtpServer:
+    """
+    Local SMTP stand-in that captures every message as a notification.
+
+    Captured messages are passed to capture() as dicts with 'path' (always
+    SMTP_PATH), 'title' (the subject) and 'body'. Use as a context manager,
+    or call start() and stop().
+    """
+
+    def __init__(self, capture, host='127.0.0.1', port=0):
+        """
+        Args:
+            capture (callable): Called with each captured message, e.g. ReplayServer.capture
+            host (str): Address to listen on
+            port (int): Port to listen on (0 picks a free one)
+        """
+        self.server = socketserver.ThreadingTCPServer((host, port), SmtpHandler)
+        self.server.daemon_threads = True
+        self.server.capture = capture
+        self._thread = None
+
+    @property
+    def address(self):
+        """(host, port) the stand-in listens on."""
+        return self.server.server_address[:2]
+
+    def start(self):
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, name='smtp-stand-in', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def synthetic_funds(count, seed=0, days=30):
+    """
+    Build synthetic funds and the responses the stand-in serves for them.
+
+    Each fund has a data endpoint prices and distributions response and a
+    rendered fund page, so both the fast path and the browser path work.
+
+    Args:
+        count (int): Number of funds
+        seed (int): Random seed, so runs are reproducible
+        days (int): Business days of prices per fund
+
+    Returns:
+        tuple: (funds, responses, expected) with fund configurations,
+            responses for ReplayServer, and fund name -> latest buy price
+            as it should appear in the fund's notification
+    """
+    from fund_config import FUND_URL_TEMPLATE
+    from fund_rows import format_price
+    from vanguard_api import DEFAULT_API_BASE, DEFAULT_DISTRIBUTIONS_PATH, DEFAULT_PRICES_PATH
+
+    rng = random.Random(seed)
+    business_days = []
+    day = SYNTHETIC_LATEST_DAY
+    while len(business_days) < days:
+        if day.weekday() < 5:
+            business_days.append(day)
+        day -= timedelta(days=1)
+
+    api_path = urlsplit(DEFAULT_API_BASE).path
+    funds, responses, expected = [], {}, {}
+    for index in range(count):
+        port_id = str(100000 + index)
+        name = f"Synthetic Fund {index:04d}"
+        url = FUND_URL_TEMPLATE.format(port_id=port_id)
+        funds.append({'name': name, 'url': url, 'port_id': port_id})
+
+        price = rng.uniform(1.0, 5.0)
+        prices = []
+        for day in business_days:
+            prices.append({'asOfDate': day.isoformat(), 'buyPrice': round(price * 1.0008, 4),
+                           'sellPrice': round(price * 0.9992, 4), 'navPrice': round(price, 4)})
+            price *= 1 + rng.uniform(-0.01, 0.01)
+        distributions = [{'distributionDate': date(2025, month, 1).isoformat(),
+                          'centsPerUnit': round(rng.uniform(0.5, 3.0), 4),
+                          'reinvestmentDate': date(2025, month, 1).isoformat(),
+                          'reinvestmentPrice': prices[-1]['navPrice']} for month in (10, 7, 4, 1)]
+        expected[name] = format_price(prices[0]['buyPrice'])
+
+        responses[request_key(api_path + DEFAULT_PRICES_PATH.format(port_id=port_id))] = (
+            200, 'application/json', json.dumps({'data': prices}).encode('utf-8'))
+        responses[request_key(api_path + DEFAULT_DISTRIBUTIONS_PATH.format(port_id=port_id))] = (
+            200, 'application/json', json.dumps({'data': distributions}).encode('utf-8'))
+        rows = ''.join(f"<tr><td>{date.fromisoformat(row['asOfDate']).strftime('%d %b %Y')}</td>"
+                       f"<td>{format_price(row['buyPrice'])}</td><td>{format_price(row['sellPrice'])}</td>"
+                       f"<td>{format_price(row['navPrice'])}</td></tr>" for row in prices)
+        page = (f'<!DOCTYPE html><html><head><title>{name} | Vanguard</title></head><body><main>'
+                '<div role="tabpanel" id="prices-and-distributions"><table class="prices"><thead><tr>'
+                '<th>Date</th><th>Buy</th><th>Sell</th><th>NAV</th></tr></thead>'
+                f'<tbody>{rows}</tbody></table></div></main></body></html>')
+        responses[request_key(url)] = (200, 'text/html; charset=utf-8', page.encode('utf-8'))
+    return funds, responses, expected
+
+
+def replay_environment(server_url, workdir, smtp_address=None):
+    """
+    Build the environment that points the scraper at the stand-in.
+
+    The data endpoint and notification services are redirected to the
+    stand-in, stores are kept in workdir, caches, recording and rate
+    limits are turned off, and notifications are sent one by one. Email is
+    sent to the SMTP stand-in if one is given, and turned off otherwise.
+
+    Args:
+        server_url (str): Base URL of the ReplayServer
+        workdir (str): Directory for the run's price history and fund state
+        smtp_address (tuple): (host, port) of an SmtpServer (optional)
+
+    Returns:
+        dict: Environment variables to set
+    """
+    from vanguard_api import DEFAULT_API_BASE
+
+    api_path = urlsplit(os.getenv('VANGUARD_API_BASE', DEFAULT_API_BASE)).path
+    backends = [name.strip() for name in os.getenv('NOTIFY_BACKENDS', 'ntfy').split(',')
+                if name.strip() and (name.strip() != 'email' or smtp_address)]
+    env = {
+        'VANGUARD_API_BASE': server_url + api_path,
+        'NOTIFY_BACKENDS': ','.join(backends) or 'ntfy',
+        'NTFY_ASYNC': 'false',
+        'NTFY_DIGEST': 'false',
+        'NTFY_MIN_INTERVAL': '0',
+        'SCRAPER_HOST_INTERVAL': '0',
+        'PRICE_HISTORY_DB': os.path.join(workdir, 'price_history.db'),
+        'FUND_STATE_FILE': os.path.join(workdir, 'fund_state.json'),
+        'FUND_HEALTH_FILE': '',
+        'RESPONSE_CACHE_DIR': '',
+        'FUND_CONFIG_CACHE': '',
+        'REPLAY_RECORD_DIR': '',
+        'SCRAPER_SNAPSHOT_DIR': '',
+    }
+    for name, path in NOTIFY_PATHS.items():
+        if name == 'NTFY_URL' or os.getenv(name):
+            env[name] = server_url + path
+    if smtp_address:
+        env.update({'SMTP_HOST': smtp_address[0], 'SMTP_PORT': str(smtp_address[1]),
+                    'SMTP_TO': os.getenv('SMTP_TO') or 'replay@localhost', 'SMTP_STARTTLS': 'false',
+                    'SMTP_USERNAME': '', 'SMTP_MIN_INTERVAL': '0'})
+    return env
+
+
+@contextlib.contextmanager
+def environment(overrides):
+    """Set environment variables for the duration of a with block."""
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def write_config(funds, path, server_url=None):
+    """
+    Write fund configurations to a funds_config.yml file.
+
+    Args:
+        funds (list): Fund configurations
+        path (str): File to write
+        server_url (str): Base URL to point fund page URLs at (optional)
+    """
+    import yaml
+
+    entries = []
+    for fund in funds:
+        entry = {key: value for key, value in fund.items() if value not in (None, [])}
+        if server_url:
+            parts = urlsplit(entry['url'])
+            base = urlsplit(server_url)
+            entry['url'] = urlunsplit((base.scheme, base.netloc, parts.path, parts.query, ''))
+        entries.append(entry)
+    with open(path, 'w', encoding='utf-8') as file:
+        yaml.safe_dump({'funds': entries}, file, sort_keys=False)
+
+
+def run_pipeline(config_path, verbose=False):
+    """
+    Run the scraper's main() over a funds config, in this process.
+
+    Args:
+        config_path (str): Funds configuration file
+        verbose (bool): Show the scraper's output instead of capturing it
+
+    Returns:
+        tuple: (elapsed seconds, captured output, or '' if verbose)
+    """
+    from vanguard_scraper import main
+
+    output = io.StringIO()
+    started = time.perf_counter()
+    if verbose:
+        main(['--config', config_path])
+    else:
+        with contextlib.redirect_stdout(output):
+            main(['--config', config_path])
+    return time.perf_counter() - started, output.getvalue()
+
+
+def check_notifications(notifications, expected):
+    """
+    Check a run sent every fund exactly one price update with its latest price.
+
+    Args:
+        notifications (list): Captured notifications
+        expected (dict): Fund name -> text its notification must contain
+
+    Returns:
+        list: Problems found (empty if the notifications are as expected)
+    """
+    problems = []
+    by_title = {}
+    for notification in notifications:
+        by_title.setdefault(notification['title'], []).append(notification)
+    for name, text in expected.items():
+        sent = by_title.pop(f"{name} Price Update", [])
+        if not sent:
+            problems.append(f"{name}: no price update sent")
+        elif len(sent) > 1:
+            problems.append(f"{name}: {len(sent)} price updates sent")
+        elif text not in sent[0]['body']:
+            problems.append(f"{name}: price update doesn't show the latest price {text}")
+    for title, sent in by_title.items():
+        problems.append(f"Unexpected notification '{title}' ({len(sent)}x)")
+    return problems
+
+
+def compare_notifications(replayed, recorded):
+    """
+    Compare replayed notifications with the recorded ones, ignoring order.
+
+    Args:
+        replayed (list): Notifications captured by the stand-in
+        recorded (list): Notifications from the recording
+
+    Returns:
+        list: Problems found (empty if both sets match)
+    """
+    replayed_counts = Counter((item['title'], item['body']) for item in replayed)
+    recorded_counts = Counter((item['title'], item['body']) for item in recorded)
+    problems = []
+    for (title, _), count in (recorded_counts - replayed_counts).items():
+        problems.append(f"Recorded but not replayed: '{title}' ({count}x)")
+    for (title, _), count in (replayed_counts - recorded_counts).items():
+        problems.append(f"Replayed but not recorded: '{title}' ({count}x)")
+    return problems
+
+
+def report(problems, output):
+    """Print problems (and the end of the scraper's output if there are any). Returns the exit code."""
+    if not problems:
+        return 0
+    print(f"❌ {len(problems)} problem(s):")
+    for problem in problems[:50]:
+        print(f"  - {problem}")
+    if len(problems) > 50:
+        print(f"  ... and {len(problems) - 50} more")
+    if output:
+        print("\nEnd of the scraper output:")
+        print("\n".join(output.splitlines()[-20:]))
+    return 1
+
+
+def load_test(count, workers, verbose=False, browser=False):
+    """
+    Scrape synthetic funds through the whole pipeline twice and check the notifications.
+
+    Notifications go to ntfy and to email, through the SMTP stand-in. On the
+    first run each channel must get one price update per fund with its
+    latest price and no errors; the second sees no new prices and must send
+    nothing.
+
+    Args:
+        count (int): Number of synthetic funds
+        workers (int): SCRAPER_WORKERS for the runs
+        verbose (bool): Show the scraper's output
+        browser (bool): Turn the data endpoint off, so every fund page is
+            served as an HTML fixture and scraped by the browser workers
+            (needs Chrome and ChromeDriver)
+
+    Returns:
+        int: Exit code (0 if every check passed)
+    """
+    funds, responses, expected = synthetic_funds(count)
+    with tempfile.TemporaryDirectory() as workdir, ReplayServer(responses) as server, \
+            SmtpServer(server.capture) as smtp:
+        config_path = os.path.join(workdir, 'funds_config.yml')
+        write_config(funds, config_path, server.url)
+        overrides = replay_environment(server.url, workdir, smtp.address)
+        overrides.update({'SCRAPER_WORKERS': str(workers), 'NOTIFY_BACKENDS': 'ntfy,email'})
+        if browser:
+            overrides.update({'VANGUARD_FAST_PATH': 'false', 'SCRAPER_BROWSER': 'true'})
+        with environment(overrides):
+            print(f"🚀 Scraping {count} synthetic funds from {server.url} with {workers} "
+                  f"{'browser ' if browser else ''}worker(s)...")
+            elapsed, output = run_pipeline(config_path, verbose)
+            notifications = server.take_notifications()
+            emails = [item for item in notifications if item['path'] == SMTP_PATH]
+            notifications = [item for item in notifications if item['path'] != SMTP_PATH]
+            print(f"⏱️  First run: {count} funds in {elapsed:.2f}s ({count / elapsed:.0f} funds/s), "
+                  f"{len(notifications)} ntfy notification(s), {len(emails)} email(s)")
+            problems = check_notifications(notifications, expected)
+            problems += [f"Email: {problem}" for problem in check_notifications(emails, expected)]
+
+            elapsed, second_output = run_pipeline(config_path, verbose)
+            notifications = server.take_notifications()
+            print(f"⏱️  Second run (no new prices): {elapsed:.2f}s, {len(notifications)} notification(s)")
+            problems += [f"Second run sent '{item['title']}'" for item in notifications]
+            problems += [f"Not served: {path}" for path in sorted(set(server.misses))]
+    if not problems:
+        print("✅ Every fund was notified once by ntfy and by email with its latest price, "
+              "and nothing was sent again")
+    return report(problems, output + second_output)
+
+
+def replay_recording(directory, config_path, verbose=False):
+    """
+    Replay a recording through the whole pipeline and compare its notifications.
+
+    Args:
+        directory (str): Recording directory
+        config_path (str): Funds configuration the recording was made with
+        verbose (bool): Show the scraper's output
+
+    Returns:
+        int: Exit code (0 if the notifications match the recording)
+    """
+    from vanguard_scraper import load_funds_config
+
+    funds = load_funds_config(config_path)
+    if not funds:
+        return 1
+    recorded = load_recorded_notifications(directory)
+    with tempfile.TemporaryDirectory() as workdir, ReplayServer(load_recording(directory)) as server:
+        replay_config = os.path.join(workdir, 'funds_config.yml')
+        write_config(funds, replay_config, server.url)
+        with environment(replay_environment(server.url, workdir)):
+            elapsed, output = run_pipeline(replay_config, verbose)
+        replayed = server.take_notifications()
+        misses = sorted(set(server.misses))
+    print(f"⏱️  Replayed {len(funds)} fund(s) in {elapsed:.2f}s: {len(replayed)} notification(s), "
+          f"{len(recorded)} recorded")
+    for path in misses:
+        print(f"⚠️  Not in the recording: {path}")
+    problems = compare_notifications(replayed, recorded)
+    if not problems:
+        print("✅ Replayed notifications match the recording")
+    return report(problems, output)
+
+
+def serve(responses, port):
+    """Serve responses (and SMTP on the next port) until interrupted, printing each captured notification."""
+    with ReplayServer(responses, port=port) as server, SmtpServer(server.capture, port=port + 1) as smtp:
+        print(f"🎭 Serving {len(responses)} response(s) at {server.url}, "
+              f"SMTP at {smtp.address[0]}:{smtp.address[1]} (Ctrl+C to stop)")
+        print("Point the scraper at it with:")
+        for name, value in replay_environment(server.url, '.', smtp.address).items():
+            if name in ('VANGUARD_API_BASE', 'SMTP_HOST', 'SMTP_PORT') or name in NOTIFY_PATHS:
+                print(f"  export {name}={value}")
+        shown = 0
+        try:
+            while True:
+                time.sleep(1)
+                for notification in server.notifications[shown:]:
+                    shown += 1
+                    print(f"📨 {notification['path']}: {notification['title'] or notification['body'][:60]}")
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping stand-in server")
+    return 0
+
+
+def main():
+    """Run the replay commands from the command line."""
+    parser = argparse.ArgumentParser(description='Offline replay of recorded or synthetic Vanguard traffic.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help='Serve a recording or synthetic funds until interrupted')
+    source = serve_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--recording', help='Recording directory (from REPLAY_RECORD_DIR)')
+    source.add_argument('--synthetic', type=int, help='Serve this many synthetic funds')
+    serve_parser.add_argument('--port', type=int, default=8765, help='Port to listen on (SMTP uses the next one)')
+    run_parser = commands.add_parser('run', help='Replay a recording and compare the notifications')
+    run_parser.add_argument('--recording', required=True, help='Recording directory (from REPLAY_RECORD_DIR)')
+    run_parser.add_argument('--config', default='funds_config.yml', help='Funds configuration file')
+    run_parser.add_argument('--verbose', action='store_true', help="Show the scraper's output")
+    load_parser = commands.add_parser('loadtest', help='Scrape synthetic funds and check the notifications')
+    load_parser.add_argument('--funds', type=int, default=1000, help='Number of synthetic funds')
+    load_parser.add_argument('--workers', type=int, default=8, help='SCRAPER_WORKERS for the runs')
+    load_parser.add_argument('--browser', action='store_true',
+                             help='Scrape the fund pages with Chrome instead of using the data endpoint '
+                                  '(untested: not yet run with Chrome installed)')
+    load_parser.add_argument('--verbose', action='store_true', help="Show the scraper's output")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        responses = load_recording(args.recording) if args.recording else synthetic_funds(args.synthetic)[1]
+        return serve(responses, args.port)
+    if args.command == 'run':
+        return replay_recording(args.recording, args.config, args.verbose)
+    return load_test(args.funds, args.workers, args.verbose, args.browser)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
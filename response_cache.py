@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+On-disk response cache for fund pages and data endpoint responses.
+
+Vanguard publishes prices at most once per business day, so a response
+holding the latest business day's prices stays valid until the next
+expected publication (see PRICE_PUBLISH_TIMES and PRICE_PUBLISH_DAYS in
+market_calendar.py). Repeat runs inside that window, such as a retry after
+a failed notification, are served from disk without any network request
+or browser. A response whose latest price is older than expected (fetched
+after the publication time but before Vanguard actually published) is
+only kept for RESPONSE_CACHE_RETRY_TTL seconds, so the next run looks
+again. Once an entry has expired, its ETag and Last-Modified validators
+(where the source sent them) are used for a conditional request, and a
+304 response renews the cached body.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from market_calendar import expected_price_date, next_run_time, publish_schedule
+
+
+class ResponseCache:
+    """
+    Directory of cached responses keyed by URL.
+
+    Each entry is a JSON file holding the body, its validators, the date
+    of its latest price (where known) and its expiry time. Safe to share between scraper threads; files are written
+    atomically.
+    """
+
+    def __init__(self, cache_dir=None, ttl=None, retry_ttl=None):
+        """
+        Open (and create if needed) the cache directory.
+
+        Args:
+            cache_dir (str): Cache directory (defaults to RESPONSE_CACHE_DIR, or .response_cache)
+            ttl (float): Fixed lifetime in seconds (defaults to RESPONSE_CACHE_TTL; if
+                neither is set, entries last until the next publication time)
+            retry_ttl (float): Lifetime in seconds of entries whose latest price
+                is older than expected (defaults to RESPONSE_CACHE_RETRY_TTL, or 900)
+        """
+        self.cache_dir = cache_dir or os.getenv('RESPONSE_CACHE_DIR', '.response_cache')
+        if ttl is None and os.getenv('RESPONSE_CACHE_TTL'):
+            ttl = float(os.getenv('RESPONSE_CACHE_TTL'))
+        self.ttl = ttl
+        if retry_ttl is None:
+            retry_ttl = float(os.getenv('RESPONSE_CACHE_RETRY_TTL', '900'))
+        self.retry_ttl = retry_ttl
+        self.publish_times, self.publish_days = publish_schedule()
+        self.timezone = ZoneInfo(os.getenv('SCHEDULE_TIMEZONE', 'Australia/Sydney'))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        """Return the file an entry is stored in."""
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def expiry_time(self, now=None, latest_date=None):
+        """
+        Work out when an entry stored now stops being fresh.
+
+        Args:
+            now (float): Unix time the entry is stored at (defaults to the current time)
+            latest_date (datetime.date): Date of the entry's latest price, if
+                the body holds prices
+
+        Returns:
+            float: Unix time of the next expected publication, or now +
+                retry_ttl if latest_date is older than the business day
+                expected by now (or now + ttl if a fixed lifetime is set)
+        """
+        now = time.time() if now is None else now
+        if self.ttl is not None:
+            return now + self.ttl
+        local_now = datetime.fromtimestamp(now, self.timezone)
+        if latest_date is not None:
+            expected = expected_price_date(local_now, self.publish_times, self.publish_days)
+            if expected is not None and latest_date < expected:
+                return now + self.retry_ttl
+        return next_run_time(local_now, self.publish_times, self.publish_days).timestamp()
+
+    def get(self, key):
+        """
+        Look up an entry, fresh or not.
+
+        Args:
+            key (str): Cache key (the request URL)
+
+        Returns:
+            dict: Entry with 'body', 'etag', 'last_modified', 'latest_date',
+                'fetched_at' and 'expires_at', or None if nothing is cached
+        """
+        try:
+            with open(self._path(key), encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('key') == key else None
+
+    @staticmethod
+    def is_fresh(entry):
+        """Return True if an entry from get() has not expired yet."""
+        return entry is not None and entry.get('expires_at', 0) > time.time()
+
+    def fresh_body(self, key):
+        """
+        Get a cached body if it has not expired.
+
+        Args:
+            key (str): Cache key (the request URL)
+
+        Returns:
+            str: The cached body, or None if there is no fresh entry
+        """
+        entry = self.get(key)
+        return entry['body'] if self.is_fresh(entry) else None
+
+    def put(self, key, body, etag=None, last_modified=None, latest_date=None):
+        """
+        Store a response until the next expected publication.
+
+        Args:
+            key (str): Cache key (the request URL)
+            body (str): Response body or rendered page source
+            etag (str): ETag response header (optional)
+            last_modified (str): Last-Modified response header (optional)
+            latest_date (datetime.date): Date of the latest price in body
+                (optional; without it the entry is assumed to be current)
+        """
+        now = time.time()
+        entry = {
+            'key': key,
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'latest_date': latest_date.isoformat() if latest_date is not None else None,
+            'fetched_at': now,
+            'expires_at': self.expiry_time(now, latest_date),
+        }
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not write response cache entry: {e}")
+
+    def renew(self, key, entry):
+        """
+        Keep a cached body after the source confirmed it is unchanged (304).
+
+        Args:
+            key (str): Cache key (the request URL)
+            entry (dict): Entry from get()
+        """
+        latest_date = date.fromisoformat(entry['latest_date']) if entry.get('latest_date') else None
+        self.put(key, entry['body'], etag=entry.get('etag'), last_modified=entry.get('last_modified'),
+                 latest_date=latest_date)
+
+    @staticmethod
+    def validators(entry):
+        """
+        Build conditional request headers for a cached entry.
+
+        Args:
+            entry (dict): Entry from get() (or None)
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers (empty if there are no validators)
+        """
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+
+def open_response_cache():
+    """
+    Open the response cache configured by RESPONSE_CACHE_DIR.
+
+    Returns:
+        ResponseCache: The cache, or None if RESPONSE_CACHE_DIR is set to an empty value
+    """
+    if os.getenv('RESPONSE_CACHE_DIR', '.response_cache') == '':
+        return None
+    try:
+        return ResponseCache()
+    except OSError as e:
+        print(f"⚠️  Response cache disabled: {e}")
+        return None
@@ -16,8 +16,20 @@ else
     echo "Docker image 'stock-notifier' found"
 fi
 
-# Run the container
-docker run --rm stock-notifier
+# Price history, change detection state, fund health and cached responses are kept
+# in ./data between runs
+mkdir -p data
+
+# Run the container: a one-off check by default, or a resident scheduler with --daemon
+if [ "$1" = "--daemon" ]; then
+    docker rm -f stock-notifier-daemon >/dev/null 2>&1
+    docker run -d --name stock-notifier-daemon --restart unless-stopped \
+        -v "$(pwd)/data:/data" \
+        -v "$(pwd)/funds_config.yml:/app/funds_config.yml:ro" \
+        stock-notifier python vanguard_scraper.py --daemon
+else
+    docker run --rm -v "$(pwd)/data:/data" stock-notifier
+fi
 
 # Exit with the same status as the docker command
 exit $?
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Resident scheduler mode for the Vanguard scraper.
+
+Instead of a cold start (container, Python imports, Chrome launch) for
+every check, the daemon keeps the interpreter, notifier, stores, browser
+pool and API client warm and scrapes on a schedule in the market's time
+zone. funds_config.yml is reloaded whenever it changes on disk.
+
+Schedule settings (environment variables):
+    SCHEDULE_TIMES      Comma-separated HH:MM run times (default: PRICE_PUBLISH_TIMES, or 06:00)
+    SCHEDULE_DAYS       Days to run on, e.g. 'tue-sat', 'mon,wed,fri' or 'daily'
+                        (default: PRICE_PUBLISH_DAYS, or tue-sat)
+    SCHEDULE_TIMEZONE   IANA time zone of the schedule (default: Australia/Sydney)
+    SCHEDULE_RUN_ON_START  Also scrape immediately when the daemon starts (default: false)
+
+Funds with their own 'schedule' in funds_config.yml (or their group's)
+run at those times instead; each run scrapes only the funds due then.
+"""
+
+import os
+import signal
+import threading
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from browser_pool import BrowserPool
+from fund_config import ConfigError, load_config
+from fund_health import open_health_tracker
+from market_calendar import DAY_NAMES, next_run_time, parse_days, parse_times, publish_schedule
+from notifier import build_notifier
+from response_cache import open_response_cache
+from vanguard_api import VanguardApiClient
+from vanguard_scraper import open_stores, run_scrape
+
+
+class ConfigWatcher:
+    """Reloads the funds configuration when its file changes."""
+
+    def __init__(self, config_path="funds_config.yml", selection=None):
+        """
+        Load the funds configuration.
+
+        Args:
+            config_path (str): Path to the configuration file
+            selection (dict): 'funds', 'groups' and 'tags' to pass to
+                FundConfig.select() (optional, default every fund)
+        """
+        self.config_path = config_path
+        self.selection = selection or {}
+        self.mtime = None
+        self.funds = []
+        self.reload_if_changed()
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload_if_changed(self):
+        """
+        Reload the configuration if the file was modified.
+
+        Returns:
+            bool: True if the configuration was reloaded
+        """
+        mtime = self._current_mtime()
+        if mtime is None or mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        try:
+            funds = load_config(self.config_path).select(**self.selection)
+        except ConfigError as e:
+            print(f"❌ Invalid configuration file {e}")
+            funds = []
+        except ValueError as e:
+            print(f"❌ {e}")
+            funds = []
+        if funds or not self.funds:
+            self.funds = funds
+        else:
+            print("⚠️  Keeping the previous fund list because the new configuration has no usable funds")
+        print(f"🔄 Loaded {len(self.funds)} fund(s) from {self.config_path}")
+        return True
+
+
+def next_scheduled_run(funds, now, times, days):
+    """
+    Find the next run time and the funds due at it.
+
+    Args:
+        funds (list): Fund configurations, with an optional 'schedule'
+        now (datetime): Current time, aware, in the schedule's time zone
+        times (list): Default run times, for funds without their own
+        days (set): Default weekdays, for funds without their own
+
+    Returns:
+        tuple: (run time, list of funds due then, in config order)
+    """
+    run_times = {}
+    due = {}
+    for fund in funds:
+        schedule = fund.get('schedule') or {}
+        key = (schedule.get('times'), schedule.get('days'))
+        if key not in run_times:
+            run_times[key] = next_run_time(now, parse_times(key[0]) if key[0] else times,
+                                           parse_days(key[1]) if key[1] else days)
+        due.setdefault(run_times[key], []).append(fund)
+    if not due:
+        return next_run_time(now, times, days), []
+    run_time = min(due)
+    return run_time, due[run_time]
+
+
+def run_daemon(config_path="funds_config.yml", selection=None):
+    """
+    Run the scraper on a schedule until interrupted.
+
+    Args:
+        config_path (str): Path to the funds configuration file
+        selection (dict): 'funds', 'groups' and 'tags' to limit the daemon to (optional)
+    """
+    timezone = ZoneInfo(os.getenv('SCHEDULE_TIMEZONE', 'Australia/Sydney'))
+    # Run when new prices are expected, unless a schedule of its own is set
+    times, days = publish_schedule()
+    if os.getenv('SCHEDULE_TIMES'):
+        times = parse_times(os.getenv('SCHEDULE_TIMES'))
+    if os.getenv('SCHEDULE_DAYS'):
+        days = parse_days(os.getenv('SCHEDULE_DAYS'))
+    run_on_start = os.getenv('SCHEDULE_RUN_ON_START', 'false').lower() in ('1', 'true', 'yes')
+    poll_seconds = float(os.getenv('SCHEDULE_POLL_SECONDS', '30'))
+    workers = int(os.getenv('SCRAPER_WORKERS', '1'))
+    fast_path = os.getenv('VANGUARD_FAST_PATH', 'true').lower() in ('1', 'true', 'yes')
+
+    print("Vanguard Multi-Fund Stock Price Scraper (daemon mode)")
+    print("="*50)
+    print(f"🕒 Schedule: {', '.join(t.strftime('%H:%M') for t in times)} "
+          f"on {', '.join(DAY_NAMES[d] for d in sorted(days))} ({timezone.key})")
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        print("\n🛑 Stopping scheduler...")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    # Everything below stays warm between runs
+    watcher = ConfigWatcher(config_path, selection)
+    notifier = build_notifier()
+    history, state_cache = open_stores()
+    response_cache = open_response_cache()
+    health = open_health_tracker()
+    pool = BrowserPool(workers)
+    api_client = VanguardApiClient(pool_size=workers, cache=response_cache) if fast_path else None
+
+    try:
+        pending_run = run_on_start
+        while not stop.is_set():
+            funds = watcher.funds
+            if not pending_run:
+                next_run, funds = next_scheduled_run(watcher.funds, datetime.now(timezone), times, days)
+                print(f"\n💤 Next run at {next_run.strftime('%a %d %b %Y %H:%M %Z')} ({len(funds)} fund(s))")
+                while not stop.is_set():
+                    remaining = (next_run - datetime.now(timezone)).total_seconds()
+                    if remaining <= 0:
+                        break
+                    stop.wait(min(remaining, poll_seconds))
+                    if watcher.reload_if_changed():
+                        # Schedules may have changed; don't skip a run that is already due
+                        now = min(datetime.now(timezone), next_run - timedelta(microseconds=1))
+                        next_run, funds = next_scheduled_run(watcher.funds, now, times, days)
+                        print(f"💤 Next run at {next_run.strftime('%a %d %b %Y %H:%M %Z')} ({len(funds)} fund(s))")
+                if stop.is_set():
+                    break
+            pending_run = False
+
+            if not funds:
+                print(f"❌ No funds configured. Please check your {config_path} file.")
+                continue
+
+            print(f"\n{'='*60}")
+            print(f"SCHEDULED RUN: {datetime.now(timezone).strftime('%a %d %b %Y %H:%M %Z')}")
+            print(f"{'='*60}")
+            try:
+                run_scrape(funds, notifier, history=history, state_cache=state_cache,
+                           pool=pool, api_client=api_client, response_cache=response_cache,
+                           health=health)
+            except Exception as e:
+                print(f"❌ Scheduled run failed: {e}")
+    finally:
+        pool.quit()
+        if api_client is not None:
+            api_client.close()
+        notifier.close()
+        if history is not None:
+            history.close()
+
+
+if __name__ == "__main__":
+    run_daemon()
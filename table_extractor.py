@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Targeted extraction of price tables from Vanguard fund pages.
+
+Parses the page with lxml, looks only at tables inside the prices tab
+panel (falling back to every table), reads each header row once and stops
+as soon as enough data rows have been collected. Results are returned as
+structured records rather than printed, with daily price and distribution
+rows parsed into typed rows (see fund_rows.py) as they are read.
+
+stream_fund_tables() gives the same results without building a DOM for
+the whole page: the page source is fed to an incremental parser in small
+chunks, and every element is discarded as soon as it has been read, so
+only the table row being parsed is held in memory at any time.
+"""
+
+import sys
+from itertools import islice
+import lxml.etree
+import lxml.html
+from fund_rows import ROW_TYPES
+from metrics import METRICS
+
+
+PRICE_TABLE_KEYWORDS = ('date', 'price', 'nav', 'unit', 'value', 'distribution')
+
+# Characters of page source fed to the incremental parser at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def parse_page(html):
+    """
+    Parse page source into an lxml document.
+
+    Args:
+        html (str): Page source
+
+    Returns:
+        lxml.html.HtmlElement: Root of the parsed document
+    """
+    return lxml.html.document_fromstring(html)
+
+
+def page_title(document):
+    """
+    Get the title of a parsed page.
+
+    Args:
+        document: Root of the parsed document
+
+    Returns:
+        str: Page title, or None if the page has none
+    """
+    title = document.findtext('.//title')
+    return title.strip() if title else None
+
+
+def cell_text(cell):
+    """Return a cell's text with each text node stripped, like get_text(strip=True)."""
+    return ''.join(text.strip() for text in cell.itertext())
+
+
+def row_cells(row):
+    """Return the text of every th/td cell in a table row."""
+    return [cell_text(cell) for cell in row if cell.tag in ('th', 'td')]
+
+
+def table_kind(headers):
+    """
+    Classify a table from its headers.
+
+    Args:
+        headers (list): Column headers
+
+    Returns:
+        str: 'prices', 'distributions', 'other' for other price-like tables,
+            or None if the table does not look like a prices table
+    """
+    if 'Date' in headers and 'Buy' in headers and 'Sell' in headers:
+        return 'prices'
+    if 'Distribution date' in headers:
+        return 'distributions'
+    joined = ' '.join(headers).lower()
+    if any(keyword in joined for keyword in PRICE_TABLE_KEYWORDS):
+        return 'other'
+    return None
+
+
+def candidate_tables(document):
+    """
+    Find the tables worth inspecting, preferring those in a tab panel.
+
+    Args:
+        document: Root of the parsed document
+
+    Returns:
+        list: lxml table elements
+    """
+    tables = document.xpath('//*[@role="tabpanel"]//table')
+    if not tables:
+        tables = document.xpath('//table')
+    return tables
+
+
+def iter_data_rows(rows, headers, kind):
+    """
+    Yield the data rows of a table one at a time.
+
+    A data row has at least two cells and at least one '$' value. Rows of
+    daily price and distribution tables are parsed into typed rows once,
+    here, and rows whose date cannot be read are skipped.
+
+    Args:
+        rows: Iterator over the table's remaining tr elements
+        headers (list): The table's column headers
+        kind (str): Table kind from table_kind()
+
+    Yields:
+        Typed rows, or lists of cell text for other tables
+    """
+    row_type = ROW_TYPES.get(kind)
+    columns = row_type.column_map(headers) if row_type else None
+
+    rows_parsed = 0
+    try:
+        for row in rows:
+            rows_parsed += 1
+            data_row = parse_data_row(row_cells(row), row_type, columns)
+            if data_row is not None:
+                yield data_row
+    finally:
+        METRICS.increment('rows_parsed', rows_parsed)
+
+
+def parse_data_row(cells, row_type, columns):
+    """
+    Turn a row's cell text into a data row.
+
+    Args:
+        cells (list): Cell text
+        row_type: Typed row class for the table (None for other tables)
+        columns (tuple): Column indexes from row_type.column_map()
+
+    Returns:
+        The typed row (or the cells for other tables), or None if this is
+            not a data row or its date cannot be read
+    """
+    if len(cells) < 2 or not any('$' in cell for cell in cells):
+        return None
+    if row_type is None:
+        return cells
+    return row_type.from_cells(cells, columns)
+
+
+def iter_tables(document):
+    """
+    Yield every prices table on a page without collecting its rows.
+
+    Args:
+        document: Root of the parsed document
+
+    Yields:
+        tuple: (kind, headers, rows) where rows is a generator from
+            iter_data_rows()
+    """
+    for table in candidate_tables(document):
+        METRICS.increment('tables_scanned')
+        rows = table.iter('tr')
+        first_row = next(rows, None)
+        if first_row is None:
+            continue
+        headers = row_cells(first_row)
+        kind = table_kind(headers)
+        if kind is None:
+            continue
+        yield kind, headers, iter_data_rows(rows, headers, kind)
+
+
+def extract_table(table, max_rows=2):
+    """
+    Extract headers and the first data rows from a single table.
+
+    See iter_data_rows() for which rows count as data rows.
+
+    Args:
+        table: lxml table element
+        max_rows (int): Stop after this many data rows (None for all)
+
+    Returns:
+        dict: {'headers', 'rows', 'kind'} or None if the table is not a
+            prices table or has no data rows. Rows of other tables are
+            lists of cell text
+    """
+    rows = table.iter('tr')
+    first_row = next(rows, None)
+    if first_row is None:
+        return None
+
+    headers = row_cells(first_row)
+    kind = table_kind(headers)
+    if kind is None:
+        return None
+
+    data_rows = iter_data_rows(rows, headers, kind)
+    try:
+        collected = list(islice(data_rows, max_rows))
+    finally:
+        data_rows.close()
+
+    if not collected:
+        return None
+    return {'headers': headers, 'rows': collected, 'kind': kind}
+
+
+def extract_price_tables(document, max_rows=2, limit=1):
+    """
+    Extract structured price tables from a parsed page.
+
+    Args:
+        document: Root of the parsed document
+        max_rows (int): Data rows to keep per table (None for all)
+        limit (int): Stop after this many tables (None for all)
+
+    Returns:
+        list: Table records as returned by extract_table(), in page order
+    """
+    records = []
+    for table in candidate_tables(document):
+        METRICS.increment('tables_scanned')
+        record = extract_table(table, max_rows=max_rows)
+        if record:
+            records.append(record)
+            if limit is not None and len(records) >= limit:
+                break
+    return records
+
+
+def extract_fund_tables(document, max_rows=2):
+    """
+    Extract every relevant table from a fund page in a single pass.
+
+    Args:
+        document: Root of the parsed document
+        max_rows (int): Data rows to keep per table (None for all)
+
+    Returns:
+        dict: One structured result for the fund, with the 'prices' and
+            'distributions' table records (or None if absent) and a list of
+            any 'other' price-like tables
+    """
+    result = {'prices': None, 'distributions': None, 'other': []}
+    for record in extract_price_tables(document, max_rows=max_rows, limit=None):
+        if record['kind'] in ('prices', 'distributions') and result[record['kind']] is None:
+            result[record['kind']] = record
+        else:
+            result['other'].append(record)
+    return result
+
+
+class PageTooLargeError(Exception):
+    """Raised when a fund page is larger than the fund's memory budget."""
+
+
+def row_size(row):
+    """Estimate the bytes a data row keeps alive (the row and its field values)."""
+    values = [getattr(row, name) for name in row.__slots__] if hasattr(row, '__slots__') else row
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in values)
+
+
+def _release(element):
+    """Free an element that has been read, along with any earlier siblings."""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def stream_fund_tables(page_source, max_rows=2, row_budget=None, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Extract every relevant table from page source without building a DOM.
+
+    Tables inside a tab panel are preferred, as in candidate_tables(), and
+    rows are read as in iter_data_rows(). Each element is discarded as soon
+    as it has been read. If the rows kept would use more than row_budget
+    bytes, later (older) rows are dropped.
+
+    Args:
+        page_source (str): Page source
+        max_rows (int): Data rows to keep per table (None for all)
+        row_budget (int): Bytes the kept rows may use, across all tables (None for no limit)
+        chunk_size (int): Characters fed to the parser at a time
+
+    Returns:
+        tuple: (title, result) where title is the page title (or None) and
+            result is a dict like extract_fund_tables()'s
+    """
+    parser = lxml.etree.HTMLPullParser(events=('start', 'end'))
+    title = None
+    panel_depth = 0
+    open_tables = []
+    panel_records = []
+    other_records = []
+    kept_bytes = 0
+    rows_parsed = 0
+    rows_dropped = 0
+
+    def handle(event, element):
+        nonlocal title, panel_depth, kept_bytes, rows_parsed, rows_dropped
+        tag = element.tag
+        # Read before the element is released, which also clears its attributes
+        is_panel = element.get('role') == 'tabpanel'
+        if event == 'start':
+            if is_panel:
+                panel_depth += 1
+            if tag == 'table':
+                open_tables.append({'in_panel': panel_depth > 0, 'headers': None, 'kind': None,
+                                    'row_type': None, 'columns': None, 'rows': []})
+            return
+
+        if tag == 'tr' and open_tables:
+            table = open_tables[-1]
+            cells = row_cells(element)
+            if table['headers'] is None:
+                table['headers'] = cells
+                table['kind'] = table_kind(cells)
+                table['row_type'] = ROW_TYPES.get(table['kind'])
+                if table['row_type'] is not None:
+                    table['columns'] = table['row_type'].column_map(cells)
+            elif table['kind'] is not None and (max_rows is None or len(table['rows']) < max_rows):
+                rows_parsed += 1
+                data_row = parse_data_row(cells, table['row_type'], table['columns'])
+                if data_row is not None:
+                    size = row_size(data_row)
+                    if row_budget is not None and kept_bytes + size > row_budget:
+                        rows_dropped += 1
+                    else:
+                        kept_bytes += size
+                        table['rows'].append(data_row)
+            _release(element)
+        elif tag == 'table' and open_tables:
+            table = open_tables.pop()
+            METRICS.increment('tables_scanned')
+            if table['kind'] is not None and table['rows']:
+                record = {'headers': table['headers'], 'rows': table['rows'], 'kind': table['kind']}
+                (panel_records if table['in_panel'] else other_records).append(record)
+            _release(element)
+        elif tag == 'title' and title is None:
+            title = (element.text or '').strip() or None
+        elif not open_tables:
+            # Keep the cells of a row until the row itself has been read
+            _release(element)
+
+        if is_panel:
+            panel_depth -= 1
+
+    try:
+        for offset in range(0, len(page_source), chunk_size):
+            parser.feed(page_source[offset:offset + chunk_size])
+            for event, element in parser.read_events():
+                handle(event, element)
+        parser.close()
+        for event, element in parser.read_events():
+            handle(event, element)
+    finally:
+        METRICS.increment('rows_parsed', rows_parsed)
+
+    if rows_dropped:
+        METRICS.increment('rows_over_budget', rows_dropped)
+        print(f"⚠️  Memory budget reached: kept {kept_bytes // 1024}KiB of rows, dropped {rows_dropped} older row(s)")
+
+    result = {'prices': None, 'distributions': None, 'other': []}
+    for record in panel_records or other_records:
+        if record['kind'] in ('prices', 'distributions') and result[record['kind']] is None:
+            result[record['kind']] = record
+        else:
+            result['other'].append(record)
+    return title, result
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Recording of the scraper's HTTP traffic for offline replay.
+
+With REPLAY_RECORD_DIR set, every response the data endpoint client
+receives, every rendered fund page and every notification POST (ntfy,
+Slack and webhook backends; email isn't HTTP and isn't recorded) is
+written to that directory:
+
+    responses/<hash>.json   One GET response: url, status, content type and body
+    requests.jsonl          Notification POSTs: url, title, body and status
+
+replay.py serves recordings back from a local stand-in server.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+
+
+# Request headers kept when a notification POST is recorded or captured
+NOTIFICATION_HEADERS = ('Title', 'Priority', 'Tags', 'Content-Type')
+
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+def request_key(url):
+    """
+    Key a request by its path and query, ignoring the scheme and host.
+
+    Args:
+        url (str): Request URL (or just a path and query)
+
+    Returns:
+        str: e.g. '/personal/api/products/personal/fund/8110/prices?limit=-1'
+    """
+    parts = urlsplit(url)
+    return (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+
+class Recorder:
+    """Writes responses and notification requests to a recording directory. Safe to share between threads."""
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Recording directory (created if needed)
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, 'responses'), exist_ok=True)
+
+    def record_response(self, url, status, content_type, body):
+        """
+        Save a GET response, replacing any earlier one for the same path and query.
+
+        Args:
+            url (str): Request URL
+            status (int): HTTP status code
+            content_type (str): Content-Type of the response
+            body (str): Response body
+        """
+        name = hashlib.sha256(request_key(url).encode('utf-8')).hexdigest()
+        path = os.path.join(self.directory, 'responses', f"{name}.json")
+        temp_path = f"{path}.tmp{threading.get_ident()}"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump({'url': url, 'status': status, 'content_type': content_type, 'body': body}, file)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not record response for {url}: {e}")
+
+    def record_request(self, method, url, headers, body, status):
+        """
+        Append a notification request to requests.jsonl.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            headers (dict): Request headers
+            body (str): Request body
+            status (int): Status code of the response
+        """
+        entry = {'method': method, 'url': url, 'status': status, 'body': body,
+                 'headers': {name: headers[name] for name in NOTIFICATION_HEADERS if name in headers}}
+        try:
+            with self._lock, open(os.path.join(self.directory, 'requests.jsonl'), 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"⚠️  Could not record request to {url}: {e}")
+
+    def on_response(self, response, *args, **kwargs):
+        """requests response hook: record GET responses and every other request."""
+        request = response.request
+        if request.method == 'GET':
+            # A 304 has no body to replay; keep the response it revalidated
+            if response.status_code != 304:
+                self.record_response(request.url, response.status_code,
+                                     response.headers.get('Content-Type', ''), response.text)
+            return
+        body = request.body or ''
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        self.record_request(request.method, request.url, request.headers, body, response.status_code)
+
+
+def recorder():
+    """
+    Get the recorder for REPLAY_RECORD_DIR.
+
+    Returns:
+        Recorder: The shared recorder, or None if recording is off
+    """
+    directory = os.getenv('REPLAY_RECORD_DIR')
+    if not directory:
+        return None
+    with _recorders_lock:
+        if directory not in _recorders:
+            _recorders[directory] = Recorder(directory)
+        return _recorders[directory]
+
+
+def record_session(session):
+    """
+    Record every response a requests session receives, if recording is on.
+
+    Args:
+        session (requests.Session): Session to hook
+    """
+    active = recorder()
+    if active is not None:
+        session.hooks['response'].append(active.on_response)
+
+
+def record_page(url, page_source):
+    """
+    Record a rendered fund page, if recording is on.
+
+    Args:
+        url (str): The URL the page was loaded from
+        page_source (str): Rendered page source
+    """
+    active = recorder()
+    if active is not None:
+        active.record_response(url, 200, 'text/html; charset=utf-8', page_source)
+
+
+def load_recording(directory):
+    """
+    Load the responses in a recording.
+
+    Args:
+        directory (str): Recording directory
+
+    Returns:
+        dict: request_key() -> (status, content type, body bytes)
+    """
+    responses = {}
+    response_dir = os.path.join(directory, 'responses')
+    for name in sorted(os.listdir(response_dir)):
+        if name.endswith('.json'):
+            with open(os.path.join(response_dir, name), 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            responses[request_key(entry['url'])] = (entry['status'], entry['content_type'],
+                                                    entry['body'].encode('utf-8'))
+    return responses
+
+
+def load_recorded_notifications(directory):
+    """
+    Load the notification requests in a recording.
+
+    Args:
+        directory (str): Recording directory
+
+    Returns:
+        list: Notifications as dicts with 'path', 'title' and 'body', in the order they were sent
+    """
+    notifications = []
+    try:
+        with open(os.path.join(directory, 'requests.jsonl'), 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    notifications.append({'path': request_key(entry['url']),
+                                          'title': entry['headers'].get('Title'), 'body': entry['body']})
+    except FileNotFoundError:
+        pass
+    return notifications
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Browserless fetcher for Vanguard fund prices.
+
+The fund page renders its prices and distributions tables from JSON data
+endpoints keyed by the fund's port ID. This module requests that data
+directly over a pooled HTTP session, which avoids starting Chrome at all.
+Responses can be kept in a ResponseCache (see response_cache.py) and are
+revalidated with ETag/Last-Modified once they expire.
+The results are returned as (headers, rows) of typed rows, in the same
+shape as the scraped tables, so the existing formatters can be used
+unchanged.
+"""
+
+import json
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from fund_rows import DistributionRow, PriceRow, parse_day, parse_number
+from metrics import METRICS
+from traffic_recorder import record_session
+
+
+DEFAULT_API_BASE = 'https://www.vanguard.com.au/personal/api/products/personal/fund'
+DEFAULT_PRICES_PATH = '/{port_id}/prices?limit=-1'
+DEFAULT_DISTRIBUTIONS_PATH = '/{port_id}/distributions?limit=-1'
+
+PRICE_HEADERS = PriceRow.HEADERS
+DISTRIBUTION_HEADERS = DistributionRow.HEADERS
+
+# Field names the endpoints have been seen to use, checked in order
+DATE_KEYS = ('asOfDate', 'effectiveDate', 'priceDate', 'date')
+BUY_KEYS = ('buyPrice', 'entryPrice', 'buy')
+SELL_KEYS = ('sellPrice', 'exitPrice', 'sell')
+NAV_KEYS = ('navPrice', 'nav', 'price')
+DISTRIBUTION_DATE_KEYS = ('distributionDate', 'exDividendDate', 'exDistributionDate', 'date')
+CPU_KEYS = ('centsPerUnit', 'cpu', 'distributionAmount', 'amount')
+REINVEST_DATE_KEYS = ('reinvestmentDate', 'reinvestDate', 'paymentDate', 'payableDate')
+REINVEST_PRICE_KEYS = ('reinvestmentPrice', 'reinvestPrice')
+
+
+class VanguardApiError(Exception):
+    """Raised when the data endpoint cannot be reached or returns unusable data."""
+
+
+def _first_value(record, keys):
+    """Return the first non-empty value in record for any of keys."""
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _find_records(payload):
+    """
+    Find the list of row records in a JSON payload.
+
+    The endpoints wrap their rows differently ({"data": [...]},
+    {"data": [{"prices": [...]}]}, or a bare list), so this returns the
+    first list of dicts found in a breadth-first walk.
+    """
+    pending = [payload]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, list):
+            if node and all(isinstance(item, dict) for item in node) and any(
+                _first_value(item, DATE_KEYS + DISTRIBUTION_DATE_KEYS) for item in node
+            ):
+                return node
+            pending.extend(node)
+        elif isinstance(node, dict):
+            pending.extend(node.values())
+    return []
+
+
+def parse_prices(payload):
+    """
+    Convert a prices endpoint payload into typed table rows.
+
+    Args:
+        payload: Decoded JSON from the prices endpoint
+
+    Returns:
+        tuple: (headers, rows) with PriceRow rows ordered newest first
+    """
+    rows = []
+    for record in _find_records(payload):
+        date = parse_day(str(_first_value(record, DATE_KEYS) or ''))
+        buy = parse_number(_first_value(record, BUY_KEYS))
+        sell = parse_number(_first_value(record, SELL_KEYS))
+        if date is None or (buy is None and sell is None):
+            continue
+        rows.append(PriceRow(date, buy, sell, parse_number(_first_value(record, NAV_KEYS))))
+    rows.sort(key=lambda row: row.date, reverse=True)
+    return list(PriceRow.HEADERS), rows
+
+
+def parse_distributions(payload):
+    """
+    Convert a distributions endpoint payload into typed table rows.
+
+    Args:
+        payload: Decoded JSON from the distributions endpoint
+
+    Returns:
+        tuple: (headers, rows) with DistributionRow rows ordered newest first
+    """
+    rows = []
+    for record in _find_records(payload):
+        date = parse_day(str(_first_value(record, DISTRIBUTION_DATE_KEYS) or ''))
+        if date is None:
+            continue
+        rows.append(DistributionRow(
+            date,
+            parse_number(_first_value(record, CPU_KEYS)),
+            parse_day(str(_first_value(record, REINVEST_DATE_KEYS) or '')),
+            parse_number(_first_value(record, REINVEST_PRICE_KEYS)),
+        ))
+    rows.sort(key=lambda row: row.date, reverse=True)
+    return list(DistributionRow.HEADERS), rows
+
+
+class VanguardApiClient:
+    """
+    Fetches fund prices and distributions from Vanguard's data endpoints.
+
+    A single requests.Session with a pooled connection adapter is shared by
+    every fund, so repeat requests reuse the same keep-alive connections.
+    """
+
+    def __init__(self, base_url=None, timeout=None, pool_size=10, cache=None):
+        """
+        Initialize the API client.
+
+        Args:
+            base_url (str): Endpoint base URL (defaults to VANGUARD_API_BASE)
+            timeout (float): Request timeout in seconds (defaults to VANGUARD_API_TIMEOUT, or 10)
+            pool_size (int): Maximum pooled connections per host
+            cache (ResponseCache): On-disk response cache (optional)
+        """
+        self.cache = cache
+        self.base_url = (base_url or os.getenv('VANGUARD_API_BASE', DEFAULT_API_BASE)).rstrip('/')
+        self.prices_path = os.getenv('VANGUARD_PRICES_PATH', DEFAULT_PRICES_PATH)
+        self.distributions_path = os.getenv('VANGUARD_DISTRIBUTIONS_PATH', DEFAULT_DISTRIBUTIONS_PATH)
+        self.timeout = timeout if timeout is not None else float(os.getenv('VANGUARD_API_TIMEOUT', '10'))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept': 'application/json'})
+        record_session(self.session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def prices_url(self, port_id):
+        """Return the prices endpoint URL for a fund."""
+        return self.base_url + self.prices_path.format(port_id=port_id)
+
+    def distributions_url(self, port_id):
+        """Return the distributions endpoint URL for a fund."""
+        return self.base_url + self.distributions_path.format(port_id=port_id)
+
+    def _get_json(self, url, prices=False):
+        """
+        Request an endpoint and decode its JSON body.
+
+        With a response cache, a fresh cached body is used without any
+        request, and an expired one is revalidated with a conditional request.
+        Prices responses are cached with the date of their latest price, so
+        one without the latest business day's prices is soon fetched again.
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if self.cache is not None and self.cache.is_fresh(entry):
+            METRICS.increment('cache_hits')
+            return json.loads(entry['body'])
+
+        headers = self.cache.validators(entry) if entry is not None else None
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+        except requests.exceptions.RequestException as e:
+            raise VanguardApiError(f"Request to {url} failed: {e}") from e
+
+        if response.status_code == 304 and entry is not None:
+            METRICS.increment('cache_revalidated')
+            self.cache.renew(url, entry)
+            return json.loads(entry['body'])
+        if response.status_code != 200:
+            raise VanguardApiError(f"Request to {url} returned status code {response.status_code}")
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise VanguardApiError(f"Response from {url} is not valid JSON") from e
+
+        if self.cache is not None:
+            METRICS.increment('cache_misses')
+            rows = parse_prices(payload)[1] if prices else None
+            self.cache.put(url, response.text, etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'),
+                           latest_date=rows[0].date if rows else None)
+        return payload
+
+    def fetch_prices(self, port_id):
+        """
+        Fetch daily prices for a fund.
+
+        Args:
+            port_id (str): Vanguard port ID of the fund
+
+        Returns:
+            tuple: (headers, rows) with rows ordered newest first
+
+        Raises:
+            VanguardApiError: If the endpoint fails or returns no price rows
+        """
+        headers, rows = parse_prices(self._get_json(self.prices_url(port_id), prices=True))
+        if not rows:
+            raise VanguardApiError(f"No price rows returned for port ID {port_id}")
+        return headers, rows
+
+    def fetch_distributions(self, port_id):
+        """
+        Fetch distribution history for a fund.
+
+        Args:
+            port_id (str): Vanguard port ID of the fund
+
+        Returns:
+            tuple: (headers, rows) with rows ordered newest first (may be empty)
+
+        Raises:
+            VanguardApiError: If the endpoint fails
+        """
+        return parse_distributions(self._get_json(self.distributions_url(port_id)))
+
+    def close(self):
+        """Close the pooled HTTP session."""
+        self.session.close()
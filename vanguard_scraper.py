@@ -7,83 +7,239 @@ for multiple funds configured in funds_config.yml.
 Each fund gets its own separate NTFY notification.
 """
 
+import argparse
+import sys
 import time
-import yaml
+from datetime import datetime
 import os
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from notifier import NtfyNotifier
+from browser_pool import BrowserPool, BrowserSession, browser_enabled
+from metrics import METRICS
+from change_detector import FundStateCache, table_fingerprint
+from fund_health import TRANSIENT_ERRORS, open_health_tracker
+from page_readiness import expand_price_history, wait_for_prices
+from price_history import PriceHistoryStore
+from rate_limiter import HostRateLimiter
+from response_cache import open_response_cache
+from fund_rows import DistributionRow, PriceRow, format_amount, format_day, format_price, parse_number, typed_rows
+from table_extractor import (
+    PageTooLargeError,
+    extract_fund_tables,
+    extract_price_tables,
+    page_title,
+    parse_page,
+    stream_fund_tables,
+    table_kind,
+)
+from vanguard_api import VanguardApiClient, VanguardApiError
+from fund_config import ConfigError, load_config
+from notifier import build_notifier
+from traffic_recorder import record_page
 
 
-def scrape_vanguard_page(url):
+# Approximate bytes an lxml DOM takes per byte of page source
+DOM_BYTES_PER_SOURCE_BYTE = 12
+
+
+def save_snapshot(url, page_source):
+    """
+    Save rendered page source for offline benchmarking, if enabled.
+    
+    Snapshots are written to the directory named by SCRAPER_SNAPSHOT_DIR,
+    one file per fund (named after the portId in the URL).
+    
+    Args:
+        url (str): The URL the page was loaded from
+        page_source (str): Rendered page source
+    """
+    snapshot_dir = os.getenv('SCRAPER_SNAPSHOT_DIR')
+    if not snapshot_dir:
+        return
+    port_id = parse_qs(urlparse(url).query).get('portId', ['page'])[0]
+    path = os.path.join(snapshot_dir, f"fund_{port_id}.html")
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(page_source)
+        print(f"📸 Saved page snapshot to {path}")
+    except OSError as e:
+        print(f"⚠️  Could not save page snapshot: {e}")
+
+
+def latest_price_date(page_source):
+    """Return the date of the newest row in a page's prices table, or None if it has none."""
+    title, data = stream_fund_tables(page_source, max_rows=1)
+    prices = data['prices']
+    return prices['rows'][0].date if prices and prices['rows'] else None
+
+
+def scrape_vanguard_page(url, session=None, timings=None, fund_timeout=None, settle_ms=None, cache=None,
+                         expand_history=False, parse=True):
     """
     Scrape the Vanguard website using Selenium to handle JavaScript rendering.
     
+    Rather than sleeping for a fixed time, this waits until the prices table
+    has rendered at least two '$' rows (and optionally until the DOM has
+    been quiet for settle_ms milliseconds). With a response cache, a page
+    rendered since the last expected price publication, showing the latest
+    business day's prices, is served from disk without opening the browser.
+    
     Args:
         url (str): The URL to scrape
+        session (BrowserSession): Shared browser session (optional, a
+            temporary one is started and shut down if not provided)
+        timings (dict): Dict to record 'startup', 'navigation', 'ready_wait'
+            and 'settle_wait' seconds in, and the kind of 'error' on failure
+            ('timeout', 'browser' or 'unexpected') (optional)
+        fund_timeout (float): Seconds allowed for navigation plus readiness
+            waits (defaults to SCRAPER_FUND_TIMEOUT, or 30)
+        settle_ms (int): Quiet milliseconds to wait for after the table is
+            ready (defaults to SCRAPER_SETTLE_MS, or 0 to skip)
+        cache (ResponseCache): On-disk response cache (optional)
+        expand_history (bool): Load every page of older prices before
+            reading the page (for backfills)
+        parse (bool): Parse the page; if False the page source is returned
+            as it is, for extract_page_data()
         
     Returns:
-        tuple: (page_source, soup_object) or (None, None) if error
+        lxml.html.HtmlElement: Parsed page (or page source if parse is False), or None if error
     """
-    driver = None
+    if cache is not None and not expand_history:
+        page_source = cache.fresh_body(url)
+        if page_source is not None:
+            print(f"Using cached page for: {url}")
+            METRICS.increment('cache_hits')
+            if timings is not None:
+                timings['cached'] = True
+            if not parse:
+                return page_source
+            with METRICS.stage('parse'):
+                return parse_page(page_source)
+    
+    if fund_timeout is None:
+        fund_timeout = float(os.getenv('SCRAPER_FUND_TIMEOUT', '30'))
+    if settle_ms is None:
+        settle_ms = int(os.getenv('SCRAPER_SETTLE_MS', '0'))
+    
+    owns_session = session is None
+    if owns_session:
+        session = BrowserSession()
     try:
         print(f"Fetching data from: {url}")
-        print("Starting browser... (this may take a moment)")
-        
-        # Set up Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        
-        # Initialize the driver
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url)
-        
-        # Wait for the page to load
-        print("Waiting for page to load...")
-        wait = WebDriverWait(driver, 30)
         
-        # Wait for content to load (not just the basic HTML shell)
-        wait.until(lambda driver: len(driver.page_source) > 10000)
+        driver, page_timings = session.open_page(url, timeout=fund_timeout)
+        if timings is not None:
+            timings.update(page_timings)
+        if page_timings['startup'] > 0:
+            METRICS.record('driver_startup', page_timings['startup'])
+        METRICS.record('page_load', page_timings['navigation'])
+        print(f"Browser startup: {page_timings['startup']:.2f}s, navigation: {page_timings['navigation']:.2f}s")
         
-        # Wait for dynamic content to load
-        time.sleep(3)
-        
-        # Wait for tab panel to be visible
+        # Wait for the prices table to render, within the fund's time budget
+        print("Waiting for prices table...")
+        remaining = max(1.0, fund_timeout - page_timings['navigation'])
+        waits = timings if timings is not None else {}
+        ready = False
         try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[role="tabpanel"]')))
-            print("Tab panel found, waiting for content...")
-            time.sleep(2)
+            wait_for_prices(driver, remaining, settle_ms=settle_ms, timings=waits)
+            ready = True
+            print(f"Prices table ready after {waits['ready_wait']:.2f}s")
         except TimeoutException:
-            print("Warning: Tab panel not found, but continuing...")
+            print(f"Warning: Prices table not ready within {remaining:.0f}s, but continuing...")
+        finally:
+            METRICS.record('readiness_wait', waits.get('ready_wait', 0.0) + waits.get('settle_wait', 0.0))
+        
+        if expand_history and ready:
+            print("Loading older prices...")
+            with METRICS.stage('expand_history'):
+                rows = expand_price_history(driver)
+            print(f"Prices table has {rows} rows")
         
         page_source = driver.page_source
         print(f"Content length: {len(page_source)} characters")
+        METRICS.increment('page_source_bytes', len(page_source.encode('utf-8')))
+        save_snapshot(url, page_source)
+        record_page(url, page_source)
+        # Only cache pages whose prices table actually rendered
+        if cache is not None and ready and not expand_history:
+            METRICS.increment('cache_misses')
+            cache.put(url, page_source, latest_date=latest_price_date(page_source))
         
-        # Parse the HTML
-        soup = BeautifulSoup(page_source, 'html.parser')
+        if not parse:
+            return page_source
         
-        return soup
+        # Parse the HTML
+        with METRICS.stage('parse'):
+            return parse_page(page_source)
         
+    except TimeoutException:
+        print("Timed out waiting for the page to load")
+        if timings is not None:
+            timings['error'] = 'timeout'
+        return None
     except WebDriverException as e:
         print(f"Browser error: {e}")
         print("Note: You may need to install Chrome and ChromeDriver")
+        session.mark_crashed()
+        if timings is not None:
+            timings['error'] = 'browser'
         return None
     except Exception as e:
         print(f"Unexpected error: {e}")
+        if timings is not None:
+            timings['error'] = 'unexpected'
         return None
     finally:
-        if driver:
-            driver.quit()
+        if owns_session:
+            session.quit()
+        else:
+            session.close_page()
+
+
+def _as_typed(headers, row):
+    """Parse a row given as a list of cell text into a typed row, if its table has a row type."""
+    if row is None or isinstance(row, (PriceRow, DistributionRow)):
+        return row
+    rows = typed_rows(table_kind(headers), headers, [row])
+    return rows[0] if rows else row
+
+
+def _display_columns(headers, row):
+    """Pair the first 4 column headers with a row's display text, leaving out missing values of typed rows."""
+    if isinstance(row, (PriceRow, DistributionRow)):
+        return row.display_columns(headers[:4])
+    cells = list(row)
+    return [(header, cells[i]) for i, header in enumerate(headers[:4]) if i < len(cells)]
+
+
+def price_change(latest_row, previous_row):
+    """
+    Work out the price change between two rows.
+    
+    Typed rows compare their parsed prices (the buy price for daily
+    prices, the reinvestment price for distributions); other rows compare
+    their second column.
+    
+    Args:
+        latest_row: Latest price data row
+        previous_row: Previous price data row (optional)
+        
+    Returns:
+        tuple: (change, change_percent), or None if it cannot be calculated
+    """
+    if previous_row is None:
+        return None
+    if isinstance(latest_row, (PriceRow, DistributionRow)):
+        latest_price, previous_price = latest_row.price, previous_row.price
+    else:
+        latest_price = parse_number(latest_row[1]) if len(latest_row) > 1 else None
+        previous_price = parse_number(previous_row[1]) if len(previous_row) > 1 else None
+    if latest_price is None or not previous_price:
+        return None
+    change = latest_price - previous_price
+    return change, (change / previous_price) * 100
 
 
 def format_for_ntfy(headers, latest_row, previous_row=None):
@@ -98,58 +254,41 @@ def format_for_ntfy(headers, latest_row, previous_row=None):
     Returns:
         str: Formatted message for ntfy
     """
-    # Extract key data
-    date = latest_row[0] if len(latest_row) > 0 else "N/A"
+    latest_row = _as_typed(headers, latest_row)
+    previous_row = _as_typed(headers, previous_row)
+    change = price_change(latest_row, previous_row)
     
-    # Determine table type and format accordingly
-    if 'Date' in headers and 'Buy' in headers and 'Sell' in headers:
+    if isinstance(latest_row, PriceRow):
         # Daily prices table - shortened format to avoid truncation
-        buy_price = latest_row[1] if len(latest_row) > 1 else "N/A"
-        sell_price = latest_row[2] if len(latest_row) > 2 else "N/A"
+        date = format_day(latest_row.date)
+        buy_price = format_price(latest_row.buy) or "N/A"
+        sell_price = format_price(latest_row.sell) or "N/A"
         
-        # Add price change if previous data available
-        if previous_row and len(latest_row) >= 2 and len(previous_row) >= 2:
-            try:
-                latest_price = float(latest_row[1].replace('$', '').replace(',', ''))
-                previous_price = float(previous_row[1].replace('$', '').replace(',', ''))
-                change = latest_price - previous_price
-                change_percent = (change / previous_price) * 100
-                
-                direction = "UP" if change > 0 else "DOWN" if change < 0 else "SAME"
-                # Shortened message to avoid truncation and emoji issues
-                message = f"VG Fund {date}: {buy_price}/{sell_price} {direction} {change_percent:+.1f}%"
-            except (ValueError, IndexError):
-                # Fallback to basic format if calculation fails
-                message = f"VG Fund {date}: Buy {buy_price}, Sell {sell_price}"
+        if change:
+            direction = "UP" if change[0] > 0 else "DOWN" if change[0] < 0 else "SAME"
+            # Shortened message to avoid truncation and emoji issues
+            message = f"VG Fund {date}: {buy_price}/{sell_price} {direction} {change[1]:+.1f}%"
         else:
             # No previous data available
             message = f"VG Fund {date}: Buy {buy_price}, Sell {sell_price}"
     
-    elif 'Distribution date' in headers:
+    elif isinstance(latest_row, DistributionRow):
         # Distribution table - shortened format
-        cpu = latest_row[1] if len(latest_row) > 1 else "N/A"
-        reinvest_price = latest_row[3] if len(latest_row) > 3 else "N/A"
+        date = format_day(latest_row.date)
+        cpu = format_amount(latest_row.cents_per_unit) or "N/A"
+        reinvest_price = format_price(latest_row.reinvestment_price) or "N/A"
         
-        # Add price change if previous data available
-        if previous_row and len(latest_row) >= 4 and len(previous_row) >= 4:
-            try:
-                latest_price = float(latest_row[3].replace('$', '').replace(',', ''))
-                previous_price = float(previous_row[3].replace('$', '').replace(',', ''))
-                change = latest_price - previous_price
-                change_percent = (change / previous_price) * 100
-                
-                direction = "UP" if change > 0 else "DOWN" if change < 0 else "SAME"
-                # Shortened message to avoid truncation and emoji issues
-                message = f"VG Dist {date}: {reinvest_price} {direction} {change_percent:+.1f}%"
-            except (ValueError, IndexError):
-                # Fallback to basic format if calculation fails
-                message = f"VG Dist {date}: CPU {cpu}, Price {reinvest_price}"
+        if change:
+            direction = "UP" if change[0] > 0 else "DOWN" if change[0] < 0 else "SAME"
+            # Shortened message to avoid truncation and emoji issues
+            message = f"VG Dist {date}: {reinvest_price} {direction} {change[1]:+.1f}%"
         else:
             # No previous data available
             message = f"VG Dist {date}: CPU {cpu}, Price {reinvest_price}"
     
     else:
         # Generic format for other table types
+        date = latest_row[0] if len(latest_row) > 0 else "N/A"
         message = f"VG Fund {date}"
         for i, header in enumerate(headers[:3]):  # Show first 3 columns
             if i < len(latest_row) and i > 0:  # Skip date (already shown)
@@ -171,170 +310,117 @@ def format_for_slack(headers, latest_row, previous_row=None):
     Returns:
         str: Formatted message for Slack
     """
+    latest_row = _as_typed(headers, latest_row)
+    previous_row = _as_typed(headers, previous_row)
+    
     message = "*📊 Vanguard Fund Price Update*\n\n"
     message += "*Latest Price Data:*\n"
     
     # Format latest data
-    for i, header in enumerate(headers[:4]):
-        if i < len(latest_row):
-            value = latest_row[i]
-            message += f"• *{header}:* {value}\n"
+    for header, value in _display_columns(headers, latest_row):
+        message += f"• *{header}:* {value}\n"
     
     # Add previous data if available
     if previous_row:
         message += "\n*Previous Price Data:*\n"
-        for i, header in enumerate(headers[:4]):
-            if i < len(previous_row):
-                value = previous_row[i]
-                message += f"• *{header}:* {value}\n"
+        for header, value in _display_columns(headers, previous_row):
+            message += f"• *{header}:* {value}\n"
         
         # Calculate and add price change
-        if len(latest_row) >= 2 and len(previous_row) >= 2:
-            try:
-                latest_price = float(latest_row[1].replace('$', '').replace(',', ''))
-                previous_price = float(previous_row[1].replace('$', '').replace(',', ''))
-                change = latest_price - previous_price
-                change_percent = (change / previous_price) * 100
-                
-                direction = "📈 UP" if change > 0 else "📉 DOWN" if change < 0 else "➡️ UNCHANGED"
-                message += f"\n*Price Change:* ${change:+.4f} ({change_percent:+.2f}%) {direction}"
-            except (ValueError, IndexError):
-                message += "\n*Price change calculation not available*"
+        change = price_change(latest_row, previous_row)
+        if change:
+            direction = "📈 UP" if change[0] > 0 else "📉 DOWN" if change[0] < 0 else "➡️ UNCHANGED"
+            message += f"\n*Price Change:* ${change[0]:+.4f} ({change[1]:+.2f}%) {direction}"
+        else:
+            message += "\n*Price change calculation not available*"
     
     return message
 
 
-def extract_historical_prices_table(soup):
+def report_price_data(headers, latest_row, previous_row=None):
     """
-    Extract and display the historical prices table from the parsed HTML.
+    Display the latest and previous price rows and build the ntfy message.
     
     Args:
-        soup: BeautifulSoup object containing the parsed HTML
+        headers: List of column headers
+        latest_row: Latest price data row
+        previous_row: Previous price data row (optional)
         
     Returns:
-        str: ntfy-formatted message or None if no valid data found
+        str: ntfy-formatted message
+    """
+    latest_row = _as_typed(headers, latest_row)
+    previous_row = _as_typed(headers, previous_row)
+    
+    # Display latest price data in Slack-compatible format
+    print("\n" + "="*50)
+    print("📊 LATEST PRICE DATA")
+    print("="*50)
+    
+    # Display each field in Slack-compatible format
+    for header, value in _display_columns(headers, latest_row):  # Only first 4 columns
+        print(f"*{header}:* {value}")
+    
+    if previous_row:
+        print("\n" + "="*50)
+        print("📈 PREVIOUS PRICE DATA")
+        print("="*50)
+        
+        # Display each field in Slack-compatible format
+        for header, value in _display_columns(headers, previous_row):  # Only first 4 columns
+            print(f"*{header}:* {value}")
+        
+        # Show price change if possible
+        change = price_change(latest_row, previous_row)
+        if change:
+            print("\n" + "="*50)
+            print("📊 PRICE CHANGE")
+            print("="*50)
+            print(f"*Price Change:* ${change[0]:+.4f}")
+            print(f"*Change %:* {change[1]:+.2f}%")
+            print(f"*Direction:* {'📈 UP' if change[0] > 0 else '📉 DOWN' if change[0] < 0 else '➡️ UNCHANGED'}")
+    
+    # Display ntfy-formatted message (single line, text message style)
+    print("\n" + "="*60)
+    print("NTFY MESSAGE FORMAT")
+    print("="*60)
+    ntfy_message = format_for_ntfy(headers, latest_row, previous_row)
+    print(ntfy_message)
+    
+    # Display Slack-formatted message
+    print("\n" + "="*60)
+    print("SLACK MESSAGE FORMAT")
+    print("="*60)
+    slack_message = format_for_slack(headers, latest_row, previous_row)
+    print(slack_message)
+    
+    return ntfy_message
+
+
+def extract_prices_table(page, max_rows=2):
+    """
+    Extract the first prices table from the parsed HTML.
+    
+    Args:
+        page: Parsed lxml document of the fund page
+        max_rows (int): Data rows to keep (None for every row in the table)
+        
+    Returns:
+        dict: Table record with 'headers', 'rows' and 'kind', or None if no
+            valid data found
     """
     try:
-        tables = soup.find_all('table')
-        print(f"Found {len(tables)} tables on the page")
+        with METRICS.stage('extraction'):
+            tables = extract_price_tables(page, max_rows=max_rows, limit=1)
         
         if not tables:
-            print("No tables found on the page")
+            print("No prices table found on the page")
             return None
         
-        for i, table in enumerate(tables):
-            print(f"\n--- Table {i+1} ---")
-            
-            # Get table headers
-            headers = []
-            header_row = table.find('thead')
-            if header_row:
-                header_cells = header_row.find_all(['th', 'td'])
-                headers = [cell.get_text(strip=True) for cell in header_cells]
-            else:
-                # Try to find headers in the first row
-                first_row = table.find('tr')
-                if first_row:
-                    header_cells = first_row.find_all(['th', 'td'])
-                    headers = [cell.get_text(strip=True) for cell in header_cells]
-            
-            print(f"Headers: {headers}")
-            
-            # Check if this looks like a prices table
-            is_prices_table = any(keyword in ' '.join(headers).lower() for keyword in 
-                                ['date', 'price', 'nav', 'unit', 'value', 'distribution'])
-            
-            if is_prices_table:
-                print("This appears to be a prices table!")
-                
-                # Extract all rows
-                rows = table.find_all('tr')
-                print(f"Found {len(rows)} rows in table")
-                
-                # Display the table data
-                print("\nTable data:")
-                for j, row in enumerate(rows[:10]):  # Show first 10 rows
-                    cells = row.find_all(['td', 'th'])
-                    row_data = [cell.get_text(strip=True) for cell in cells]
-                    print(f"Row {j+1}: {row_data}")
-                
-                # Find the latest row (usually the first data row after headers)
-                data_rows = []
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:  # At least date and price columns
-                        row_data = [cell.get_text(strip=True) for cell in cells]
-                        # Check if it looks like a data row (has date and price)
-                        if row_data and any('$' in str(cell) for cell in row_data):
-                            data_rows.append(row_data)
-                
-                if data_rows:
-                    # Get table headers
-                    header_row = rows[0]  # First row contains headers
-                    header_cells = header_row.find_all(['th', 'td'])
-                    headers = [cell.get_text(strip=True) for cell in header_cells]
-                    
-                    latest_row = data_rows[0]
-                    previous_row = data_rows[1] if len(data_rows) > 1 else None
-                    
-                    # Display latest price data in Slack-compatible format
-                    print("\n" + "="*50)
-                    print("📊 LATEST PRICE DATA")
-                    print("="*50)
-                    
-                    # Display each field in Slack-compatible format
-                    for i, header in enumerate(headers[:4]):  # Only first 4 columns
-                        if i < len(latest_row):
-                            value = latest_row[i]
-                            print(f"*{header}:* {value}")
-                    
-                    if previous_row:
-                        print("\n" + "="*50)
-                        print("📈 PREVIOUS PRICE DATA")
-                        print("="*50)
-                        
-                        # Display each field in Slack-compatible format
-                        for i, header in enumerate(headers[:4]):  # Only first 4 columns
-                            if i < len(previous_row):
-                                value = previous_row[i]
-                                print(f"*{header}:* {value}")
-                        
-                        # Show price change if possible
-                        if len(latest_row) >= 2 and len(previous_row) >= 2:
-                            try:
-                                latest_price = float(latest_row[1].replace('$', '').replace(',', ''))
-                                previous_price = float(previous_row[1].replace('$', '').replace(',', ''))
-                                change = latest_price - previous_price
-                                change_percent = (change / previous_price) * 100
-                                
-                                print("\n" + "="*50)
-                                print("📊 PRICE CHANGE")
-                                print("="*50)
-                                print(f"*Price Change:* ${change:+.4f}")
-                                print(f"*Change %:* {change_percent:+.2f}%")
-                                print(f"*Direction:* {'📈 UP' if change > 0 else '📉 DOWN' if change < 0 else '➡️ UNCHANGED'}")
-                            except (ValueError, IndexError):
-                                pass  # Skip price change calculation if data is invalid
-                    
-                    # Display ntfy-formatted message (single line, text message style)
-                    print("\n" + "="*60)
-                    print("NTFY MESSAGE FORMAT")
-                    print("="*60)
-                    ntfy_message = format_for_ntfy(headers, latest_row, previous_row)
-                    print(ntfy_message)
-                    
-                    # Display Slack-formatted message
-                    print("\n" + "="*60)
-                    print("SLACK MESSAGE FORMAT")
-                    print("="*60)
-                    slack_message = format_for_slack(headers, latest_row, previous_row)
-                    print(slack_message)
-                    
-                    # Return the ntfy message for the first valid table found
-                    return ntfy_message
-                
-            else:
-                print("This doesn't appear to be a prices table")
+        table = tables[0]
+        print(f"Found {table['kind']} table with headers: {table['headers']}")
+        print(f"Extracted {len(table['rows'])} data rows")
+        return table
             
     except Exception as e:
         print(f"Error extracting table data: {e}")
@@ -342,41 +428,313 @@ def extract_historical_prices_table(soup):
     return None
 
 
-def load_funds_config(config_path="funds_config.yml"):
+def extract_fund_data(page, max_rows=2):
     """
-    Load funds configuration from YAML file.
+    Extract every relevant table (daily prices, distributions and others) in one pass.
     
     Args:
-        config_path (str): Path to the configuration file
+        page: Parsed lxml document of the fund page
+        max_rows (int): Data rows to keep per table (None for every row)
+        
+    Returns:
+        dict: Fund data with 'prices', 'distributions' and 'other' tables
+            (see table_extractor.extract_fund_tables), or None if the page
+            has no usable tables
+    """
+    try:
+        with METRICS.stage('extraction'):
+            data = extract_fund_tables(page, max_rows=max_rows)
+    except Exception as e:
+        print(f"Error extracting table data: {e}")
+        return None
+    return describe_fund_data(data)
+
+
+def fund_memory_budget():
+    """
+    Get the per-fund memory budget for page handling.
+    
+    Returns:
+        int: Bytes from SCRAPER_FUND_MEMORY_MB (default 256), or None if set to 0
+    """
+    megabytes = float(os.getenv('SCRAPER_FUND_MEMORY_MB', '256'))
+    return int(megabytes * 1024 * 1024) if megabytes > 0 else None
+
+
+def extract_page_data(page_source, max_rows=2, memory_budget=None):
+    """
+    Extract every relevant table from page source within the fund's memory budget.
+    
+    Pages are parsed into a DOM when it would fit in the budget (about
+    DOM_BYTES_PER_SOURCE_BYTE times the page size) and streamed otherwise,
+    or always with SCRAPER_STREAMING=true (never with false). The DOM is
+    released before returning. When streaming, rows beyond what the budget
+    allows are dropped, oldest first.
+    
+    Args:
+        page_source (str): Page source
+        max_rows (int): Data rows to keep per table (None for every row)
+        memory_budget (int): Bytes allowed (defaults to fund_memory_budget())
         
     Returns:
-        list: List of fund configurations
+        tuple: (title, data) with the page title and fund data as returned
+            by extract_fund_data() (None if the page has no usable tables)
+            
+    Raises:
+        PageTooLargeError: If the page source alone is larger than the budget
     """
+    budget = fund_memory_budget() if memory_budget is None else memory_budget
+    page_bytes = len(page_source)
+    if budget is not None and page_bytes > budget:
+        raise PageTooLargeError(f"Page is {page_bytes // 1024}KiB, larger than the "
+                                f"{budget // 1024}KiB memory budget (SCRAPER_FUND_MEMORY_MB)")
+    
+    mode = os.getenv('SCRAPER_STREAMING', 'auto').lower()
+    streaming = mode in ('1', 'true', 'yes') or (
+        mode == 'auto' and budget is not None and page_bytes * DOM_BYTES_PER_SOURCE_BYTE > budget)
+    if not streaming:
+        with METRICS.stage('parse'):
+            page = parse_page(page_source)
+        return page_title(page), extract_fund_data(page, max_rows=max_rows)
+    
+    print(f"Streaming {page_bytes // 1024}KiB page to stay within the memory budget")
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
-            return config.get('funds', [])
-    except FileNotFoundError:
-        print(f"❌ Configuration file '{config_path}' not found!")
-        return []
-    except yaml.YAMLError as e:
-        print(f"❌ Error parsing configuration file: {e}")
-        return []
+        with METRICS.stage('extraction'):
+            title, data = stream_fund_tables(page_source, max_rows=max_rows,
+                                             row_budget=budget - page_bytes if budget is not None else None)
     except Exception as e:
-        print(f"❌ Unexpected error loading configuration: {e}")
-        return []
+        print(f"Error extracting table data: {e}")
+        return None, None
+    return title, describe_fund_data(data)
+
+
+def describe_fund_data(data):
+    """
+    Print the tables found in fund data, or note that there were none.
+    
+    Args:
+        data (dict): Fund data from extract_fund_tables() or stream_fund_tables()
+        
+    Returns:
+        dict: The fund data, or None if it has no tables
+    """
+    tables = fund_data_tables(data)
+    if not tables:
+        print("No prices table found on the page")
+        return None
+    
+    for table in tables:
+        print(f"Found {table['kind']} table with headers: {table['headers']} ({len(table['rows'])} data rows)")
+    return data
+
+
+def fund_data_tables(data):
+    """
+    List the tables in a fund data result, daily prices first.
+    
+    Args:
+        data (dict): Fund data from extract_fund_data() or fetch_fund_from_api()
+        
+    Returns:
+        list: Table records
+    """
+    return [table for table in (data['prices'], data['distributions']) if table] + data['other']
+
+
+def extract_historical_prices_table(page):
+    """
+    Extract and display the historical prices table from the parsed HTML.
+    
+    Args:
+        page: Parsed lxml document of the fund page
+        
+    Returns:
+        str: ntfy-formatted message or None if no valid data found
+    """
+    table = extract_prices_table(page)
+    if table is None:
+        return None
+    return report_table(table)
+
+
+def report_table(table):
+    """
+    Display a table record's latest and previous rows and build the ntfy message.
+    
+    Args:
+        table (dict): Table record with 'headers' and 'rows' (newest first)
+        
+    Returns:
+        str: ntfy-formatted message
+    """
+    rows = table['rows']
+    latest_row = rows[0]
+    previous_row = rows[1] if len(rows) > 1 else None
+    with METRICS.stage('formatting'):
+        return report_price_data(table['headers'], latest_row, previous_row)
+
+
+def slack_table(table):
+    """
+    Build the Slack message for a table record's latest and previous rows.
+    
+    Args:
+        table (dict): Table record with 'headers' and 'rows' (newest first)
+        
+    Returns:
+        str: Slack-formatted message
+    """
+    rows = table['rows']
+    with METRICS.stage('formatting'):
+        return format_for_slack(table['headers'], rows[0], rows[1] if len(rows) > 1 else None)
+
+
+def load_funds_config(config_path="funds_config.yml", funds=None, groups=None, tags=None):
+    """
+    Load the validated funds configuration, optionally selecting some of the funds.
+    
+    Args:
+        config_path (str): Path to the configuration file
+        funds (list): Fund port IDs or names to select (optional)
+        groups (list): Groups to select (optional)
+        tags (list): Tags to select (optional)
+        
+    Returns:
+        list: List of fund configurations (empty if the file is invalid or nothing matches)
+    """
+    try:
+        return load_config(config_path).select(funds=funds, groups=groups, tags=tags)
+    except ConfigError as e:
+        print(f"❌ Invalid configuration file {e}")
+    except ValueError as e:
+        print(f"❌ {e}")
+    return []
+
+
+def fetch_fund_from_api(port_id, api_client, timings=None):
+    """
+    Fetch a fund's prices and distributions from the data endpoint without a browser.
+    
+    Args:
+        port_id (str): Vanguard port ID of the fund
+        api_client (VanguardApiClient): Pooled API client
+        timings (dict): Dict to record the 'api' request time in (optional)
+        
+    Returns:
+        dict: Fund data with 'prices', 'distributions' and 'other' tables, or
+            None if the prices endpoint could not be used
+    """
+    print(f"Fetching prices for port ID {port_id} from the data endpoint...")
+    started = time.perf_counter()
+    try:
+        headers, rows = api_client.fetch_prices(port_id)
+        data = {'prices': {'headers': headers, 'rows': rows, 'kind': 'prices'},
+                'distributions': None, 'other': []}
+        
+        # Distributions are optional; a failure here shouldn't force a browser fallback
+        try:
+            headers, rows = api_client.fetch_distributions(port_id)
+            if rows:
+                data['distributions'] = {'headers': headers, 'rows': rows, 'kind': 'distributions'}
+        except VanguardApiError as e:
+            print(f"⚠️  Distributions unavailable from the data endpoint ({e})")
+    except VanguardApiError as e:
+        print(f"⚠️  Data endpoint unavailable ({e}), falling back to the browser")
+        return None
+    finally:
+        elapsed = time.perf_counter() - started
+        METRICS.record('api_fetch', elapsed)
+        if timings is not None:
+            timings['api'] = elapsed
+    
+    for table in fund_data_tables(data):
+        METRICS.increment('rows_parsed', len(table['rows']))
+    return data
+
+
+def fund_port_id(fund_config):
+    """
+    Get a fund's port ID from its config, or from the portId in its URL.
+    
+    Args:
+        fund_config (dict): Fund configuration
+        
+    Returns:
+        str: The port ID, or None if it is not known
+    """
+    port_id = fund_config.get('port_id')
+    if port_id:
+        return str(port_id)
+    return parse_qs(urlparse(fund_config.get('url', '')).query).get('portId', [None])[0]
 
 
-def scrape_fund(fund_config, notifier):
+def scrape_fund(fund_config, notifier, session=None, api_client=None, history=None, state_cache=None,
+                response_cache=None, health=None, limiter=None):
     """
     Scrape a single fund and send notification.
     
+    When an API client is given and the fund has a port_id, prices are
+    fetched from the data endpoint first and the browser is only used as a
+    fallback. Daily prices, distributions and any other price tables are all
+    taken from the one page visit. When a history store is given, every row
+    on the page is kept and rows not seen before are added to it. When a
+    state cache is given, tables whose latest row has not changed since the
+    last notification are left out, and funds with no changes at all are
+    only logged as checked. Alert rules configured for the fund are checked
+    against its stored history and added to the notification. When a
+    health tracker is given, transient page errors (browser crashes and
+    timeouts) are retried for healthy funds, funds that have been failing
+    get a shorter time budget, and repeated error notifications are dropped.
+    With a rate limiter, each request waits its turn for the host it is
+    actually sent to (the data endpoint's or the fund page's), unless the
+    response cache will answer it.
+    
     Args:
-        fund_config (dict): Fund configuration containing name and url
-        notifier (NtfyNotifier): The notification handler
+        fund_config (dict): Fund configuration containing name, url and port_id
+        notifier (NtfyNotifier or MultiNotifier): The notification handler
+        session (BrowserSession): Shared browser session (optional)
+        api_client (VanguardApiClient): Client for the browserless fast path (optional)
+        history (PriceHistoryStore): Local price history store (optional)
+        state_cache (FundStateCache): Last-notified data for change detection (optional)
+        response_cache (ResponseCache): On-disk cache of rendered pages (optional)
+        health (FundHealthTracker): Per-fund failure tracking (optional)
+        limiter (HostRateLimiter): Spaces out requests to each host (optional)
+        
+    Returns:
+        dict: Timings in seconds ('startup', 'navigation', and 'api' if used)
+            plus the 'source' the data came from ('api' or 'browser'),
+            'cached' if the page came from the response cache,
+            'unchanged' if the notification was skipped and 'failed' if
+            no data could be fetched
     """
     fund_name = fund_config.get('name', 'Unknown Fund')
     url = fund_config.get('url', '')
+    port_id = fund_port_id(fund_config)
+    fund_key = port_id or url
+    timings = {'startup': 0.0, 'navigation': 0.0, 'source': 'browser'}
+    
+    def report_failure(error_msg, notify=True):
+        """Record a failed scrape and send a (deduplicated) error notification."""
+        print(f"❌ {error_msg}")
+        timings['failed'] = True
+        should_notify = health.record_failure(fund_key, error_msg) if health is not None else True
+        if not notify:
+            return
+        if not should_notify:
+            print("🔕 Same error already notified for this fund, not sending it again")
+            return
+        skip_until = health.skip_until(fund_key) if health is not None else None
+        if skip_until:
+            error_msg += f" Skipping this fund until {datetime.fromtimestamp(skip_until).strftime('%a %d %b %H:%M')}."
+        notifier.send_error_notification(error_msg, fund_name)
+    
+    def wait_turn(request_url):
+        """Space out requests to a host, unless the response cache will answer this one."""
+        if limiter is None:
+            return
+        if response_cache is not None and response_cache.is_fresh(response_cache.get(request_url)):
+            return
+        limiter.wait(request_url)
     
     print(f"\n{'='*60}")
     print(f"SCRAPING: {fund_name}")
@@ -384,88 +742,412 @@ def scrape_fund(fund_config, notifier):
     print(f"{'='*60}")
     
     try:
-        # Scrape the page
-        soup = scrape_vanguard_page(url)
+        data = None
+        page = None
         
-        if soup:
-            print(f"\n✅ Successfully scraped {fund_name}!")
+        # Try the browserless fast path first
+        if api_client is not None and port_id:
+            wait_turn(api_client.prices_url(port_id))
+            data = fetch_fund_from_api(port_id, api_client, timings)
+            if data:
+                timings['source'] = 'api'
+                print(f"\n✅ Successfully fetched {fund_name} from the data endpoint!")
+        
+        if data is None and not browser_enabled():
+            report_failure(f"Could not fetch {fund_name} from the data endpoint, and the browser "
+                           f"fallback is disabled (SCRAPER_BROWSER=false).")
+            return timings
+        
+        if data is None:
+            # Scrape the page, retrying transient errors for healthy funds only
+            retries = health.retries_for(fund_key) if health is not None else 0
+            fund_timeout = health.timeout_for(fund_key) if health is not None else None
+            for attempt in range(retries + 1):
+                timings.pop('error', None)
+                wait_turn(url)
+                page = scrape_vanguard_page(url, session=session, timings=timings, cache=response_cache,
+                                            fund_timeout=fund_timeout, parse=False)
+                if page is not None or timings.get('error') not in TRANSIENT_ERRORS or attempt == retries:
+                    break
+                delay = health.retry_delay(attempt)
+                print(f"⚠️  Transient {timings['error']} error, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+                METRICS.increment('fund_retries')
+                time.sleep(delay)
             
-            # Basic page analysis
-            print(f"\nPage title: {soup.title.string if soup.title else 'No title found'}")
+            if page is None:
+                print("Note: You may need to install Chrome and ChromeDriver")
+                report_failure(f"Failed to scrape {fund_name}. Please check your internet connection and try again.")
+                return timings
             
-            # Extract and display the historical prices table
+            print(f"\n✅ Successfully scraped {fund_name}!")
+            
+            # Extract every table from this one page visit
             print("\n" + "="*50)
-            print("EXTRACTING HISTORICAL PRICES TABLE")
+            print("EXTRACTING PRICE TABLES")
             print("="*50)
             
-            # Extract data and get the ntfy message
-            ntfy_message = extract_historical_prices_table(soup)
+            # Only the latest two rows are needed to detect changes and notify
+            try:
+                title, data = extract_page_data(page, max_rows=2)
+            except PageTooLargeError as e:
+                timings['error'] = 'memory'
+                report_failure(f"Skipped {fund_name}: {e}")
+                return timings
+            print(f"\nPage title: {title or 'No title found'}")
+        
+        if data is None:
+            print()
+            report_failure(f"No valid price data found for {fund_name}", notify=False)
+            return timings
+        
+        if health is not None:
+            health.record_success(fund_key)
+        
+        # Notify about daily prices and distributions, or the first other table
+        notify_tables = [table for table in (data['prices'], data['distributions']) if table]
+        notify_tables = notify_tables or data['other'][:1]
+        
+        # Skip history, formatting and notification if nothing has changed
+        changed = []
+        for table in notify_tables:
+            key = fund_key if table['kind'] == 'prices' else f"{fund_key}#{table['kind']}"
+            fingerprint = table_fingerprint(table) if state_cache is not None else None
+            if state_cache is None or not state_cache.is_unchanged(key, fingerprint):
+                changed.append((table, key, fingerprint))
+        
+        if not changed:
+            timings['unchanged'] = True
+            print(f"\n✅ Checked {fund_name}: no new prices since {notify_tables[0]['rows'][0][0]}, skipping notification")
+            return timings
+        
+        if history is not None and port_id:
+            full_data = data
+            if page is not None:
+                # Keep every row on the page when building up history
+                full_data = extract_page_data(page, max_rows=None)[1] or data
+            for table in fund_data_tables(full_data):
+                new_rows = history.add_table(port_id, table)
+                print(f"💾 Stored {new_rows} new {table['kind']} row(s) in price history")
+        # Only the extracted rows are needed from here on
+        page = None
+        
+        ntfy_message = "\n".join(report_table(table) for table, _, _ in changed)
+        slack_message = "\n\n".join(slack_table(table) for table, _, _ in changed)
+        
+        # Check the fund's alert rules against its full stored history
+        if history is not None and port_id and fund_config.get('alerts'):
+            from analytics import fund_alerts
             
-            # Send notification if we got a valid message
-            if ntfy_message:
-                print("\n" + "="*50)
-                print("SENDING NOTIFICATION")
-                print("="*50)
-                notifier.send_price_update(ntfy_message, fund_name)
-            else:
-                print(f"\n❌ No valid price data found for {fund_name}")
-                
-        else:
-            error_msg = f"Failed to scrape {fund_name}. Please check your internet connection and try again."
-            print(f"❌ {error_msg}")
-            print("Note: You may need to install Chrome and ChromeDriver")
-            notifier.send_error_notification(error_msg, fund_name)
+            try:
+                with METRICS.stage('analytics'):
+                    alerts = fund_alerts(history, port_id, fund_config['alerts'])
+            except ValueError as e:
+                print(f"⚠️  Invalid alert rules for {fund_name}: {e}")
+                alerts = []
+            for alert in alerts:
+                print(f"⚠️  {alert}")
+            if alerts:
+                ntfy_message = "\n".join([ntfy_message] + alerts)
+                slack_message = "\n\n".join([slack_message, "\n".join(f"⚠️ {alert}" for alert in alerts)])
+        
+        # Send notification
+        print("\n" + "="*50)
+        print("SENDING NOTIFICATION")
+        print("="*50)
+        # Only remember the data once it has been delivered, so failures are retried
+        def remember_sent(sent):
+            if sent:
+                for _, key, fingerprint in changed:
+                    state_cache.remember(key, fingerprint)
+        notifier.send_price_update(ntfy_message, fund_name, on_sent=remember_sent if state_cache is not None else None,
+                                   slack_message=slack_message)
             
     except Exception as e:
-        error_msg = f"Unexpected error occurred while scraping {fund_name}: {str(e)}"
-        print(f"\n❌ {error_msg}")
-        notifier.send_error_notification(error_msg, fund_name)
+        print()
+        report_failure(f"Unexpected error occurred while scraping {fund_name}: {str(e)}")
+    
+    return timings
 
 
-def main():
-    """Main function to run the scraper for multiple funds."""
-    # Initialize notifier
-    notifier = NtfyNotifier()
+def run_funds(funds, notifier, workers=1, min_interval=3.0, fast_path=True, history=None,
+              state_cache=None, pool=None, api_client=None, response_cache=None, health=None,
+              limiter=None):
+    """
+    Scrape every fund, optionally with several browser workers in parallel.
     
-    print("Vanguard Multi-Fund Stock Price Scraper")
-    print("="*50)
+    Requests to the same host are spaced out by a shared rate limiter instead
+    of a fixed sleep between funds. Funds whose circuit is open in the
+    health tracker are skipped without any request.
     
-    # Load funds configuration
-    funds = load_funds_config()
+    Args:
+        funds (list): Fund configurations to scrape
+        notifier (NtfyNotifier or MultiNotifier): The notification handler
+        workers (int): Number of concurrent browser workers
+        min_interval (float): Minimum seconds between requests to one host
+        fast_path (bool): Try the browserless data endpoint before Selenium
+        history (PriceHistoryStore): Local price history store (optional)
+        state_cache (FundStateCache): Last-notified data for change detection (optional)
+        pool (BrowserPool): Warm browser pool to reuse (optional, a pool of
+            `workers` browsers is started and shut down if not provided)
+        api_client (VanguardApiClient): Warm API client to reuse (optional)
+        response_cache (ResponseCache): On-disk response cache (optional)
+        health (FundHealthTracker): Per-fund failure tracking and circuit breaker (optional)
+        limiter (HostRateLimiter): Rate limiter to keep using across calls (optional, a
+            new one spacing requests by min_interval is used if not provided)
+        
+    Returns:
+        tuple: (successful_scrapes, failed_scrapes, fund_timings, browser_restarts)
+            where fund_timings is a list of (fund_name, timings) in config order
+    """
+    if pool is not None:
+        workers = pool.size
+    workers = max(1, min(workers, len(funds)))
+    if limiter is None:
+        limiter = HostRateLimiter(min_interval)
+    successful_scrapes = 0
+    failed_scrapes = 0
+    fund_timings = []
     
-    if not funds:
-        print("❌ No funds configured. Please check your funds_config.yml file.")
-        return
+    if not fast_path:
+        api_client = None
+    owns_api_client = fast_path and api_client is None
+    if owns_api_client:
+        api_client = VanguardApiClient(pool_size=workers, cache=response_cache)
     
-    print(f"📊 Found {len(funds)} fund(s) to scrape:")
-    for i, fund in enumerate(funds, 1):
-        print(f"  {i}. {fund.get('name', 'Unknown Fund')}")
+    owns_pool = pool is None
+    if owns_pool:
+        pool = BrowserPool(workers)
     
-    # Process each fund
-    successful_scrapes = 0
-    failed_scrapes = 0
+    try:
+        def process(fund):
+            if health is not None:
+                skip_until = health.skip_until(fund_port_id(fund) or fund.get('url', ''))
+                if skip_until:
+                    print(f"\n⏭️  Skipping {fund.get('name', 'Unknown Fund')} after repeated failures "
+                          f"(next attempt after {datetime.fromtimestamp(skip_until).strftime('%a %d %b %H:%M')})")
+                    return {'startup': 0.0, 'navigation': 0.0, 'source': None, 'skipped': True}
+            with pool.session() as session, METRICS.fund(fund.get('name', 'Unknown Fund')):
+                with METRICS.stage('fund_total'):
+                    return scrape_fund(fund, notifier, session=session, api_client=api_client,
+                                       history=history, state_cache=state_cache,
+                                       response_cache=response_cache, health=health, limiter=limiter)
+        
+        if workers == 1:
+            outcomes = []
+            for fund in funds:
+                try:
+                    outcomes.append((fund, process(fund), None))
+                except Exception as e:
+                    outcomes.append((fund, None, e))
+        else:
+            print(f"🚀 Scraping with {workers} concurrent browser workers")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [(fund, executor.submit(process, fund)) for fund in funds]
+                outcomes = []
+                for fund, future in futures:
+                    try:
+                        outcomes.append((fund, future.result(), None))
+                    except Exception as e:
+                        outcomes.append((fund, None, e))
+        
+        browser_restarts = pool.restarts
+    finally:
+        if owns_pool:
+            pool.quit()
+        if owns_api_client:
+            api_client.close()
     
-    for fund in funds:
-        try:
-            scrape_fund(fund, notifier)
-            successful_scrapes += 1
-        except Exception as e:
-            print(f"❌ Failed to process fund {fund.get('name', 'Unknown')}: {e}")
+    for fund, timings, error in outcomes:
+        if error is None:
+            fund_timings.append((fund.get('name', 'Unknown Fund'), timings))
+            if timings.get('failed'):
+                failed_scrapes += 1
+            elif not timings.get('skipped'):
+                successful_scrapes += 1
+        else:
+            print(f"❌ Failed to process fund {fund.get('name', 'Unknown')}: {error}")
             failed_scrapes += 1
-        
-        # Add a small delay between funds to be respectful to the server
-        if len(funds) > 1:
-            print("\n⏳ Waiting 3 seconds before next fund...")
-            time.sleep(3)
     
-    # Summary
+    return successful_scrapes, failed_scrapes, fund_timings, browser_restarts
+
+
+def print_summary(funds, successful_scrapes, failed_scrapes, fund_timings, browser_restarts):
+    """
+    Print the scraping summary and export metrics for a run.
+    
+    Args:
+        funds (list): Fund configurations that were scraped
+        successful_scrapes (int): Funds processed without errors
+        failed_scrapes (int): Funds that failed
+        fund_timings (list): (fund_name, timings) for each processed fund
+        browser_restarts (int): Browser restarts during the run
+    """
     print(f"\n{'='*60}")
     print("SCRAPING SUMMARY")
     print(f"{'='*60}")
     print(f"✅ Successful scrapes: {successful_scrapes}")
     print(f"❌ Failed scrapes: {failed_scrapes}")
     print(f"📊 Total funds processed: {len(funds)}")
+    unchanged = sum(1 for _, timings in fund_timings if timings.get('unchanged'))
+    if unchanged:
+        print(f"💤 Unchanged since last run (not notified): {unchanged}")
+    skipped = sum(1 for _, timings in fund_timings if timings.get('skipped'))
+    if skipped:
+        print(f"⏭️  Skipped after repeated failures: {skipped}")
+    cache_hits = sum(value for (name, _), value in METRICS.counters.items() if name == 'cache_hits')
+    if cache_hits:
+        print(f"🗄️  Responses served from cache: {cache_hits}")
+    
+    stage_summary = METRICS.stage_summary()
+    if stage_summary:
+        print("\n⏱️  Stage timings (count, total, max):")
+        for stage, entry in stage_summary.items():
+            print(f"  {stage}: {entry['count']}x, {entry['total']:.2f}s total, {entry['max']:.2f}s max")
+    
+    metrics_file = os.getenv('METRICS_FILE')
+    if metrics_file:
+        try:
+            METRICS.export(metrics_file)
+            print(f"📈 Metrics written to {metrics_file}")
+        except OSError as e:
+            print(f"❌ Could not write metrics file: {e}")
+    
+    if fund_timings:
+        print(f"\n⏱️  Fund timings (browser restarts: {browser_restarts}):")
+        for fund_name, timings in fund_timings:
+            if timings.get('skipped'):
+                print(f"  {fund_name}: skipped")
+            elif timings['source'] == 'api':
+                print(f"  {fund_name}: data endpoint {timings['api']:.2f}s")
+            else:
+                print(f"  {fund_name}: startup {timings['startup']:.2f}s, navigation {timings['navigation']:.2f}s, "
+                      f"ready wait {timings.get('ready_wait', 0.0):.2f}s, settle wait {timings.get('settle_wait', 0.0):.2f}s")
+
+
+def open_stores():
+    """
+    Open the price history store and fund state cache configured in the environment.
+    
+    Returns:
+        tuple: (history, state_cache), either of which is None if disabled
+    """
+    history_db = os.getenv('PRICE_HISTORY_DB', 'price_history.db')
+    history = PriceHistoryStore(history_db) if history_db else None
+    state_file = os.getenv('FUND_STATE_FILE', 'fund_state.json')
+    state_cache = FundStateCache(state_file) if state_file else None
+    return history, state_cache
+
+
+def run_scrape(funds, notifier, history=None, state_cache=None, pool=None, api_client=None,
+               response_cache=None, health=None):
+    """
+    Scrape every fund with the settings from the environment and print a summary.
+    
+    Args:
+        funds (list): Fund configurations to scrape
+        notifier (NtfyNotifier or MultiNotifier): The notification handler
+        history (PriceHistoryStore): Local price history store (optional)
+        state_cache (FundStateCache): Last-notified data for change detection (optional)
+        pool (BrowserPool): Warm browser pool to reuse (optional)
+        api_client (VanguardApiClient): Warm API client to reuse (optional)
+        response_cache (ResponseCache): On-disk response cache (optional)
+        health (FundHealthTracker): Per-fund failure tracking and circuit breaker (optional)
+    """
+    print(f"📊 Found {len(funds)} fund(s) to scrape:")
+    for i, fund in enumerate(funds, 1):
+        print(f"  {i}. {fund.get('name', 'Unknown Fund')}")
+    
+    METRICS.reset()
+    workers = int(os.getenv('SCRAPER_WORKERS', '1'))
+    min_interval = float(os.getenv('SCRAPER_HOST_INTERVAL', '3'))
+    fast_path = os.getenv('VANGUARD_FAST_PATH', 'true').lower() in ('1', 'true', 'yes')
+    try:
+        successful_scrapes, failed_scrapes, fund_timings, browser_restarts = run_funds(
+            funds, notifier, workers=workers, min_interval=min_interval,
+            fast_path=fast_path, history=history, state_cache=state_cache,
+            pool=pool, api_client=api_client, response_cache=response_cache, health=health
+        )
+    finally:
+        # Deliver any queued or digested notifications before reporting
+        notifier.flush()
+    
+    print_summary(funds, successful_scrapes, failed_scrapes, fund_timings, browser_restarts)
+
+
+def main(argv=None):
+    """Main function to run the scraper for multiple funds."""
+    parser = argparse.ArgumentParser(description="Vanguard Multi-Fund Stock Price Scraper")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Stay running and scrape on the schedule in SCHEDULE_TIMES/SCHEDULE_DAYS")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Fetch every fund from the network, ignoring the response cache")
+    parser.add_argument('--coordinator', action='store_true',
+                        help="Queue every fund in WORK_QUEUE_DB for workers, send their notifications and print the merged summary")
+    parser.add_argument('--worker', action='store_true',
+                        help="Scrape fund jobs leased from WORK_QUEUE_DB")
+    parser.add_argument('--exit-when-idle', action='store_true',
+                        help="With --worker, stop once the queue is empty")
+    parser.add_argument('--config', default='funds_config.yml', help="Funds configuration file")
+    parser.add_argument('--check-config', action='store_true',
+                        help="Check the funds configuration and exit, failing on any problem instead of skipping invalid funds")
+    parser.add_argument('--fund', action='append',
+                        help="Only scrape this fund, by port ID or name (repeatable)")
+    parser.add_argument('--group', action='append', help="Only scrape funds in this group (repeatable)")
+    parser.add_argument('--tag', action='append', help="Only scrape funds with this tag (repeatable)")
+    args = parser.parse_args(argv)
+    selection = {'funds': args.fund, 'groups': args.group, 'tags': args.tag}
+    
+    if args.check_config:
+        try:
+            config = load_config(args.config, strict=True)
+        except ConfigError as e:
+            print(f"❌ Invalid configuration file {e}")
+            return 1
+        print(f"✅ {args.config} is valid: {len(config)} fund(s)")
+        return 0
+    
+    if args.daemon:
+        from scheduler import run_daemon
+        run_daemon(args.config, selection)
+        return
+    
+    if args.worker:
+        from work_queue import run_worker
+        run_worker(exit_when_idle=args.exit_when_idle)
+        return
+    
+    # Initialize notifier (every backend in NOTIFY_BACKENDS)
+    notifier = build_notifier()
+    
+    print("Vanguard Multi-Fund Stock Price Scraper")
+    print("="*50)
+    
+    # Load funds configuration
+    funds = load_funds_config(args.config, **selection)
+    
+    if not funds:
+        print(f"❌ No funds configured. Please check your {args.config} file.")
+        return
+    
+    if args.coordinator:
+        from work_queue import run_coordinator
+        try:
+            run_coordinator(funds, notifier)
+        finally:
+            notifier.close()
+        return
+    
+    # Process each fund
+    history, state_cache = open_stores()
+    response_cache = None if args.no_cache else open_response_cache()
+    try:
+        run_scrape(funds, notifier, history=history, state_cache=state_cache,
+                   response_cache=response_cache, health=open_health_tracker())
+    finally:
+        notifier.close()
+        if history is not None:
+            history.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+"""
+Shared work queue for spreading one scrape run across several workers.
+
+A coordinator puts every fund from funds_config.yml into a SQLite queue
+(WORK_QUEUE_DB, on a volume shared by every container) and workers lease
+fund jobs from it one at a time. A lease lasts WORK_QUEUE_LEASE seconds
+and is renewed while the worker is busy, so if a worker crashes its fund
+goes back to the queue once the lease runs out; after
+WORK_QUEUE_MAX_ATTEMPTS expired leases the fund is reported as failed.
+Funds the workers haven't finished within WORK_QUEUE_DEADLINE seconds are
+reported as failed too, so the coordinator always exits.
+
+Workers don't notify anyone themselves. Their notifications go into an
+outbox table in the same database, and the coordinator sends them through
+its own notifier, so a run still produces one notification stream (and
+one digest, with NTFY_DIGEST). Change detection state is kept in the
+queue database too, so every worker agrees on what has been notified,
+and so is fund health, so workers count a fund's failures together
+instead of overwriting each other's health file.
+Each outbox row carries the fingerprints of the data it reports, which
+are only remembered once the coordinator has delivered it, so a failed
+delivery is sent again on the next run.
+When every job is finished the coordinator prints one merged summary.
+
+Usage:
+    python vanguard_scraper.py --coordinator
+    python vanguard_scraper.py --worker [--exit-when-idle]
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from browser_pool import BrowserPool
+from fund_health import FundHealthTracker, health_enabled
+from metrics import METRICS
+from rate_limiter import HostRateLimiter
+from response_cache import open_response_cache
+from vanguard_api import VanguardApiClient
+from vanguard_scraper import open_stores, print_summary, run_funds
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    total INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    fund TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    PRIMARY KEY (run_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, run_id, position);
+
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER,
+    kind TEXT NOT NULL,
+    fund_name TEXT,
+    title TEXT,
+    message TEXT NOT NULL,
+    slack_message TEXT,
+    fund_state TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fund_state (
+    fund_key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fund_health (
+    fund_key TEXT PRIMARY KEY,
+    entry TEXT NOT NULL
+);
+"""
+
+# Jobs in these states are finished and won't be leased again
+FINISHED = ('done', 'failed', 'cancelled')
+
+
+def failed_result(error=None):
+    """Return the result recorded for a job that never finished."""
+    result = {'failed': True, 'source': None, 'startup': 0.0, 'navigation': 0.0}
+    if error:
+        result['error'] = error
+    return result
+
+
+def default_worker_id():
+    """Return an ID for this worker process (WORKER_ID, or host name and PID)."""
+    return os.getenv('WORKER_ID') or f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    SQLite-backed queue of fund jobs, notification outbox, and shared fund state and health.
+
+    Safe to share between threads, and between processes and containers
+    that open the same database file. Every state change runs in an
+    immediate transaction, so two workers can never lease the same job.
+    """
+
+    def __init__(self, db_path=None, lease_seconds=None, max_attempts=None):
+        """
+        Open (and create if needed) the queue database.
+
+        Args:
+            db_path (str): Database file (defaults to WORK_QUEUE_DB, or work_queue.db)
+            lease_seconds (float): How long a lease lasts without renewal
+                (defaults to WORK_QUEUE_LEASE, or 300)
+            max_attempts (int): Leases a job may be given before it is failed
+                (defaults to WORK_QUEUE_MAX_ATTEMPTS, or 3)
+        """
+        self.db_path = db_path or os.getenv('WORK_QUEUE_DB', 'work_queue.db')
+        if lease_seconds is None:
+            lease_seconds = float(os.getenv('WORK_QUEUE_LEASE', '300'))
+        if max_attempts is None:
+            max_attempts = int(os.getenv('WORK_QUEUE_MAX_ATTEMPTS', '3'))
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        # Databases created before outbox rows carried fingerprints
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(outbox)')]
+        if 'fund_state' not in columns:
+            self._conn.execute('ALTER TABLE outbox ADD COLUMN fund_state TEXT')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block in an immediate (write-locked) transaction."""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def create_run(self, funds):
+        """
+        Queue a run of every fund, cancelling jobs left over from earlier runs.
+
+        Args:
+            funds (list): Fund configurations, in config order
+
+        Returns:
+            int: The new run's ID
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cancelled = conn.execute(
+                "UPDATE jobs SET status = 'cancelled' WHERE status IN ('pending', 'leased')").rowcount
+            run_id = conn.execute('INSERT INTO runs (created_at, total) VALUES (?, ?)',
+                                  (now, len(funds))).lastrowid
+            conn.executemany('INSERT INTO jobs (run_id, position, fund) VALUES (?, ?, ?)',
+                             ((run_id, position, json.dumps(fund)) for position, fund in enumerate(funds)))
+        if cancelled:
+            print(f"🧹 Cancelled {cancelled} unfinished job(s) from an earlier run")
+        return run_id
+
+    def _expire_leases(self, conn, now):
+        """Fail expired jobs that have used up their attempts and put the rest back in the queue."""
+        expired = conn.execute(
+            "UPDATE jobs SET status = 'failed', result = ? "
+            "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+            (json.dumps(failed_result('lease expired')), now, self.max_attempts)).rowcount
+        if expired:
+            print(f"⚠️  {expired} job(s) failed after {self.max_attempts} expired lease(s)")
+        requeued = conn.execute(
+            "UPDATE jobs SET status = 'pending', worker = NULL, lease_until = NULL "
+            "WHERE status = 'leased' AND lease_until < ?", (now,)).rowcount
+        if requeued:
+            print(f"🔁 {requeued} job(s) back in the queue after their lease expired")
+
+    def lease(self, worker_id):
+        """
+        Lease the next job: the oldest pending job, including any whose lease has expired.
+
+        Args:
+            worker_id (str): ID of the leasing worker
+
+        Returns:
+            dict: Job with 'run_id', 'position', 'fund' and 'attempt', or None if there is nothing to do
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._expire_leases(conn, now)
+            row = conn.execute(
+                "SELECT run_id, position, fund, attempts FROM jobs "
+                "WHERE status = 'pending' ORDER BY run_id, position LIMIT 1").fetchone()
+            if row is None:
+                return None
+            run_id, position, fund, attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE run_id = ? AND position = ?",
+                (worker_id, now + self.lease_seconds, run_id, position))
+        return {'run_id': run_id, 'position': position, 'fund': json.loads(fund), 'attempt': attempts + 1}
+
+    def renew(self, job, worker_id):
+        """
+        Extend a lease that the worker still holds.
+
+        Returns:
+            bool: False if the lease was lost (it expired and the job was reassigned)
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE run_id = ? AND position = ? "
+                "AND status = 'leased' AND worker = ?",
+                (time.time() + self.lease_seconds, job['run_id'], job['position'], worker_id)).rowcount == 1
+
+    @contextmanager
+    def heartbeat(self, job, worker_id):
+        """Renew a job's lease in the background while the block runs."""
+        stop = threading.Event()
+
+        def renew_until_stopped():
+            while not stop.wait(self.lease_seconds / 3):
+                if not self.renew(job, worker_id):
+                    print(f"⚠️  Lost the lease on {job['fund'].get('name', 'Unknown Fund')}")
+                    return
+
+        thread = threading.Thread(target=renew_until_stopped, name='lease-heartbeat', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, job, worker_id, result):
+        """
+        Record a finished job's result.
+
+        Args:
+            job (dict): Job from lease()
+            worker_id (str): ID of the worker holding the lease
+            result (dict): The fund's timings from run_funds
+
+        Returns:
+            bool: False if the lease had been lost and the result was discarded
+        """
+        status = 'failed' if result.get('failed') else 'done'
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, lease_until = NULL "
+                "WHERE run_id = ? AND position = ? AND status = 'leased' AND worker = ?",
+                (status, json.dumps(result), job['run_id'], job['position'], worker_id)).rowcount == 1
+
+    def progress(self, run_id):
+        """
+        Count a run's jobs by status, failing any whose leases have run out too often.
+
+        Returns:
+            dict: status -> number of jobs
+        """
+        with self._transaction() as conn:
+            self._expire_leases(conn, time.time())
+            rows = conn.execute('SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status',
+                                (run_id,)).fetchall()
+        return dict(rows)
+
+    def fail_unfinished(self, run_id, error):
+        """
+        Fail every job of a run that is still pending or leased.
+
+        A worker still scraping one of them has its result discarded.
+
+        Args:
+            run_id (int): The run
+            error (str): Reason recorded in the jobs' results
+
+        Returns:
+            int: Number of jobs failed
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'failed', result = ?, lease_until = NULL "
+                "WHERE run_id = ? AND status IN ('pending', 'leased')",
+                (json.dumps(failed_result(error)), run_id)).rowcount
+
+    def results(self, run_id):
+        """
+        Get every job's fund and result, in config order.
+
+        Returns:
+            list: (fund, result) pairs; result is None for unfinished jobs
+        """
+        with self._lock:
+            rows = self._conn.execute('SELECT fund, result FROM jobs WHERE run_id = ? ORDER BY position',
+                                      (run_id,)).fetchall()
+        return [(json.loads(fund), json.loads(result) if result else None) for fund, result in rows]
+
+    def add_notification(self, run_id, kind, fund_name, message, title=None, slack_message=None,
+                         fund_state=None):
+        """
+        Put a notification in the outbox for the coordinator to send.
+
+        Args:
+            run_id (int): Run the notification belongs to
+            kind (str): 'price_update' or 'error'
+            fund_name (str): The fund it is about
+            message (str): ntfy/plain-text message (or the error message)
+            title (str): Notification title (optional)
+            slack_message (str): Slack-formatted message (optional)
+            fund_state (list): (fund_key, fingerprint) pairs to remember once
+                the notification has been delivered (optional)
+        """
+        with self._transaction() as conn:
+            conn.execute('INSERT INTO outbox (run_id, kind, fund_name, title, message, slack_message, fund_state, '
+                         'created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                         (run_id, kind, fund_name, title, message, slack_message,
+                          json.dumps(fund_state) if fund_state else None, time.time()))
+
+    def claim_notifications(self):
+        """
+        Take every pending outbox notification, oldest first, marking it as being sent.
+
+        Returns:
+            list: Notifications as dicts with 'id', 'kind', 'fund_name', 'title',
+                'message' and 'slack_message'
+        """
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT id, kind, fund_name, title, message, slack_message FROM outbox "
+                                "WHERE status = 'pending' ORDER BY id").fetchall()
+            conn.executemany("UPDATE outbox SET status = 'sending' WHERE id = ?", ((row[0],) for row in rows))
+        keys = ('id', 'kind', 'fund_name', 'title', 'message', 'slack_message')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def finish_notification(self, notification_id, sent):
+        """
+        Mark an outbox notification as sent, or as failed after the notifier's own retries.
+
+        Once sent, the fingerprints stored with it are remembered as notified.
+        A failed notification's fingerprints are not, so its fund is seen as
+        changed and notified again on the next run.
+        """
+        with self._transaction() as conn:
+            conn.execute('UPDATE outbox SET status = ? WHERE id = ?', ('sent' if sent else 'failed', notification_id))
+            if sent:
+                row = conn.execute('SELECT fund_state FROM outbox WHERE id = ?', (notification_id,)).fetchone()
+                if row and row[0]:
+                    conn.executemany('INSERT OR REPLACE INTO fund_state (fund_key, fingerprint) VALUES (?, ?)',
+                                     json.loads(row[0]))
+
+    def requeue_unsent(self):
+        """
+        Return notifications left 'sending' by a coordinator that stopped to the outbox.
+
+        Returns:
+            int: Number of notifications requeued
+        """
+        with self._transaction() as conn:
+            return conn.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending'").rowcount
+
+    def fingerprint(self, fund_key):
+        """Return the remembered fingerprint of a fund's last notified data (or None)."""
+        with self._lock:
+            row = self._conn.execute('SELECT fingerprint FROM fund_state WHERE fund_key = ?', (fund_key,)).fetchone()
+        return row[0] if row else None
+
+    def set_fingerprint(self, fund_key, fingerprint):
+        """Remember a fund's last notified data."""
+        with self._transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO fund_state (fund_key, fingerprint) VALUES (?, ?)',
+                         (fund_key, fingerprint))
+
+    def health(self, fund_key):
+        """Return a fund's health entry (empty for a healthy fund)."""
+        with self._lock:
+            row = self._conn.execute('SELECT entry FROM fund_health WHERE fund_key = ?', (fund_key,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    @contextmanager
+    def editing_health(self, fund_key):
+        """
+        Change a fund's health entry inside a with block, in one transaction.
+
+        The entry is saved if it changed, and removed if it was emptied.
+
+        Yields:
+            dict: The fund's entry (empty for a healthy fund)
+        """
+        with self._transaction() as conn:
+            row = conn.execute('SELECT entry FROM fund_health WHERE fund_key = ?', (fund_key,)).fetchone()
+            before = json.loads(row[0]) if row else {}
+            entry = dict(before)
+            yield entry
+            if entry == before:
+                return
+            if entry:
+                conn.execute('INSERT OR REPLACE INTO fund_health (fund_key, entry) VALUES (?, ?)',
+                             (fund_key, json.dumps(entry, sort_keys=True)))
+            else:
+                conn.execute('DELETE FROM fund_health WHERE fund_key = ?', (fund_key,))
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class SharedFundState:
+    """
+    FundStateCache interface over the queue database, shared by every worker.
+
+    While a notification is being queued (see staged()), remembered
+    fingerprints are collected for its outbox row instead of being written.
+    """
+
+    def __init__(self, work_queue):
+        """
+        Args:
+            work_queue (WorkQueue): Queue whose database holds the fund state
+        """
+        self.work_queue = work_queue
+        self._staged = None
+
+    def is_unchanged(self, fund_key, fingerprint):
+        """Return True if the fingerprint matches the remembered one."""
+        return self.work_queue.fingerprint(fund_key) == fingerprint
+
+    def remember(self, fund_key, fingerprint):
+        """Record a fund's latest fingerprint (or collect it, while staging)."""
+        if self._staged is not None:
+            self._staged.append((fund_key, fingerprint))
+        else:
+            self.work_queue.set_fingerprint(fund_key, fingerprint)
+
+    @contextmanager
+    def staged(self):
+        """
+        Collect the fingerprints remembered inside a with block instead of writing them.
+
+        Yields:
+            list: (fund_key, fingerprint) pairs remembered in the block
+        """
+        self._staged = []
+        try:
+            yield self._staged
+        finally:
+            self._staged = None
+
+
+class SharedFundHealth(FundHealthTracker):
+    """
+    FundHealthTracker kept in the queue database, shared by every worker.
+
+    Each change reads and writes the fund's entry in one transaction, so
+    failures counted by different workers add up.
+    """
+
+    def __init__(self, work_queue):
+        """
+        Args:
+            work_queue (WorkQueue): Queue whose database holds the fund health
+        """
+        self.work_queue = work_queue
+        self._configure()
+
+    def _entry(self, fund_key):
+        return self.work_queue.health(fund_key)
+
+    def _editing(self, fund_key):
+        return self.work_queue.editing_health(fund_key)
+
+
+class OutboxNotifier:
+    """
+    Notifier interface that puts notifications in the queue's outbox.
+
+    The coordinator delivers notifications from the outbox. on_sent(True)
+    runs before a notification is queued, with the fund state staged, so
+    the fingerprints it remembers are stored on the outbox row and only
+    remembered by the coordinator once the notification is delivered.
+    Without a fund state, on_sent runs once the notification is in the outbox.
+    """
+
+    name = 'outbox'
+
+    def __init__(self, work_queue, run_id, state=None):
+        """
+        Args:
+            work_queue (WorkQueue): Queue holding the outbox
+            run_id (int): Run the notifications belong to
+            state (SharedFundState): Fund state that on_sent callbacks remember into (optional)
+        """
+        self.work_queue = work_queue
+        self.run_id = run_id
+        self.state = state
+
+    def _add(self, on_sent, *args, **kwargs):
+        fund_state = []
+        if on_sent is not None and self.state is not None:
+            with self.state.staged() as fund_state:
+                on_sent(True)
+            on_sent = None
+        try:
+            self.work_queue.add_notification(self.run_id, *args, fund_state=fund_state, **kwargs)
+            result = True
+        except sqlite3.Error as e:
+            print(f"❌ Could not queue notification: {e}")
+            result = False
+        if on_sent is not None:
+            on_sent(result)
+        return result
+
+    def send_price_update(self, message, fund_name="Vanguard Fund", title=None, on_sent=None, slack_message=None):
+        """Queue a price update for the coordinator."""
+        return self._add(on_sent, 'price_update', fund_name, message, title=title, slack_message=slack_message)
+
+    def send_error_notification(self, error_message, fund_name="Vanguard Fund", on_sent=None):
+        """Queue an error notification for the coordinator."""
+        return self._add(on_sent, 'error', fund_name, error_message)
+
+    def flush(self):
+        """Nothing is buffered; kept for interface compatibility with NtfyNotifier."""
+        return True
+
+    def close(self):
+        """Nothing to close; kept for interface compatibility with NtfyNotifier."""
+
+
+def deliver_outbox(work_queue, notifier):
+    """
+    Send every pending outbox notification through the coordinator's notifier.
+
+    Args:
+        work_queue (WorkQueue): Queue holding the outbox
+        notifier (NtfyNotifier or MultiNotifier): The notification handler
+
+    Returns:
+        int: Number of notifications handed to the notifier
+    """
+    notifications = work_queue.claim_notifications()
+    for notification in notifications:
+        def on_sent(sent, notification_id=notification['id']):
+            work_queue.finish_notification(notification_id, sent)
+
+        if notification['kind'] == 'error':
+            notifier.send_error_notification(notification['message'], notification['fund_name'], on_sent=on_sent)
+        else:
+            notifier.send_price_update(notification['message'], notification['fund_name'],
+                                       title=notification['title'], on_sent=on_sent,
+                                       slack_message=notification['slack_message'])
+    return len(notifications)
+
+
+def run_coordinator(funds, notifier, work_queue=None, poll_seconds=None, deadline_seconds=None):
+    """
+    Queue a run of every fund, send workers' notifications and print the merged summary.
+
+    Args:
+        funds (list): Fund configurations to scrape
+        notifier (NtfyNotifier or MultiNotifier): The notification handler
+        work_queue (WorkQueue): Shared queue (optional, opened from WORK_QUEUE_DB if not given)
+        poll_seconds (float): Seconds between progress checks (defaults to WORK_QUEUE_POLL, or 5)
+        deadline_seconds (float): Seconds to wait for workers before failing the
+            funds they have not finished (defaults to WORK_QUEUE_DEADLINE, or
+            3600; 0 waits for ever)
+
+    Returns:
+        tuple: (successful_scrapes, failed_scrapes)
+    """
+    if poll_seconds is None:
+        poll_seconds = float(os.getenv('WORK_QUEUE_POLL', '5'))
+    if deadline_seconds is None:
+        deadline_seconds = float(os.getenv('WORK_QUEUE_DEADLINE', '3600'))
+    owns_queue = work_queue is None
+    if owns_queue:
+        work_queue = WorkQueue()
+
+    try:
+        requeued = work_queue.requeue_unsent()
+        if requeued:
+            print(f"📨 Resending {requeued} notification(s) from an earlier run")
+        run_id = work_queue.create_run(funds)
+        print(f"📋 Queued run {run_id} with {len(funds)} fund(s) in {work_queue.db_path}; waiting for workers...")
+
+        deadline = time.monotonic() + deadline_seconds if deadline_seconds > 0 else None
+        last_progress = None
+        while True:
+            deliver_outbox(work_queue, notifier)
+            progress = work_queue.progress(run_id)
+            if progress != last_progress:
+                print(f"⏳ Run {run_id}: " + ', '.join(f"{count} {status}" for status, count in sorted(progress.items())))
+                last_progress = progress
+            if all(status in FINISHED for status in progress):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                failed = work_queue.fail_unfinished(run_id, 'no worker finished it in time')
+                print(f"⌛ No workers finished {failed} fund(s) within {deadline_seconds:.0f}s; reporting them as failed")
+                break
+            time.sleep(poll_seconds)
+
+        # Workers may have queued notifications right before their last job finished
+        deliver_outbox(work_queue, notifier)
+        notifier.flush()
+
+        successful_scrapes = 0
+        failed_scrapes = 0
+        fund_timings = []
+        browser_restarts = 0
+        for fund, result in work_queue.results(run_id):
+            result = result or failed_result()
+            fund_timings.append((fund.get('name', 'Unknown Fund'), result))
+            browser_restarts += result.get('browser_restarts', 0)
+            if result.get('failed'):
+                failed_scrapes += 1
+            elif not result.get('skipped'):
+                successful_scrapes += 1
+        print_summary(funds, successful_scrapes, failed_scrapes, fund_timings, browser_restarts)
+        return successful_scrapes, failed_scrapes
+    finally:
+        if owns_queue:
+            work_queue.close()
+
+
+def run_worker(work_queue=None, worker_id=None, exit_when_idle=False, poll_seconds=None):
+    """
+    Lease and scrape fund jobs until stopped.
+
+    Each worker scrapes one fund at a time with its own browser, API client,
+    response cache, price history and host rate limiter (kept across jobs,
+    so SCRAPER_HOST_INTERVAL applies between them); fund state and health
+    are shared through the queue database. Start more workers to scrape
+    more funds at once.
+
+    Args:
+        work_queue (WorkQueue): Shared queue (optional, opened from WORK_QUEUE_DB if not given)
+        worker_id (str): ID recorded on leases (defaults to WORKER_ID, or host name and PID)
+        exit_when_idle (bool): Return once the queue is empty instead of waiting for more jobs
+        poll_seconds (float): Seconds between checks of an empty queue (defaults to WORK_QUEUE_POLL, or 5)
+
+    Returns:
+        int: Number of jobs processed
+    """
+    if poll_seconds is None:
+        poll_seconds = float(os.getenv('WORK_QUEUE_POLL', '5'))
+    worker_id = worker_id or default_worker_id()
+    owns_queue = work_queue is None
+    if owns_queue:
+        work_queue = WorkQueue()
+
+    # One limiter for the worker's lifetime, so SCRAPER_HOST_INTERVAL spaces out requests between jobs
+    limiter = HostRateLimiter(float(os.getenv('SCRAPER_HOST_INTERVAL', '3')))
+    fast_path = os.getenv('VANGUARD_FAST_PATH', 'true').lower() in ('1', 'true', 'yes')
+    history, _ = open_stores()
+    state_cache = SharedFundState(work_queue)
+    response_cache = open_response_cache()
+    health = SharedFundHealth(work_queue) if health_enabled() else None
+    pool = BrowserPool(1)
+    api_client = VanguardApiClient(cache=response_cache) if fast_path else None
+    print(f"👷 Worker {worker_id} waiting for jobs in {work_queue.db_path}")
+
+    processed = 0
+    try:
+        while True:
+            job = work_queue.lease(worker_id)
+            if job is None:
+                if exit_when_idle:
+                    break
+                time.sleep(poll_seconds)
+                continue
+
+            fund = job['fund']
+            print(f"\n📥 Leased {fund.get('name', 'Unknown Fund')} (run {job['run_id']}, attempt {job['attempt']})")
+            METRICS.reset()
+            restarts_before = pool.restarts
+            with work_queue.heartbeat(job, worker_id):
+                _, _, fund_timings, _ = run_funds(
+                    [fund], OutboxNotifier(work_queue, job['run_id'], state_cache), fast_path=fast_path,
+                    history=history, state_cache=state_cache, pool=pool, api_client=api_client,
+                    response_cache=response_cache, health=health, limiter=limiter)
+            result = dict(fund_timings[0][1]) if fund_timings else failed_result()
+            result['worker'] = worker_id
+            result['browser_restarts'] = pool.restarts - restarts_before
+            if not work_queue.complete(job, worker_id, result):
+                print("⚠️  Lease expired before the fund finished; its result was discarded")
+            processed += 1
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping worker...")
+    finally:
+        pool.quit()
+        if api_client is not None:
+            api_client.close()
+        if history is not None:
+            history.close()
+        if owns_queue:
+            work_queue.close()
+    print(f"👷 Worker {worker_id} processed {processed} job(s)")
+    return processed